@@ -0,0 +1,60 @@
+"""
+Compare the copying `get_*` accessors with their `get_*_view` counterparts
+on a large parse result.
+
+    python -m benchmarks.bench_accessors
+"""
+import timeit
+
+from commandargparse import ArgParser
+
+
+def make_result(num_args=200, values_per_arg=50, num_positionals=100000):
+    parser = ArgParser()
+    for n in range(num_args):
+        parser.add_arg('a{}'.format(n))
+    parser.add_positional('paths', count='*')
+
+    args = []
+    for n in range(num_args):
+        for m in range(values_per_arg):
+            args.append('--a{}={}'.format(n, m))
+    args.extend('path{}'.format(n) for n in range(num_positionals))
+
+    return parser.compile().parse(args)
+
+
+def run(number=20):
+    result = make_result()
+
+    cases = [
+        ('get_all_args_multi',
+            result.get_all_args_multi, result.get_all_args_multi_view),
+        ('get_arg_multi',
+            lambda: result.get_arg_multi('a7'),
+            lambda: result.get_arg_multi_view('a7')),
+        ('get_all_positionals',
+            result.get_all_positionals, result.get_all_positionals_view),
+        ('get_positional',
+            lambda: result.get_positional('paths'),
+            lambda: result.get_positional_view('paths')),
+    ]
+
+    rows = []
+    for name, copying, view in cases:
+        copy_time = min(timeit.repeat(copying, number=number, repeat=3))
+        view_time = min(timeit.repeat(view, number=number, repeat=3))
+        rows.append((name, copy_time / number, view_time / number))
+    return rows
+
+
+def main():
+    print('{:<22} {:>14} {:>14} {:>10}'.format(
+        'accessor', 'copy (s)', 'view (s)', 'speed-up'))
+    for name, copy_time, view_time in run():
+        print('{:<22} {:>14.7f} {:>14.7f} {:>9.0f}x'.format(
+            name, copy_time, view_time, copy_time / view_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Compare the generic scan with the generated one from
+`ParserSpec.specialized` on the suite's parse cases.
+
+    python -m benchmarks.bench_codegen
+"""
+import timeit
+
+from commandargparse import ArgParser
+
+from .suite import _mixed_args, _mixed_spec
+
+
+def _cases():
+    yield 'mixed_1000', _mixed_spec(), _mixed_args(1000)
+    yield 'nonstrict_mixed_1000', _mixed_spec(strict=False), _mixed_args(1000)
+
+    spec = _mixed_spec()
+    args = []
+    for n in range(500):
+        args.extend(['--arg{}'.format(n % 20), 'value{}'.format(n)])
+    yield 'arg_separate_value', spec, args
+
+    parser = ArgParser()
+    parser.add_flag('y')
+    parser.add_flag('v')
+    yield 'flag_cluster_1', parser.compile(), ['-y'] * 1000 + ['-v']
+
+    parser = ArgParser()
+    parser.add_flag('v')
+    parser.add_positional('paths', count='*')
+    yield 'greedy_positional_10k', parser.compile(), \
+        ['-v'] + ['file{}'.format(n) for n in range(10000)]
+
+
+def run(repeat=5):
+    """Return [(case, generic seconds, specialized seconds)] per parse."""
+    rows = []
+    for name, spec, args in _cases():
+        specialized = spec.specialized()
+        times = []
+        for candidate in (spec, specialized):
+            timer = timeit.Timer(lambda: candidate.parse(args))
+            number, _ = timer.autorange()
+            times.append(min(timer.repeat(repeat, number)) / number)
+        rows.append((name, times[0], times[1]))
+    return rows
+
+
+def main():
+    print('{:<24} {:>12} {:>12} {:>8}'.format(
+        'case', 'generic us', 'codegen us', 'speed-up'))
+    for name, generic, specialized in run():
+        print('{:<24} {:>12.1f} {:>12.1f} {:>7.2f}x'.format(
+            name, generic * 1e6, specialized * 1e6, generic / specialized))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Summarise a large batch of argument lists with `parse_columnar`, against
+keeping every `ParseResult` and aggregating over them.
+
+    python -m benchmarks.bench_columnar
+"""
+import time
+import tracemalloc
+from collections import Counter
+
+from commandargparse import ArgParser
+
+
+def make_spec():
+    parser = ArgParser()
+    for flag_char in 'vqfn':
+        parser.add_flag(flag_char)
+    parser.add_arg('env')
+    parser.add_arg('port', parser=int)
+    parser.add_positional('command')
+    parser.add_positional('targets', count='*')
+    return parser.compile()
+
+
+def make_argvs(count):
+    envs = ['prod', 'dev', 'staging']
+    return [
+        ['-' + 'v' * (n % 3 + 1), '--env=' + envs[n % 3], '--port', str(n % 50),
+         'deploy', 'svc{}'.format(n % 7)]
+        for n in range(count)
+    ]
+
+
+def _with_results(spec, argvs):
+    results = [spec.parse(argv) for argv in argvs]
+    usage = Counter()
+    envs = Counter()
+    for result in results:
+        usage.update(f for f, c in result.get_all_flag_counts().items() if c)
+        envs[result.get_arg('env')] += 1
+    return results, usage, envs
+
+
+def _with_columns(spec, argvs):
+    batch = spec.parse_columnar(argvs)
+    return batch, batch.flag_usage(), batch.value_counts('env')
+
+
+def run(count=100000):
+    """Return {label: (seconds, bytes held)}."""
+    spec = make_spec()
+    argvs = make_argvs(count)
+    outcomes = {}
+    for label, summarise in (
+        ('results', _with_results), ('columnar', _with_columns),
+    ):
+        start = time.perf_counter()
+        kept = summarise(spec, argvs)
+        seconds = time.perf_counter() - start
+        del kept
+
+        tracemalloc.start()
+        kept = summarise(spec, argvs)
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del kept
+
+        outcomes[label] = (seconds, held)
+    return outcomes
+
+
+def main():
+    for label, (seconds, held) in run().items():
+        print('{:<9} {:8.1f} ms {:10.1f} KiB held'.format(
+            label, seconds * 1e3, held / 1024.0))
+
+
+if __name__ == '__main__':
+    main()
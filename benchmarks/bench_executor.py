@@ -0,0 +1,62 @@
+"""
+Time parsing with I/O-bound arg and positional parsers, run one after
+another and on a thread pool executor.
+
+    python -m benchmarks.bench_executor
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from commandargparse import ArgParser
+
+
+IO_DELAY = 0.005
+
+
+def slow_parser(value):
+    time.sleep(IO_DELAY) # stands in for a stat() on a slow mount
+    return value
+
+
+def make_spec(num_args):
+    parser = ArgParser()
+    for n in range(num_args):
+        parser.add_arg('a{}'.format(n), parser=slow_parser)
+    parser.add_positional('paths', count='*', parser=slow_parser)
+    return parser.compile()
+
+
+def make_args(num_args):
+    args = ['--a{}=v'.format(n) for n in range(num_args)]
+    args.extend(['p1', 'p2'])
+    return args
+
+
+def run(num_args=32, workers=16, repeat=3):
+    spec = make_spec(num_args)
+    args = make_args(num_args)
+
+    def best(fn):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    serial = best(lambda: spec.parse(args))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pooled = best(lambda: spec.parse(args, executor=executor))
+
+    return serial, pooled
+
+
+def main():
+    serial, pooled = run()
+    print('serial   {:.4f}s'.format(serial))
+    print('executor {:.4f}s'.format(pooled))
+    print('speed-up {:.1f}x'.format(serial / pooled))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Parse a batch of logged argument lists with few distinct values, with
+and without `memoize` on the args, and compare time and memory held by
+the results.
+
+    python -m benchmarks.bench_memo
+"""
+import ipaddress
+import time
+import tracemalloc
+
+from commandargparse import ArgParser
+
+
+REGIONS = ['us-east', 'us-west', 'eu-central', 'ap-south']
+
+
+def make_spec(memoize=None):
+    parser = ArgParser()
+    parser.add_arg('region', memoize=memoize)
+    parser.add_arg('port', parser=int, memoize=memoize)
+    parser.add_arg('addr', parser=ipaddress.ip_address, memoize=memoize)
+    return parser.compile()
+
+
+def make_argvs(count):
+    # Build fresh strings per argv, as reading them from a log would.
+    return [
+        [
+            '--region=' + REGIONS[n % 4],
+            '--port', str(8000 + n % 16),
+            '--addr', '10.0.{}.{}'.format(n % 3, n % 50),
+        ]
+        for n in range(count)
+    ]
+
+
+def run(count=50000):
+    """Return {label: (seconds, bytes held by the results)}."""
+    outcomes = {}
+    for label, memoize in (('plain', None), ('memoize', 1024)):
+        spec = make_spec(memoize)
+        argvs = make_argvs(count)
+
+        start = time.perf_counter()
+        results = [spec.parse(argv) for argv in argvs]
+        seconds = time.perf_counter() - start
+        del results
+
+        # Measured on a second pass, as tracing skews the timing.
+        spec = make_spec(memoize)
+        tracemalloc.start()
+        results = [spec.parse(argv) for argv in argvs]
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del results
+
+        outcomes[label] = (seconds, held)
+    return outcomes
+
+
+def main():
+    for label, (seconds, held) in run().items():
+        print('{:<8} {:8.1f} ms {:10.1f} KiB held'.format(
+            label, seconds * 1e3, held / 1024.0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Compare the memory held by parsed results in today's layout (one `ArgParser`
+per command line), as `ParseResult` objects, and as `CompactParseResult`
+objects.
+
+    python -m benchmarks.bench_memory
+"""
+import gc
+import tracemalloc
+
+from commandargparse import ArgParser
+
+
+FLAGS = 'abcdefghvqx'
+ARGS = ['host', 'port', 'user', 'timeout', 'retries', 'region']
+
+
+def define(parser):
+    for flag_char in FLAGS:
+        parser.add_flag(flag_char)
+    for arg_name in ARGS:
+        parser.add_arg(arg_name)
+    parser.add_positional('cmd')
+    parser.add_positional('paths', count='*')
+    return parser
+
+
+def make_argvs(count):
+    return [
+        [
+            '-vv', '-q', '--host=h{}'.format(n % 50), '--port', str(n % 7),
+            'run', 'a{}'.format(n), 'b{}'.format(n),
+        ]
+        for n in range(count)
+    ]
+
+
+def measure(build, argvs):
+    gc.collect()
+    tracemalloc.start()
+    kept = build(argvs)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(kept) == len(argvs)
+    return size
+
+
+def build_argparsers(argvs):
+    kept = []
+    for argv in argvs:
+        parser = define(ArgParser())
+        parser.parse(argv)
+        kept.append(parser)
+    return kept
+
+
+def build_results(argvs):
+    spec = define(ArgParser()).compile()
+    return [spec.parse(argv) for argv in argvs]
+
+
+def build_compact_results(argvs):
+    spec = define(ArgParser()).compile()
+    return [spec.parse_compact(argv) for argv in argvs]
+
+
+def run(count=20000):
+    argvs = make_argvs(count)
+    return [
+        ('ArgParser per line', measure(build_argparsers, argvs) / count),
+        ('ParseResult', measure(build_results, argvs) / count),
+        ('CompactParseResult', measure(build_compact_results, argvs) / count),
+    ]
+
+
+def main():
+    print('{:<22} {:>16}'.format('layout', 'bytes per result'))
+    for name, per_result in run():
+        print('{:<22} {:>16.0f}'.format(name, per_result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Throughput of NUL-delimited ingestion: parsing `/proc/<pid>/cmdline`-sized
+buffers with `parse_buffer`, and streaming a large `find -print0` style
+memory-mapped dump through `parse_stream` without copying it.
+
+    python -m benchmarks.bench_nulargs
+"""
+import mmap
+import tempfile
+import time
+
+from commandargparse import ArgParser, iter_nul_tokens
+
+
+def make_cmdlines(count=5000):
+    return [
+        b'\0'.join([
+            b'/usr/bin/worker', b'-v', b'--queue=jobs%d' % (n % 8),
+            b'--concurrency', b'%d' % (n % 32), b'run', b'job-%d' % n,
+        ]) + b'\0'
+        for n in range(count)
+    ]
+
+
+def make_spec():
+    parser = ArgParser(allow_leftovers=True)
+    parser.add_flag('v')
+    parser.add_arg('queue')
+    parser.add_arg('concurrency', parser=int)
+    parser.add_positional('command')
+    parser.add_positional('jobs', count='*')
+    return parser.compile()
+
+
+def run_cmdlines(count=5000):
+    """Return processes parsed per second."""
+    spec = make_spec()
+    cmdlines = make_cmdlines(count)
+
+    start = time.perf_counter()
+    for data in cmdlines:
+        # argv[0] is sliced off before parsing, as `scan_proc_cmdlines` does.
+        spec.parse_buffer(data[data.index(b'\0') + 1:])
+    return count / (time.perf_counter() - start)
+
+
+def run_dump(paths=200000):
+    """Return (paths per second, bytes) for a memory-mapped dump."""
+    parser = ArgParser()
+    parser.add_positional('paths', count='*')
+    spec = parser.compile()
+
+    with tempfile.TemporaryFile() as f:
+        for n in range(paths):
+            f.write(b'./src/module%d/file%d.py\0' % (n % 100, n))
+        f.flush()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = time.perf_counter()
+            result = spec.parse_stream(iter_nul_tokens(mm))
+            found = sum(1 for _ in result.get_positional('paths'))
+            elapsed = time.perf_counter() - start
+            size = len(mm)
+            del result
+
+    assert found == paths
+    return paths / elapsed, size
+
+
+def main():
+    print('cmdlines     {:10.0f} processes/s'.format(run_cmdlines()))
+    rate, size = run_dump()
+    print('print0 dump  {:10.0f} paths/s ({:.1f} MiB mapped)'.format(
+        rate, size / 1048576.0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Compare `ParserSpec.parse_string` with `shlex.split` followed by `parse` on
+typical bot command strings.
+
+    python -m benchmarks.bench_parse_string
+"""
+import shlex
+import timeit
+
+from commandargparse import ArgParser
+
+
+COMMANDS = [
+    'deploy -fv --env=prod svc1 svc2',
+    'deploy --env staging --tag "release 42" svc1',
+    "rollback -f --reason='bad build' --env=prod api worker scheduler",
+    'scale --env=prod --replicas 12 svc\\ with\\ spaces',
+]
+
+
+def make_spec():
+    parser = ArgParser()
+    parser.add_flag('f')
+    parser.add_flag('v')
+    parser.add_arg('env')
+    parser.add_arg('tag')
+    parser.add_arg('reason')
+    parser.add_arg('replicas', parser=int)
+    parser.add_positional('command')
+    parser.add_positional('services', count='*')
+    return parser.compile()
+
+
+def run(number=5000):
+    spec = make_spec()
+
+    def with_shlex():
+        for command in COMMANDS:
+            spec.parse(shlex.split(command))
+
+    def with_parse_string():
+        for command in COMMANDS:
+            spec.parse_string(command)
+
+    per_call = number * len(COMMANDS)
+    shlex_time = min(timeit.repeat(with_shlex, number=number, repeat=3))
+    string_time = min(timeit.repeat(with_parse_string, number=number, repeat=3))
+    return shlex_time / per_call, string_time / per_call
+
+
+def main():
+    shlex_time, string_time = run()
+    print('shlex.split + parse  {:8.2f} us/command'.format(shlex_time * 1e6))
+    print('parse_string         {:8.2f} us/command'.format(string_time * 1e6))
+    print('speed-up             {:8.1f}x'.format(shlex_time / string_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Compare building a large parser definition from scratch with loading it
+from a `dump_spec` cache, as a cold process would at startup.
+
+    python -m benchmarks.bench_startup
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from commandargparse import ArgParser, dump_spec, load_spec
+
+
+def build(num_args=400, num_flags=52):
+    parser = ArgParser(name='bigtool')
+    for n in range(num_args):
+        parser.add_arg(
+            'option-{}'.format(n),
+            help='Help text for option {}'.format(n),
+            parser=int if n % 2 else None,
+            default=n,
+        )
+    for n in range(num_flags):
+        flag_char = chr(ord('A') + n) if n < 26 else chr(ord('a') + n - 26)
+        parser.add_flag(flag_char, help='Flag {}'.format(flag_char))
+    parser.add_positional('command')
+    parser.add_positional('paths', count='*')
+    return parser.compile()
+
+
+def best_of(fn, repeat=20):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def cold_process(code):
+    start = time.perf_counter()
+    subprocess.check_call([sys.executable, '-c', code])
+    return time.perf_counter() - start
+
+
+def run():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, 'bigtool.spec')
+        dump_spec(build(), path, key='v1')
+
+        in_process = (
+            best_of(build),
+            best_of(lambda: load_spec(path, key='v1')),
+        )
+        cold = (
+            min(cold_process(
+                'from benchmarks.bench_startup import build; build()')
+                for _ in range(3)),
+            min(cold_process(
+                'from commandargparse import load_spec; '
+                'load_spec({!r}, key="v1")'.format(path))
+                for _ in range(3)),
+        )
+        return in_process, cold
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def main():
+    (built, loaded), (cold_built, cold_loaded) = run()
+    print('{:<22} {:>12} {:>12}'.format('', 'build (ms)', 'load (ms)'))
+    print('{:<22} {:>12.3f} {:>12.3f}'.format(
+        'in process', built * 1e3, loaded * 1e3))
+    print('{:<22} {:>12.1f} {:>12.1f}'.format(
+        'cold process', cold_built * 1e3, cold_loaded * 1e3))
+
+
+if __name__ == '__main__':
+    main()
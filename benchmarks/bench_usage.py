@@ -0,0 +1,52 @@
+"""
+Measure help rendering for a spec with hundreds of definitions: the first
+(uncached) render and later cached `print_usage` calls.
+
+    python -m benchmarks.bench_usage
+"""
+import io
+import timeit
+
+from commandargparse import ArgParser
+
+
+def make_parser(n_args=300, n_flags=52, n_positionals=20):
+    parser = ArgParser(name='bigtool')
+    for n in range(n_args):
+        parser.add_arg(
+            'option-{}'.format(n),
+            help='Controls behaviour number {} of the tool in some '
+                 'detail.'.format(n),
+            required=n % 50 == 0, default=n if n % 3 else None,
+        )
+    flag_chars = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    for flag_char in flag_chars[:n_flags]:
+        parser.add_flag(flag_char, help='Flag {}.'.format(flag_char))
+    for n in range(n_positionals):
+        parser.add_positional('pos{}'.format(n), help='Positional {}.'.format(n))
+    parser.add_positional('rest', count='*', help='Everything else.')
+    return parser
+
+
+def run(number=1000):
+    parser = make_parser()
+    parser.compile()
+
+    start = timeit.default_timer()
+    parser.format_usage()
+    first = timeit.default_timer() - start
+
+    stream = io.StringIO()
+    cached = min(timeit.repeat(
+        lambda: parser.print_usage(stream), number=number, repeat=3)) / number
+    return first, cached
+
+
+def main():
+    first, cached = run()
+    print('first render        {:10.2f} us'.format(first * 1e6))
+    print('cached print_usage  {:10.2f} us'.format(cached * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Load test for `CommandServer`: starts a server on a temporary Unix socket,
+drives it from several pipelined client connections and reports throughput
+and per-line latency.
+
+    python -m benchmarks.loadtest_server
+    python -m benchmarks.loadtest_server --clients 32 --lines 5000 --window 64
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from collections import deque
+
+from commandargparse import ArgParser
+from commandargparse.server import CommandServer
+
+
+COMMANDS = [
+    b'deploy -fv --env=prod svc1 svc2\n',
+    b'deploy --env staging --tag "release 42" svc1\n',
+    b'deploy --replicas=x svc\n',
+    b'bogus --what\n',
+]
+
+
+def make_server(concurrency=64, max_pending=256):
+    parser = ArgParser()
+    parser.add_flag('f')
+    parser.add_flag('v')
+    parser.add_arg('env')
+    parser.add_arg('tag')
+    parser.add_arg('replicas', parser=int)
+    parser.add_positional('services', count='*')
+
+    def deploy(result):
+        return ' '.join(result.get_positional('services'))
+
+    return CommandServer(
+        {'deploy': (parser, deploy)},
+        concurrency=concurrency,
+        max_pending=max_pending,
+    )
+
+
+async def _client(path, lines, window, latencies):
+    reader, writer = await asyncio.open_unix_connection(path)
+    sent = deque()
+    slots = asyncio.Semaphore(window)
+
+    async def receive():
+        for _ in range(lines):
+            await reader.readline()
+            latencies.append(time.perf_counter() - sent.popleft())
+            slots.release()
+
+    receiving = asyncio.ensure_future(receive())
+    for n in range(lines):
+        await slots.acquire()
+        sent.append(time.perf_counter())
+        writer.write(COMMANDS[n % len(COMMANDS)])
+        await writer.drain()
+
+    await receiving
+    writer.close()
+
+
+async def run_async(clients=8, lines=2000, window=32, concurrency=64):
+    """Return (lines per second, p50 seconds, p99 seconds)."""
+    server = make_server(concurrency=concurrency)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'server.sock')
+        serving = asyncio.ensure_future(server.serve_unix(path))
+        while not os.path.exists(path):
+            await asyncio.sleep(0.001)
+
+        latencies = []
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            _client(path, lines, window, latencies) for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+
+        serving.cancel()
+        try:
+            await serving
+        except asyncio.CancelledError:
+            pass
+
+    latencies.sort()
+    return (
+        len(latencies) / elapsed,
+        latencies[len(latencies) // 2],
+        latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    )
+
+
+def run(**kwargs):
+    return asyncio.run(run_async(**kwargs))
+
+
+def main(argv=None):
+    cli = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    cli.add_argument('--clients', type=int, default=8)
+    cli.add_argument('--lines', type=int, default=2000,
+        help='lines sent by each client')
+    cli.add_argument('--window', type=int, default=32,
+        help='most unanswered lines per client')
+    cli.add_argument('--concurrency', type=int, default=64)
+    opts = cli.parse_args(argv)
+
+    rate, p50, p99 = run(
+        clients=opts.clients, lines=opts.lines,
+        window=opts.window, concurrency=opts.concurrency)
+    print('throughput  {:10.0f} lines/s'.format(rate))
+    print('p50         {:10.1f} us'.format(p50 * 1e6))
+    print('p99         {:10.1f} us'.format(p99 * 1e6))
+
+
+if __name__ == '__main__':
+    main()
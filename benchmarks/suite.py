@@ -0,0 +1,267 @@
+"""
+Benchmark suite for the `ArgParser` parse hot paths.
+
+Each case records the best time per parse and the peak memory allocated
+during one parse. Results can be saved as JSON and compared against a
+stored baseline, failing if any case got slower or allocates more than the
+allowed ratio.
+
+    python -m benchmarks.suite                      # run and print
+    python -m benchmarks.suite --save out.json      # also save results
+    python -m benchmarks.suite --compare benchmarks/baseline.json
+    python -m benchmarks.suite --only flags         # cases matching 'flags'
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from collections import OrderedDict
+
+from commandargparse import ArgParser, CommandArgParseError
+
+
+CASES = OrderedDict()
+
+
+def case(name):
+    """Register a benchmark case. The decorated function takes no arguments
+    and returns a zero-argument callable that performs one parse.
+    """
+    def register(setup):
+        assert name not in CASES, "Duplicate benchmark case"
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def _mixed_spec(strict=True, fail_fast=False):
+    parser = ArgParser(
+        strict=strict, allow_leftovers=True, fail_fast=fail_fast)
+    for n in range(20):
+        parser.add_arg('arg{}'.format(n))
+    for flag_char in 'abcdefghijklmnop':
+        parser.add_flag(flag_char)
+    parser.add_positional('cmd')
+    parser.add_positional('paths', count='*')
+    return parser.compile()
+
+
+def _mixed_args(length):
+    args = []
+    n = 0
+    while len(args) < length:
+        args.append('--arg{}=v{}'.format(n % 20, n))
+        args.append('-abc')
+        args.append('p{}'.format(n))
+        n += 1
+    return args[:length]
+
+
+def _error_args():
+    # 1000 tokens, most of them undefined flags or args.
+    args = []
+    for n in range(250):
+        args.extend(['-z', '--undefined{}=x'.format(n), '-abq', '--arg1'])
+    return args
+
+
+def _argv_length_case(length):
+    def setup():
+        spec = _mixed_spec()
+        args = _mixed_args(length)
+        return lambda: spec.parse(args)
+    return setup
+
+
+for _length in (10, 100, 1000, 10000):
+    case('argv_length_{}'.format(_length))(_argv_length_case(_length))
+
+
+def _flag_density_case(cluster):
+    def setup():
+        parser = ArgParser()
+        parser.add_flag('y')
+        parser.add_flag('v')
+        spec = parser.compile()
+        args = ['-' + 'y' * cluster] * (1000 // cluster) + ['-v']
+        return lambda: spec.parse(args)
+    return setup
+
+
+for _cluster in (1, 4, 32):
+    case('flag_cluster_{}'.format(_cluster))(_flag_density_case(_cluster))
+
+
+@case('arg_equals_value')
+def _arg_equals_value():
+    spec = _mixed_spec()
+    args = ['--arg{}=value{}'.format(n % 20, n) for n in range(1000)]
+    return lambda: spec.parse(args)
+
+
+@case('arg_separate_value')
+def _arg_separate_value():
+    spec = _mixed_spec()
+    args = []
+    for n in range(1000):
+        args.extend(['--arg{}'.format(n % 20), 'value{}'.format(n)])
+    return lambda: spec.parse(args)
+
+
+@case('greedy_positional_100k')
+def _greedy_positional():
+    parser = ArgParser()
+    parser.add_flag('v')
+    parser.add_positional('paths', count='*')
+    spec = parser.compile()
+    args = ['-v'] + ['file{}'.format(n) for n in range(100000)]
+    return lambda: spec.parse(args)
+
+
+@case('strict_mixed_1000')
+def _strict_mixed():
+    spec = _mixed_spec(strict=True)
+    args = _mixed_args(1000)
+    return lambda: spec.parse(args)
+
+
+@case('nonstrict_mixed_1000')
+def _nonstrict_mixed():
+    spec = _mixed_spec(strict=False)
+    args = _mixed_args(1000)
+    return lambda: spec.parse(args)
+
+
+def _parse_ignoring_errors(spec, args):
+    def run():
+        try:
+            spec.parse(args)
+        except CommandArgParseError:
+            pass
+    return run
+
+
+@case('errors_multi_1000')
+def _errors_multi():
+    return _parse_ignoring_errors(_mixed_spec(strict=True), _error_args())
+
+
+# The first error comes after 500 valid tokens, so these measure the scan
+# up to it and how cheaply it is reported.
+@case('errors_fail_fast_1500')
+def _errors_fail_fast():
+    return _parse_ignoring_errors(
+        _mixed_spec(strict=True, fail_fast=True),
+        _mixed_args(500) + _error_args(),
+    )
+
+
+@case('errors_try_parse_1500')
+def _errors_try_parse():
+    spec = _mixed_spec(strict=True)
+    args = _mixed_args(500) + _error_args()
+    return lambda: spec.try_parse(args)
+
+
+def measure(setup, repeat=5):
+    """Return (best seconds per call, peak bytes allocated by one call)."""
+    fn = setup()
+
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best, peak
+
+
+def run(only=None):
+    results = OrderedDict()
+    for name, setup in CASES.items():
+        if only and only not in name:
+            continue
+        seconds, peak = measure(setup)
+        results[name] = {'seconds': seconds, 'peak_bytes': peak}
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def compare(current, baseline, max_ratio=1.25):
+    """Return (rows, regressions), comparing two `run` outputs case by case."""
+    rows = []
+    regressions = []
+    for name, now in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            rows.append((name, now, None, None, None))
+            continue
+
+        time_ratio = now['seconds'] / before['seconds']
+        mem_ratio = now['peak_bytes'] / max(before['peak_bytes'], 1)
+        rows.append((name, now, before, time_ratio, mem_ratio))
+        if time_ratio > max_ratio or mem_ratio > max_ratio:
+            regressions.append(name)
+    return rows, regressions
+
+
+def _print_results(results):
+    print('{:<26} {:>14} {:>14}'.format('case', 'us/parse', 'peak KiB'))
+    for name, now in results['results'].items():
+        print('{:<26} {:>14.2f} {:>14.1f}'.format(
+            name, now['seconds'] * 1e6, now['peak_bytes'] / 1024.0))
+
+
+def _print_comparison(rows):
+    print('{:<26} {:>12} {:>12} {:>8} {:>8}'.format(
+        'case', 'us/parse', 'baseline', 'time', 'mem'))
+    for name, now, before, time_ratio, mem_ratio in rows:
+        if before is None:
+            print('{:<26} {:>12.2f} {:>12} {:>8} {:>8}'.format(
+                name, now['seconds'] * 1e6, '-', 'new', 'new'))
+        else:
+            print('{:<26} {:>12.2f} {:>12.2f} {:>7.2f}x {:>7.2f}x'.format(
+                name, now['seconds'] * 1e6, before['seconds'] * 1e6,
+                time_ratio, mem_ratio))
+
+
+def main(argv=None):
+    cli = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    cli.add_argument('--save', help='write results to this JSON file')
+    cli.add_argument('--compare', help='baseline JSON file to compare against')
+    cli.add_argument('--max-ratio', type=float, default=1.25,
+        help='fail if time or peak memory exceed the baseline by this ratio')
+    cli.add_argument('--only', help='only run cases whose name contains this')
+    opts = cli.parse_args(argv)
+
+    results = run(only=opts.only)
+
+    if opts.save:
+        with open(opts.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if not opts.compare:
+        _print_results(results)
+        return 0
+
+    with open(opts.compare) as f:
+        baseline = json.load(f)
+
+    rows, regressions = compare(results, baseline, opts.max_ratio)
+    _print_comparison(rows)
+    if regressions:
+        print('\nRegressed: {}'.format(', '.join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
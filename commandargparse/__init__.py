@@ -1,3 +1,17 @@
 from .commandargparse import *
 from .errors import *
-
+from .result import *
+from .spec import *
+from .batch import *
+from .cache import *
+from .subcommands import *
+from .instrument import *
+from .respfile import *
+from .speccache import *
+from .cmdstring import *
+from .incremental import *
+from .completion import *
+from .codegen import *
+from .memo import *
+from .nulargs import *
+from .columnar import *
@@ -0,0 +1,43 @@
+"""
+asyncio support. Kept out of the package namespace so the rest of the
+package imports without it; use `from commandargparse.aio import ...`.
+"""
+import asyncio
+import inspect
+
+
+__all__ = ['parse_async']
+
+
+async def parse_async(spec, args):
+    """
+    Parse `args` with `spec` (a `ParserSpec` or `ArgParser`), awaiting every
+    arg and positional parser concurrently with `asyncio.gather`.
+
+    Parsers may be plain callables or coroutine functions. Failures are
+    reported exactly as `parse` reports them: a single error is raised as
+    is, several as a `CommandArgParseMultiError`, in the same order.
+    Returns a `ParseResult`.
+    """
+    spec = spec.compile()
+
+    result = spec._scan(args, defer=True)
+    calls = spec._deferred_calls(result)
+
+    outcomes = await asyncio.gather(*(
+        _call_parser_async(parser, value)
+        for _, _, parser, value in calls
+    ))
+
+    spec._finish_deferred(result, calls, outcomes)
+    return result
+
+
+async def _call_parser_async(parser, value):
+    try:
+        parsed = parser(value)
+        if inspect.isawaitable(parsed):
+            parsed = await parsed
+    except (ValueError, TypeError) as e:
+        return False, e
+    return True, parsed
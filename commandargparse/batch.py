@@ -0,0 +1,132 @@
+import os
+from collections import deque
+from itertools import islice
+
+from .errors import CommandArgParseError
+from .result import ParseResult
+
+
+__all__ = ['parse_many']
+
+
+_EXECUTORS = ('thread', 'process')
+
+# The spec a process pool worker parses with, set once per worker by
+# `_init_worker` so it is not re-sent with every chunk.
+_worker_spec = None
+
+
+def parse_many(spec, argvs, workers=None, executor='thread', chunksize=256):
+    """
+    Parse each argument list in `argvs` with `spec`, yielding the outcomes
+    in input order.
+
+    Each outcome is either a `ParseResult`, or the `CommandArgParseError`
+    that parsing that argument list raised; errors never stop the batch.
+
+    arguments:
+        `spec` the `ParserSpec` (or `ArgParser`) to parse with.
+        `argvs` any iterable of argument lists. It is read lazily, a few
+            chunks ahead of the results being consumed.
+        `workers` number of workers, defaults to the number of CPUs.
+        `executor` 'thread' or 'process'. With 'process' the spec is sent to
+            each worker once, so any `parser` callables must be picklable.
+        `chunksize` number of argument lists handed to a worker at a time.
+    """
+    spec = spec.compile()
+    assert executor in _EXECUTORS, \
+            "executor should be one of {}".format(sorted(_EXECUTORS))
+    assert chunksize > 0, "chunksize should be >0"
+
+    workers = workers or os.cpu_count() or 1
+    argvs = iter(argvs)
+
+    # Imported here: concurrent.futures pulls in multiprocessing, which
+    # would otherwise add to the import time of every command line tool.
+    if executor == 'process':
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(spec,),
+        )
+        work = _parse_chunk_in_worker
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+        pool = ThreadPoolExecutor(max_workers=workers)
+        work = _parse_chunk
+
+    # Keep a bounded number of chunks in flight so huge inputs are never
+    # read into memory all at once.
+    in_flight = deque()
+    max_in_flight = workers * 2
+
+    with pool:
+        while True:
+            while len(in_flight) < max_in_flight:
+                chunk = list(islice(argvs, chunksize))
+                if not chunk:
+                    break
+                if executor == 'process':
+                    future = pool.submit(work, chunk)
+                else:
+                    future = pool.submit(work, spec, chunk)
+                in_flight.append((chunk, future))
+
+            if not in_flight:
+                break
+
+            chunk, future = in_flight.popleft()
+            outcomes = future.result()
+
+            if executor == 'process':
+                for argv, outcome in zip(chunk, outcomes):
+                    if isinstance(outcome, CommandArgParseError):
+                        yield outcome
+                    else:
+                        yield _result_from_state(spec, argv, outcome)
+            else:
+                for outcome in outcomes:
+                    yield outcome
+
+
+def _parse_one(spec, argv):
+    try:
+        return spec.parse(argv)
+    except CommandArgParseError as e:
+        return e
+
+
+def _parse_chunk(spec, chunk):
+    return [_parse_one(spec, argv) for argv in chunk]
+
+
+def _init_worker(spec):
+    global _worker_spec
+    _worker_spec = spec
+
+
+def _parse_chunk_in_worker(chunk):
+    # Only the parsed data travels back; the parent process reattaches it
+    # to its own copy of the spec.
+    outcomes = []
+    for argv in chunk:
+        outcome = _parse_one(_worker_spec, argv)
+        if isinstance(outcome, ParseResult):
+            outcome = _result_state(outcome)
+        outcomes.append(outcome)
+    return outcomes
+
+
+def _result_state(result):
+    return (
+        result._flags, result._args, result._positionals, result._leftovers,
+        result._lazy,
+    )
+
+
+def _result_from_state(spec, argv, state):
+    result = ParseResult(spec, argv)
+    (result._flags, result._args, result._positionals,
+        result._leftovers, result._lazy) = state
+    return result
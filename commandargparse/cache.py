@@ -0,0 +1,99 @@
+import copy
+import threading
+from collections import OrderedDict, namedtuple
+
+from .errors import CommandArgParseError
+
+
+__all__ = ['ParseCache', 'CacheInfo']
+
+
+CacheInfo = namedtuple(
+    'CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+
+class ParseCache(object):
+    """
+    A bounded LRU cache of parse outcomes in front of a `ParserSpec`, keyed
+    by the argument tuple.
+
+    Successful parses are stored as `CompactParseResult`s, which are
+    immutable and so safe to hand to every caller. A parse that raised a
+    `CommandArgParseError` has the error stored and raised again on later
+    lookups.
+
+    Only cache specs whose parsers are pure: ones that read files or other
+    changing state should pass `cache=False` to `parse` to skip the cache.
+
+    arguments:
+        `spec` the `ParserSpec` (or `ArgParser`) to parse with.
+        `maxsize` the most outcomes to keep; the least recently used is
+            evicted first.
+    """
+
+    def __init__(self, spec, maxsize=256):
+        assert maxsize > 0, "maxsize should be >0"
+
+        self._spec = spec.compile()
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def spec(self):
+        return self._spec
+
+    def parse(self, args, cache=True):
+        if not cache:
+            return self._spec.parse_compact(args)
+
+        args = key = tuple(args)
+
+        with self._lock:
+            try:
+                outcome = self._entries[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._return(outcome)
+
+        try:
+            outcome = self._spec.parse_compact(args)
+        except CommandArgParseError as e:
+            # Only copies are raised, so the stored error keeps no frames.
+            outcome = e.with_traceback(None)
+
+        with self._lock:
+            self._entries[key] = outcome
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return self._return(outcome)
+
+    def cache_info(self):
+        with self._lock:
+            return CacheInfo(
+                self.hits, self.misses, self.evictions,
+                self._maxsize, len(self._entries),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    @staticmethod
+    def _return(outcome):
+        if isinstance(outcome, CommandArgParseError):
+            # A fresh copy for each caller, so no caller's traceback or
+            # exception context is shared with another, or across threads.
+            raise copy.copy(outcome)
+        return outcome
@@ -0,0 +1,86 @@
+import re
+
+from .errors import CommandArgParseSyntaxError
+
+
+__all__ = ['CommandTokenizer', 'split_command']
+
+
+# The characters `shlex` splits on; unlike `\s`, not NBSP, \v or \f.
+_WHITESPACE = ' \t\r\n'
+# One whole token: runs of plain characters, quoted strings and escapes.
+_TOKEN = re.compile(r'''(?:[^ \t\r\n'"\\]+|'[^']*'|"(?:[^"\\]|\\.)*"|\\.)+''', re.S)
+_SPACE = re.compile(r'[ \t\r\n]*')
+# The pieces of a token that needs unquoting.
+_PIECE = re.compile(r'''[^'"\\]+|'([^']*)'|"((?:[^"\\]|\\.)*)"|\\(.)''', re.S)
+_DQUOTE_ESCAPE = re.compile(r'\\([\\"])')
+
+
+class CommandTokenizer(object):
+    """
+    Iterates over the arguments in a command string, split and unquoted as
+    `shlex.split` would: whitespace separates arguments, single quotes are
+    literal, double quotes allow `\\"` and `\\\\` escapes, and a backslash
+    outside quotes escapes any character.
+
+    `offset` and `end` are the character offsets in `command` at which the
+    argument most recently yielded starts and ends. Malformed quoting
+    raises `CommandArgParseSyntaxError` carrying the offending offset.
+    Splitting begins at `start`, such as just past a command name already
+    read; offsets still count from the start of `command`.
+    """
+
+    def __init__(self, command, start=0):
+        self.command = command
+        self.offset = start
+        self.end = start
+
+    def __iter__(self):
+        command = self.command
+        end = len(command)
+        token_match = _TOKEN.match
+        space_match = _SPACE.match
+
+        pos = space_match(command, self.offset).end()
+        while pos < end:
+            match = token_match(command, pos)
+            token_end = match.end() if match is not None else pos
+            if token_end < end and command[token_end] not in _WHITESPACE:
+                self._raise_syntax_error(token_end)
+
+            self.offset = pos
+            self.end = token_end
+            raw = match.group()
+            if '"' in raw or "'" in raw or '\\' in raw:
+                yield _unquote(raw)
+            else:
+                yield raw
+
+            pos = space_match(command, token_end).end()
+
+    def _raise_syntax_error(self, offset):
+        if self.command[offset] == '\\':
+            message = "No escaped character"
+        else:
+            message = "No closing quotation"
+        raise CommandArgParseSyntaxError(message, offset)
+
+
+def split_command(command):
+    """Split `command` into a list of arguments, see `CommandTokenizer`."""
+    return list(CommandTokenizer(command))
+
+
+def _unquote(raw):
+    parts = []
+    for piece in _PIECE.finditer(raw):
+        single, double, escaped = piece.groups()
+        if single is not None:
+            parts.append(single)
+        elif double is not None:
+            parts.append(_DQUOTE_ESCAPE.sub(r'\1', double))
+        elif escaped is not None:
+            parts.append(escaped)
+        else:
+            parts.append(piece.group())
+    return ''.join(parts)
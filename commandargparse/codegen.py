@@ -0,0 +1,251 @@
+import hashlib
+import linecache
+
+from .errors import (
+    CommandArgParseError,
+    CommandArgParseMissingArgValue,
+    CommandArgParseArgValidationFailed,
+    CommandArgParseInvalidArg,
+    CommandArgParseInvalidFlag,
+)
+from .result import ParseResult
+from .spec import ParserSpec
+
+
+__all__ = ['SpecializedSpec']
+
+
+class SpecializedSpec(ParserSpec):
+    """
+    A copy of a `ParserSpec` whose scan runs a Python function generated
+    for its definitions, much as `dataclasses` generates `__init__`. Build
+    one with `ParserSpec.specialized`.
+
+    The generated scan is a single loop with the token dispatch, the flag
+    set, the arg parsers and the positional counts bound as locals, and
+    with the branches for options the spec does not use (strictness,
+    `fail_fast`, arg parsers, positionals) left out. Results and errors are
+    identical to the generic scan; validation is shared. Its source is kept
+    in `scanner_source`. Specs with `response_files` keep the generic scan,
+    as whether an `@path` is expanded depends on the scan's state.
+    """
+
+    def __init__(self, spec):
+        super(SpecializedSpec, self).__init__(**spec._options())
+        self._build_scanner()
+
+    def _build_scanner(self):
+        self.scanner_source = _scanner_source(self)
+        # Keyed on the source, so respecializing or unpickling the same
+        # spec reuses its linecache entry rather than adding another.
+        filename = '<commandargparse scan {} {}>'.format(
+            self._name,
+            hashlib.sha1(self.scanner_source.encode('utf-8')).hexdigest()[:12])
+
+        namespace = dict(
+            CommandArgParseError=CommandArgParseError,
+            CommandArgParseMissingArgValue=CommandArgParseMissingArgValue,
+            CommandArgParseArgValidationFailed=CommandArgParseArgValidationFailed,
+            CommandArgParseInvalidArg=CommandArgParseInvalidArg,
+            CommandArgParseInvalidFlag=CommandArgParseInvalidFlag,
+        )
+        exec(compile(self.scanner_source, filename, 'exec'), namespace)
+
+        # Let tracebacks through the generated code show its source.
+        linecache.cache[filename] = (
+            len(self.scanner_source), None,
+            self.scanner_source.splitlines(True), filename,
+        )
+
+        arg_parsers = {
+            arg_name: arg_def.parser
+            for arg_name, arg_def in self._arg_defs.items()
+        }
+        self._scanner = namespace['make_scan'](
+            arg_parsers,
+            frozenset(self._flag_defs),
+            tuple(name for name, _, _ in self._positional_slots),
+            tuple(-1 if count == '*' else count
+                  for _, count, _ in self._positional_slots),
+        )
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_scanner']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._build_scanner()
+
+    def _scan(self, args, defer=False):
+        if self._response_files:
+            return super(SpecializedSpec, self)._scan(args, defer)
+        result = ParseResult(self, args)
+        if defer:
+            result._lazy = ({}, {})
+        self._scanner(args, result)
+        return result
+
+
+def _scanner_source(spec):
+    """The source of `make_scan`, which binds the definitions and returns
+    the scan function for `spec`.
+    """
+    strict = spec._strict
+    fail_fast = spec._fail_fast
+    has_parsers = any(
+        arg_def.parser is not None for arg_def in spec._arg_defs.values())
+    n_slots = len(spec._positional_slots)
+
+    lines = []
+
+    def emit(indent, *code):
+        lines.extend('    ' * indent + line if line else '' for line in code)
+
+    def raise_if_fail_fast(indent, error):
+        if fail_fast:
+            emit(indent, 'raise {}'.format(error))
+
+    def add_arg(indent):
+        # Store `arg_val` under `arg_name`, as `_ParseState._add_arg_value`.
+        if strict or has_parsers:
+            emit(indent, 'parser = arg_parsers.get(arg_name, MISSING)')
+        if strict:
+            emit(indent, 'if parser is MISSING:')
+            emit(indent + 1,
+                 'arg_val = CommandArgParseInvalidArg(arg_name)')
+            raise_if_fail_fast(indent + 1, 'arg_val')
+            if has_parsers:
+                emit(indent, 'elif parser is not None:')
+        elif has_parsers:
+            emit(indent, 'if parser is not None and parser is not MISSING:')
+        if has_parsers:
+            emit(indent + 1,
+                 'if lazy_args is not None:',
+                 '    lazy_args[arg_name] = None',
+                 'else:',
+                 '    try:',
+                 '        arg_val = parser(arg_val)',
+                 '    except (ValueError, TypeError) as e:',
+                 '        arg_val = CommandArgParseArgValidationFailed(',
+                 '            arg_name, e)')
+            raise_if_fail_fast(indent + 3, 'arg_val')
+        emit(indent,
+             'values = args.get(arg_name)',
+             'if values is None:',
+             '    args[arg_name] = [arg_val]',
+             'else:',
+             '    values.append(arg_val)')
+
+    emit(0,
+         'def make_scan(arg_parsers, flag_set, slot_names, slot_counts):',
+         '    MISSING = object()',
+         '',
+         '    def scan(tokens, result):',
+         '        flags = result._flags',
+         '        args = result._args',
+         '        positionals = result._positionals',
+         '        leftovers = result._leftovers',
+         '        lazy_args = None',
+         '        if result._lazy is not None:',
+         '            lazy_args = result._lazy[0]',
+         '',
+         '        found_break = False',
+         '        pending_arg = None',
+         '        pos_index = 0',
+         '        pos_values = None',
+         '        pos_remaining = {}'.format(
+             'slot_counts[0]' if n_slots else '0'),
+         '',
+         '        tokens = iter(tokens)',
+         '        for token in tokens:',
+         '            if pending_arg is not None:',
+         '                arg_name = pending_arg',
+         '                arg_val = token',
+         '                pending_arg = None')
+    add_arg(4)
+
+    emit(3, 'elif found_break or token[:1] != \'-\':')
+    if n_slots:
+        # `pos_values` is the list of the positional being filled, once it
+        # has its first value.
+        emit(4,
+             'if pos_values is not None:',
+             '    pos_values.append(token)',
+             'elif pos_index >= {}:'.format(n_slots),
+             '    leftovers.append(token)',
+             '    leftovers.extend(tokens)',
+             '    break',
+             'else:',
+             '    pos_values = [token]',
+             '    positionals[slot_names[pos_index]] = pos_values',
+             'if pos_remaining > 0:',
+             '    pos_remaining -= 1',
+             '    if pos_remaining == 0:',
+             '        pos_index += 1',
+             '        pos_values = None',
+             '        if pos_index < {}:'.format(n_slots),
+             '            pos_remaining = slot_counts[pos_index]')
+        if spec._stop_at_positionals:
+            emit(6,
+                 'else:',
+                 '    leftovers.extend(tokens)',
+                 '    break')
+    else:
+        emit(4,
+             'leftovers.append(token)',
+             'leftovers.extend(tokens)',
+             'break')
+
+    emit(3,
+         'elif token == \'--\':',
+         '    found_break = True',
+         'elif token[1:2] == \'-\':',
+         '    if token[2:3] == \'-\':',
+         '        raise CommandArgParseError(',
+         '            "Invalid token {}".format(token))',
+         '    arg_name, sep, arg_val = token[2:].partition(\'=\')',
+         '    if not sep:',
+         '        pending_arg = arg_name',
+         '        continue')
+    add_arg(4)
+
+    emit(3, 'elif len(token) > 1:', '    for flag_char in token[1:]:')
+    if strict:
+        emit(5, 'if flag_char not in flag_set:')
+        raise_if_fail_fast(6, 'CommandArgParseInvalidFlag(flag_char)')
+        emit(5,
+             '    flags[flag_char] = CommandArgParseInvalidFlag(flag_char)',
+             'elif flag_char in flags:')
+    else:
+        emit(5, 'if flag_char in flags:')
+    emit(5,
+         '    flags[flag_char] += 1',
+         'else:',
+         '    flags[flag_char] = 1')
+
+    emit(3,
+         'else:',
+         '    raise CommandArgParseError("Invalid token {}".format(token))')
+
+    emit(2,
+         '',
+         'if pending_arg is not None:',
+         '    arg_name = pending_arg',
+         '    arg_val = CommandArgParseMissingArgValue(arg_name)')
+    if strict:
+        emit(3,
+             'if arg_name not in arg_parsers:',
+             '    arg_val = CommandArgParseInvalidArg(arg_name)')
+        raise_if_fail_fast(4, 'arg_val')
+    emit(3,
+         'values = args.get(arg_name)',
+         'if values is None:',
+         '    args[arg_name] = [arg_val]',
+         'else:',
+         '    values.append(arg_val)')
+
+    emit(1, '', 'return scan', '')
+
+    return '\n'.join(lines)
@@ -0,0 +1,174 @@
+from array import array
+from collections import Counter, OrderedDict
+
+from .errors import CommandArgParseError, ErrorRecord
+
+
+__all__ = ['ColumnarBatch']
+
+
+class ColumnarBatch(object):
+    """
+    The outcomes of parsing many argument lists with one spec, stored by
+    column rather than as one result per argument list, for summarising
+    large numbers of command lines.
+
+    Each argument list adds one row. There is a column per defined flag,
+    arg and positional; undefined args and flags are not kept.
+
+        `flag_counts[flag]` an `array('I')` of how many times the flag was
+            given, 0 when absent.
+        `arg_values[arg]` a list of the arg's parsed value, the last one
+            given as for `get_arg`, or None when absent.
+        `positional_values[pos]` a list of the positional's parsed value,
+            or None when absent.
+        `arg_valid[arg]`, `positional_valid[pos]` a `bytearray` mask, 1
+            where the value was given.
+        `row_valid` a `bytearray` mask, 1 where the row parsed without
+            error. Failed rows are 0 or None in every column.
+        `errors` a list of (row, `ErrorRecord`) for the failed rows.
+
+    Rows are added by `extend` (or `ParserSpec.parse_columnar`). Only one
+    row's result is alive at a time, so memory is bounded by the columns.
+
+    arguments:
+        `spec` an `ArgParser` or `ParserSpec`.
+    """
+
+    def __init__(self, spec):
+        self._spec = spec = spec.compile()
+        self.size = 0
+
+        self.flag_counts = OrderedDict(
+            (flag_char, array('I')) for flag_char in spec._flag_order)
+        self.arg_values = OrderedDict(
+            (arg_name, []) for arg_name in spec._arg_order)
+        self.arg_valid = OrderedDict(
+            (arg_name, bytearray()) for arg_name in spec._arg_order)
+        self.positional_values = OrderedDict(
+            (pos_name, []) for pos_name in spec._positional_defs)
+        self.positional_valid = OrderedDict(
+            (pos_name, bytearray()) for pos_name in spec._positional_defs)
+        self.row_valid = bytearray()
+        self.errors = []
+
+    @property
+    def spec(self):
+        return self._spec
+
+    def extend(self, argvs):
+        """Parse each argument list in `argvs`, any iterable, adding a row
+        for each.
+        """
+        spec = self._spec
+        flag_columns = list(self.flag_counts.items())
+        arg_columns = [
+            (arg_name, self.arg_values[arg_name], self.arg_valid[arg_name])
+            for arg_name in self.arg_values
+        ]
+        pos_columns = [
+            (pos_name, self.positional_values[pos_name],
+                self.positional_valid[pos_name])
+            for pos_name in self.positional_values
+        ]
+        row_valid = self.row_valid
+
+        for argv in argvs:
+            try:
+                result = spec.parse(argv)
+                result.validate()
+            except CommandArgParseError as e:
+                self.errors.append((self.size, ErrorRecord.from_error(e)))
+                result = None
+
+            if result is None:
+                row_valid.append(0)
+                for _, counts in flag_columns:
+                    counts.append(0)
+                for _, values, valid in arg_columns:
+                    values.append(None)
+                    valid.append(0)
+                for _, values, valid in pos_columns:
+                    values.append(None)
+                    valid.append(0)
+            else:
+                row_valid.append(1)
+                flags = result._flags
+                for flag_char, counts in flag_columns:
+                    counts.append(flags.get(flag_char, 0))
+
+                args = result._args
+                for arg_name, values, valid in arg_columns:
+                    arg_vals = args.get(arg_name)
+                    if arg_vals:
+                        values.append(arg_vals[-1])
+                        valid.append(1)
+                    else:
+                        values.append(None)
+                        valid.append(0)
+
+                positionals = result._positionals
+                for pos_name, values, valid in pos_columns:
+                    if pos_name in positionals:
+                        values.append(positionals[pos_name])
+                        valid.append(1)
+                    else:
+                        values.append(None)
+                        valid.append(0)
+
+            self.size += 1
+
+    def flag_usage(self):
+        """{flag: number of rows that gave it at least once}"""
+        return OrderedDict(
+            (flag_char, self.size - counts.count(0))
+            for flag_char, counts in self.flag_counts.items()
+        )
+
+    def flag_histogram(self, flag_char):
+        """Counter of {times given: rows} for `flag_char`, over the rows
+        that parsed.
+        """
+        return Counter(
+            count for count, ok in zip(self.flag_counts[flag_char],
+                                       self.row_valid)
+            if ok
+        )
+
+    def value_counts(self, arg_name):
+        """Counter of {value: rows} for `arg_name`, over the rows that gave
+        it. Lists are counted as tuples, other unhashable values by their
+        repr.
+        """
+        return _value_counts(
+            self.arg_values[arg_name], self.arg_valid[arg_name])
+
+    def positional_value_counts(self, pos_name):
+        """As `value_counts`, for a positional."""
+        return _value_counts(
+            self.positional_values[pos_name], self.positional_valid[pos_name])
+
+    def positional_usage(self):
+        """{positional: number of rows that gave it}"""
+        return OrderedDict(
+            (pos_name, valid.count(1))
+            for pos_name, valid in self.positional_valid.items()
+        )
+
+    def error_counts(self):
+        """Counter of {error code: rows}"""
+        return Counter(record.code for _, record in self.errors)
+
+
+def _value_counts(values, valid):
+    counts = Counter()
+    for value, ok in zip(values, valid):
+        if not ok:
+            continue
+        if isinstance(value, list):
+            value = tuple(value)
+        try:
+            counts[value] += 1
+        except TypeError:
+            counts[repr(value)] += 1
+    return counts
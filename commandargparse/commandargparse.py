@@ -1,28 +1,15 @@
 import sys
 from collections import OrderedDict
-from copy import deepcopy
 
-from .errors import (
-    CommandArgParseError,
-    CommandArgParseMultiError,
-    CommandArgParseMissingArg,
-    CommandArgParseMissingArgValue,
-    CommandArgParseMissingPositional,
-    CommandArgParseArgValidationFailed,
-    CommandArgParsePosValidationFailed,
-    CommandArgParseInvalidArg,
-    CommandArgParseInvalidFlag,
-    CommandArgParseUndefinedArg,
-    CommandArgParseUndefinedFlag,
-    CommandArgParseUndefinedPositional,
-    CommandArgParseExtraPositionals,
-)
+from .memo import MemoizedParser
+from .result import _ResultAccessors
+from .spec import ParserSpec, ArgDef, FlagDef, PositionalDef
 
 
-__ALL__ = ['ArgParser']
+__all__ = ['ArgParser']
 
 
-class ArgParser(object):
+class ArgParser(_ResultAccessors):
     """
     arguments:
         `name` name of parser for display purposes.
@@ -39,42 +26,75 @@ class ArgParser(object):
                 args = a=hello, x==cheese
                 positionals = banana, apple
                 leftovers = bear, -f, -t, --q=5, --p, 6
+        `lazy` defer running arg and positional parsers until the value is
+            first requested, keeping the raw strings until then. Results are
+            memoized, and validation errors are raised by the accessor that
+            triggered them, or all together by `validate()`.
+        `stop_at_positionals` once every positional has been filled, treat
+            all remaining arguments as leftovers, even ones that look like
+            args or flags.
+        `response_files` expand `@path` arguments to the arguments listed in
+            that file, one per line or NUL-delimited. Response files may
+            name further response files up to `response_file_depth` deep.
+        `fail_fast` stop parsing at the first error and raise it alone,
+            rather than collecting every error into a
+            `CommandArgParseMultiError`.
     """
 
-    def __init__(self, name='ArgParser', strict=True, allow_leftovers=False):
+    def __init__(
+        self, name='ArgParser', strict=True, allow_leftovers=False,
+        lazy=False, stop_at_positionals=False, response_files=False,
+        response_file_depth=4, fail_fast=False,
+    ):
         self._name = name
         self._strict = strict
         self._allow_leftovers = allow_leftovers
+        self._lazy_parsers = lazy
+        self._stop_at_positionals = stop_at_positionals
+        self._response_files = response_files
+        self._response_file_depth = response_file_depth
+        self._fail_fast = fail_fast
 
         self._positional_defs = OrderedDict()
         self._flag_defs = dict()
         self._arg_defs = dict()
 
         self._parsed = False
-        self._working_positional_def = None
+        self._spec = None
 
         self._data = list()
         self._flags = dict()
         self._args = dict()
         self._positionals = dict()
         self._leftovers = list()
+        self._views = None
+        self._lazy = None
 
     def add_arg(
         self, arg_name, help='', required=False,
-        parser=None, default=None
+        parser=None, default=None, memoize=None
     ):
+        """`memoize` wraps `parser` in a `MemoizedParser` keeping up to
+        that many distinct values, so repeated values are parsed once and
+        share one object across results.
+        """
         assert arg_name not in self._arg_defs, "Duplicate arg def"
 
-        self._arg_defs[arg_name] = {
-            'help': help,
-            'required': required,
-            'parser': parser,
-            'default': default,
-        }
+        if memoize:
+            parser = MemoizedParser(parser, maxsize=memoize)
+
+        self._spec = None
+        self._arg_defs[arg_name] = ArgDef(
+            help=help,
+            required=required,
+            parser=parser,
+            default=default,
+        )
 
     def add_flag(self, flag_char, help=''):
         assert flag_char not in self._flag_defs, "Duplicate flag def"
-        self._flag_defs[flag_char] = {'help': help}
+        self._spec = None
+        self._flag_defs[flag_char] = FlagDef(help=help)
 
     def add_positional(self, name, help='', parser=None, count=1, minimum=0):
         """`count` is the number of items to expect, and can be set
@@ -84,250 +104,69 @@ class ArgParser(object):
         """
         assert name not in self._positional_defs, "Duplicate positional def"
         assert not self._positional_defs or \
-                list(self._positional_defs.values())[-1]['count'] != '*', \
+                list(self._positional_defs.values())[-1].count != '*', \
                 "Received another positional def greey def."
         assert (isinstance(count, int) and count > 0) or count == '*', \
                 "count should be an integer >0 or '*'"
         assert count == '*' or count >= minimum
 
-        self._positional_defs[name] ={
-            'help': help,
-            'parser': parser,
-            'count': count,
-            'minimum': minimum,
-        }
+        self._spec = None
+        self._positional_defs[name] = PositionalDef(
+            help=help,
+            parser=parser,
+            count=count,
+            minimum=minimum,
+        )
 
-    def parse(self, args):
+    def compile(self):
+        """Freeze the current definitions into a reusable `ParserSpec`."""
+        if self._spec is None:
+            self._spec = ParserSpec(
+                name=self._name,
+                strict=self._strict,
+                allow_leftovers=self._allow_leftovers,
+                arg_defs=self._arg_defs,
+                flag_defs=self._flag_defs,
+                positional_defs=self._positional_defs,
+                lazy=self._lazy_parsers,
+                stop_at_positionals=self._stop_at_positionals,
+                response_files=self._response_files,
+                response_file_depth=self._response_file_depth,
+                fail_fast=self._fail_fast,
+            )
+        return self._spec
+
+    def parse(self, args, executor=None):
+        """Parse `args`. If a `concurrent.futures` `executor` is given, the
+        arg and positional parsers are run on it together, see
+        `ParserSpec.parse`.
+        """
         assert self._parsed is False, "ArgParser asked to re-parse"
         self._parsed = True
-        self._work_pos_def = list(deepcopy(self._positional_defs).items())
-
-        self._data = args[::]
-        working_args = args[::]
-
-        found_break = False
-
-        while working_args:
-            if not working_args[0].startswith('-') or found_break:
-                if self._parse_positional(working_args):
-                    continue
-                break
-
-            curr_arg = working_args.pop(0)
-            if curr_arg == '--' or found_break:
-                found_break = True
-                continue
-
-            elif curr_arg.startswith('--') and curr_arg[2] != '-':
-                curr_arg = curr_arg[2:] # strip leading --
-                self._parse_arg(curr_arg, working_args)
-
-            elif curr_arg.startswith('-') and curr_arg[1] != '-':
-                curr_arg = curr_arg[1:] # strip leading -
-                self._parse_flag(curr_arg)
-
-            else:
-                raise CommandArgParseError("Invalid token {}".format(curr_arg))
-
-        self._leftovers = working_args
-
-        self._validate()
 
-    def get_arg_multi(self, arg_name):
-        if arg_name in self._args:
-            return self._args[arg_name][::]
+        spec = self.compile()
+        result = spec._scan(args, defer=executor is not None)
 
-        elif arg_name in self._arg_defs:
-            return [self._arg_defs[arg_name]['default']]
+        self._data = result._data
+        self._flags = result._flags
+        self._args = result._args
+        self._positionals = result._positionals
+        self._leftovers = result._leftovers
+        self._views = None
+        self._lazy = result._lazy
 
-        elif self._strict:
-            raise CommandArgParseUndefinedArg(arg_name)
-
-        else:
-            return []
-
-    def get_arg(self, arg_name):
-        args = self.get_arg_multi(arg_name)
         try:
-            return args[-1]
-        except IndexError:
-            return None
-
-    def get_all_args_multi(self):
-        return deepcopy(self._args)
-
-    def get_all_args(self):
-        return {k: v[-1] for k, v in self._args.items()}
-
-    def get_flag_count(self, flag_name):
-        if flag_name in self._flags:
-            return self._flags[flag_name]
-
-        elif flag_name not in self._arg_defs and self._strict:
-            raise CommandArgParseUndefinedFlag(flag_name)
-
-        else:
-            return 0
-
-    def get_flag(self, flag_name):
-        count = self.get_flag_count(flag_name)
-        return count > 0
-
-    def get_all_flag_counts(self):
-        return dict(self._flags)
-
-    def get_all_flags(self):
-        return set(k for k, v in self._flags.items() if v > 0)
-
-    def get_all_positionals(self):
-        return deepcopy(self._positionals)
-
-    def get_positional(self, name):
-        #TODO clear this up
-        if name in self._positionals:
-            return self._positionals[name][::]
-
-        elif self._strict and name not in self._positional_defs:
-            raise CommandArgParseUndefinedPositional(name)
-
-        else:
-            return []
-
-    def get_leftovers(self):
-        return self._leftovers[::]
-
-    def _parse_arg(self, arg_str, working_args):
-        split = arg_str.split('=')
-
-        arg_name = split[0]
-        if len(split) == 2:
-            arg_val = split[1]
-        else:
-            try:
-                arg_val = working_args.pop(0)
-            except IndexError:
-                arg_val = CommandArgParseMissingArgValue(arg_name)
-
-        try:
-            arg_def = self._arg_defs[arg_name]
-        except KeyError:
-            if self._strict:
-                arg_val = CommandArgParseInvalidArg(arg_name)
-            parser = None
-        else:
-            parser = arg_def['parser']
-
-
-        if isinstance(arg_val, CommandArgParseMissingArg) or parser is None:
-            fmt_arg_val = arg_val
-        else:
-            try:
-                fmt_arg_val = parser(arg_val)
-            except (ValueError, TypeError) as e:
-                fmt_arg_val = CommandArgParseArgValidationFailed(arg_name, e)
-
-        if arg_name not in self._args:
-            self._args[arg_name] = [fmt_arg_val]
-        else:
-            self._args[arg_name].append(fmt_arg_val)
-
-    def _parse_flag(self, flag_str):
-        for flag_char in flag_str:
-            if self._strict and flag_char not in self._flag_defs:
-                self._flags[flag_char] = CommandArgParseInvalidFlag(flag_char)
+            if executor is None:
+                spec._validate(result)
             else:
-                if flag_char not in self._flags:
-                    self._flags[flag_char] = 1
-                else:
-                    self._flags[flag_char] += 1
-
-    def _parse_positional(self, working_args):
-        pos_defs = self._work_pos_def
-
-        if pos_defs and pos_defs[0][1]['count'] == 0: # '*' != 0
-            self._work_pos_def.pop(0)
-
-        if not self._work_pos_def:
-            return False
-
-        pos_def_name, pos_def = pos_defs[0]
-
-        raw_value = working_args.pop(0)
-
-        if pos_def_name not in self._positionals:
-            self._positionals[pos_def_name] = [raw_value]
-        else:
-            self._positionals[pos_def_name].append(raw_value)
-
-        if isinstance(pos_def['count'], int):
-            pos_def['count'] -= 1
-
-        return True
-
-    def _validate(self):
-        errs = self._validate_args()
-        errs.extend(self._validate_flags())
-        errs.extend(self._validate_positionals())
-        errs.extend(self._validate_leftovers())
-
-        if len(errs) == 1:
-            raise errs[0]
-        elif errs:
-            raise CommandArgParseMultiError(errs)
-
-    def _validate_args(self):
-        errs = list(
-            arg_val
-            for arg_vals in self._args.values()
-            for arg_val in arg_vals
-            if isinstance(arg_val, CommandArgParseError)
-        )
-
-        errs.extend(
-            CommandArgParseMissingArg(arg_name)
-            for arg_name, arg_def in self._arg_defs.items()
-            if arg_def['required'] and arg_name not in self._args
-        )
-
-        return errs
-
-    def _validate_flags(self):
-        return [
-            flag_count
-            for flag_count in self._flags.values()
-            if isinstance(flag_count, CommandArgParseError)
-        ]
-
-    def _validate_positionals(self):
-        errs = []
-        have_missing = False
-        for pos_name, pos_def in self._positional_defs.items():
-            values = self._positionals.get(pos_name, [])
-
-            if pos_def['minimum'] > len(values) and not have_missing:
-                errs.append(CommandArgParseMissingPositional())
-
-            parser = pos_def['parser']
-            if parser is not None:
-                try:
-                    self._positionals['pos_name'] = parser(values)
-                except (ValueError, TypeError) as e:
-                    errs.append(CommandArgParsePosValidationFailed(pos_name, e))
-
-        return errs
-
-    def _validate_leftovers(self):
-        if not self._allow_leftovers and self._leftovers:
-            return [CommandArgParseExtraPositionals()]
-        return []
-
-
-    def print_usage(self): # TODO
-        sys.stdout.write("""USAGE:
-        cmd flags args command
-        flags: {}
-        args: {}
-""".format(self._arg_defs, self._flag_defs))
-
+                spec._run_deferred(result, executor)
+        finally:
+            self._lazy = result._lazy
 
+    def format_usage(self):
+        """The help text, cached until another definition is added."""
+        return self.compile().format_usage()
 
+    def print_usage(self, stream=None):
+        """Write the help text to `stream`, stdout by default."""
+        (sys.stdout if stream is None else stream).write(self.format_usage())
@@ -0,0 +1,165 @@
+import os
+import socket
+import socketserver
+
+from .errors import CommandArgParseError
+from .result import ParseResult
+
+
+__all__ = ['Completer', 'serve_completions', 'query_completions']
+
+
+# Key marking that the path to a trie node spells a complete name.
+_END = ''
+
+
+class Completer(object):
+    """
+    Shell completion over a spec's definitions.
+
+    Arg names are held in a prefix trie built once, so completing `--pre`
+    only visits the names starting with `pre`. Preceding words are scanned
+    exactly as `parse` scans them, to tell whether the word being completed
+    is an arg value, a flag, an arg name or which positional. Their arg
+    parsers are never run, so a Tab costs no lookups or decoding.
+
+    arguments:
+        `spec` an `ArgParser` or `ParserSpec`.
+        `choices` mapping of arg or positional name to the values it can
+            take: a list of strings, or a callable taking the typed prefix
+            and returning an iterable of candidates.
+    """
+
+    def __init__(self, spec, choices=None):
+        self._spec = spec.compile()
+        self._choices = dict(choices or {})
+
+        self._trie = {}
+        for arg_name in self._spec._arg_defs:
+            node = self._trie
+            for char in arg_name:
+                node = node.setdefault(char, {})
+            node[_END] = arg_name
+
+    def complete(self, words):
+        """
+        Return the sorted candidates for the last of `words`, the partial
+        word under the cursor (pass '' to complete a new word). Earlier
+        words are the arguments before it, without the program name.
+        """
+        words = list(words) or ['']
+        partial = words.pop()
+
+        spec = self._spec
+        result = ParseResult(spec, words)
+        # Defer every arg parser, as `_scan(defer=True)` does; only the
+        # cursor position matters here.
+        result._lazy = ({}, {})
+        state = spec._state_class(spec, result)
+        try:
+            for word in words:
+                state.feed(word)
+        except CommandArgParseError:
+            return []
+
+        if state.pending_arg is not None:
+            return self._values(state.pending_arg, partial)
+
+        options = not (state.found_break or state.in_leftovers)
+        if options and partial.startswith('--'):
+            arg_name, sep, value = partial[2:].partition('=')
+            if sep:
+                prefix = '--{}='.format(arg_name)
+                return [prefix + v for v in self._values(arg_name, value)]
+            return ['--' + name for name in self.arg_names(arg_name)]
+
+        if options and partial.startswith('-'):
+            candidates = [
+                partial + flag_char
+                for flag_char in sorted(spec._flag_defs)
+                if flag_char not in partial
+            ]
+            if partial == '-':
+                candidates.extend('--' + name for name in self.arg_names(''))
+            return candidates
+
+        slots = spec._positional_slots
+        if state.in_leftovers or state.pos_index >= len(slots):
+            return []
+        return self._values(slots[state.pos_index][0], partial)
+
+    def arg_names(self, prefix):
+        """The defined arg names starting with `prefix`, sorted."""
+        node = self._trie
+        for char in prefix:
+            try:
+                node = node[char]
+            except KeyError:
+                return []
+
+        names = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for key, child in node.items():
+                if key == _END:
+                    names.append(child)
+                else:
+                    stack.append(child)
+        names.sort()
+        return names
+
+    def _values(self, name, prefix):
+        choices = self._choices.get(name)
+        if choices is None:
+            return []
+        if callable(choices):
+            choices = choices(prefix)
+        return sorted(c for c in choices if c.startswith(prefix))
+
+
+def serve_completions(completer, path):
+    """
+    Serve `completer` on a Unix socket at `path` until interrupted, so a
+    shell can query a process that has already built its index.
+
+    Each request is the words to complete, NUL-separated, ending in a
+    newline. The response is the candidates, one per line, followed by an
+    empty line. See `query_completions` for a client.
+    """
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                words = line.rstrip(b'\n').decode('utf-8').split('\0')
+                candidates = completer.complete(words)
+                self.wfile.write(
+                    ''.join(c + '\n' for c in candidates).encode('utf-8')
+                    + b'\n'
+                )
+
+    if os.path.exists(path):
+        os.unlink(path)
+    server = socketserver.ThreadingUnixStreamServer(path, Handler)
+    server.daemon_threads = True
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        os.unlink(path)
+
+
+def query_completions(path, words):
+    """Ask the `serve_completions` daemon at `path` to complete `words`."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        sock.sendall('\0'.join(words).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as response:
+            candidates = []
+            for line in response:
+                if line == b'\n':
+                    break
+                candidates.append(line.rstrip(b'\n').decode('utf-8'))
+        return candidates
+    finally:
+        sock.close()
@@ -1,5 +1,9 @@
 
-__ALL__ = [
+from collections import namedtuple
+
+
+__all__ = [
+    'ErrorRecord',
     'CommandArgParseError',
     'CommandArgParseMultiError',
     'CommandArgParseMissingArg',
@@ -13,18 +17,52 @@ __ALL__ = [
     'CommandArgParseUndefinedPositional',
     'CommandArgParseMissingPositional',
     'CommandArgParseExtraPositionals',
+    'CommandArgParseUnknownCommand',
+    'CommandArgParseResponseFileError',
+    'CommandArgParseSyntaxError',
 ]
 
 banana = 1
 
+
+class ErrorRecord(namedtuple('ErrorRecord', ['code', 'subject', 'count'])):
+    """
+    A lightweight description of a failed parse, as returned by
+    `ParserSpec.try_parse`: the `code` of the first error, its `subject`
+    (the arg, flag or positional name, command or path it concerns, the
+    message for an invalid token, or None) and the `count` of errors
+    found. `try_parse` stops at the first error, so its count is 1; a
+    record made `from_error` counts every error a parse raised.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_error(cls, error):
+        errors = getattr(error, 'errors', None) or [error]
+        first = errors[0]
+        subject = first.args[0] if first.args else None
+        return cls(first.code, subject, len(errors))
+
 class CommandArgParseError(Exception):
-    pass
+    # Short stable identifier, see `ErrorRecord`.
+    code = 'error'
+    # Character offset in the command string at fault, when parsed with
+    # `ParserSpec.parse_string`.
+    offset = None
+
+    def _at_offset(self, message):
+        if self.offset is None:
+            return message
+        return "{0} at offset {1}".format(message, self.offset)
 
 #
 # Errors during parsing
 #
 class CommandArgParseMultiError(CommandArgParseError):
+    code = 'multiple'
+
     def __init__(self, errors):
+        super(CommandArgParseMultiError, self).__init__(errors)
         self.errors = errors
 
     def __str__(self):
@@ -33,6 +71,8 @@ class CommandArgParseMultiError(CommandArgParseError):
 
 
 class CommandArgParseMissingArg(CommandArgParseError):
+    code = 'missing_arg'
+
     def __init__(self, arg_name):
         super(CommandArgParseMissingArg, self).__init__(arg_name)
         self.arg_name = arg_name
@@ -42,15 +82,20 @@ class CommandArgParseMissingArg(CommandArgParseError):
 
 
 class CommandArgParseMissingArgValue(CommandArgParseError):
+    code = 'missing_arg_value'
+
     def __init__(self, arg_name):
         super(CommandArgParseMissingArgValue, self).__init__(arg_name)
         self.arg_name = arg_name
 
     def __str__(self):
-        return 'Missing value for argument "{0}"'.format(self.arg_name)
+        return self._at_offset(
+            'Missing value for argument "{0}"'.format(self.arg_name))
 
 
 class CommandArgParseArgValidationFailed(CommandArgParseError):
+    code = 'arg_validation_failed'
+
     def __init__(self, arg_name, error):
         super(CommandArgParseArgValidationFailed, self).__init__(arg_name, error)
         self.arg_name = arg_name
@@ -58,9 +103,12 @@ class CommandArgParseArgValidationFailed(CommandArgParseError):
 
     def __str__(self):
         #TODO make nice?
-        return "Failed to validate {}:{}".format(self.arg_name, self.error)
+        return self._at_offset(
+            "Failed to validate {}:{}".format(self.arg_name, self.error))
 
 class CommandArgParsePosValidationFailed(CommandArgParseError):
+    code = 'pos_validation_failed'
+
     def __init__(self, value, error):
         super(CommandArgParsePosValidationFailed, self).__init__(value, error)
         self.value = value
@@ -72,34 +120,80 @@ class CommandArgParsePosValidationFailed(CommandArgParseError):
 
 
 class CommandArgParseInvalidArg(CommandArgParseError):
+    code = 'invalid_arg'
+
     def __init__(self, arg_name):
         super(CommandArgParseInvalidArg, self).__init__(arg_name)
         self.arg_name = arg_name
 
     def __str__(self):
-        return "Received undefined argument {0}".format(self.arg_name)
+        return self._at_offset(
+            "Received undefined argument {0}".format(self.arg_name))
 
 
 class CommandArgParseInvalidFlag(CommandArgParseError):
+    code = 'invalid_flag'
+
     def __init__(self, flag):
         super(CommandArgParseInvalidFlag, self).__init__(flag)
         self.flag = flag
 
     def __str__(self):
-        return "Received undefined flag {0}".format(self.flag)
+        return self._at_offset(
+            "Received undefined flag {0}".format(self.flag))
 
 
 class CommandArgParseExtraPositionals(CommandArgParseError):
+    code = 'extra_positionals'
+
     def __init__(self):
         super(CommandArgParseExtraPositionals, self).__init__()
 
     def __str__(self):
         return "Received extra arguments"
 
+
+class CommandArgParseSyntaxError(CommandArgParseError):
+    code = 'syntax_error'
+
+    def __init__(self, message, offset):
+        super(CommandArgParseSyntaxError, self).__init__(message, offset)
+        self.message = message
+        self.offset = offset
+
+    def __str__(self):
+        return self._at_offset(self.message)
+
+
+class CommandArgParseResponseFileError(CommandArgParseError):
+    code = 'response_file_error'
+
+    def __init__(self, path, error):
+        super(CommandArgParseResponseFileError, self).__init__(path, error)
+        self.path = path
+        self.error = error
+
+    def __str__(self):
+        return "Failed to read response file {0}: {1}".format(
+            self.path, self.error)
+
+
+class CommandArgParseUnknownCommand(CommandArgParseError):
+    code = 'unknown_command'
+
+    def __init__(self, command):
+        super(CommandArgParseUnknownCommand, self).__init__(command)
+        self.command = command
+
+    def __str__(self):
+        return "Unknown command {0}".format(self.command)
+
 #
 # Errors during running
 #
 class CommandArgParseUndefinedArg(CommandArgParseError):
+    code = 'undefined_arg'
+
     def __init__(self, arg_name):
         super(CommandArgParseUndefinedArg, self).__init__(arg_name)
         self.arg_name = arg_name
@@ -109,6 +203,8 @@ class CommandArgParseUndefinedArg(CommandArgParseError):
 
 
 class CommandArgParseUndefinedFlag(CommandArgParseError):
+    code = 'undefined_flag'
+
     def __init__(self, flag):
         super(CommandArgParseUndefinedFlag, self).__init__(flag)
         self.flag = flag
@@ -118,6 +214,8 @@ class CommandArgParseUndefinedFlag(CommandArgParseError):
 
 
 class CommandArgParseUndefinedPositional(CommandArgParseError):
+    code = 'undefined_positional'
+
     def __init__(self, positional_name):
         super(CommandArgParseUndefinedPositional,
                 self).__init__(positional_name)
@@ -127,6 +225,8 @@ class CommandArgParseUndefinedPositional(CommandArgParseError):
         return "Undefined positional {0}".format(self.positional_name)
 
 class CommandArgParseMissingPositional(CommandArgParseError):
+    code = 'missing_positional'
+
     def __init__(self):
         super(CommandArgParseMissingPositional, self).__init__()
 
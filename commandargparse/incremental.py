@@ -0,0 +1,191 @@
+from .result import ParseResult
+from .spec import _ParseState
+
+
+__all__ = ['IncrementalParser']
+
+
+# Marks a flag that had not been seen before the logged token.
+_MISSING = object()
+
+
+class IncrementalParser(object):
+    """
+    A parse that advances one token at a time, for interactive shells that
+    re-parse a line on every keystroke.
+
+    Feeding a token costs the same whatever has been fed before it, and
+    `snapshot` and `rollback` undo tokens without re-feeding the rest of
+    the line. Tokens are handled exactly as `ParserSpec.parse` handles
+    them, including `--`, greedy positionals and leftovers.
+
+    arguments:
+        `spec` an `ArgParser` or `ParserSpec`.
+    """
+
+    def __init__(self, spec):
+        self._spec = spec.compile()
+        self._tokens = []
+        # Snapshot taken before each of `_tokens` was fed.
+        self._marks = []
+        self._result = ParseResult(self._spec, self._tokens)
+        self._state = _UndoParseState(self._spec, self._result)
+
+    @property
+    def tokens(self):
+        """The tokens fed so far."""
+        return tuple(self._tokens)
+
+    @property
+    def expecting(self):
+        """
+        What the next token would be taken as: ('arg', name) when it is the
+        value of `--name`, ('positional', name), or ('leftover', None).
+        """
+        state = self._state
+        if state.pending_arg is not None:
+            return 'arg', state.pending_arg
+        slots = self._spec._positional_slots
+        if state.in_leftovers or state.pos_index >= len(slots):
+            return 'leftover', None
+        return 'positional', slots[state.pos_index][0]
+
+    def feed(self, token):
+        """
+        Take the next token. A token `parse` would reject outright, such as
+        `---x`, raises a `CommandArgParseError` and leaves the parser as it
+        was.
+        """
+        mark = self.snapshot()
+        try:
+            for expanded in self._spec._expand((token,), self._state):
+                self._state.feed(expanded)
+        except BaseException:
+            self._state.rollback(mark)
+            raise
+        self._marks.append(mark)
+        self._tokens.append(token)
+
+    def snapshot(self):
+        """Return a marker of the current state for `rollback`."""
+        return len(self._state.undo)
+
+    def rollback(self, snapshot=None):
+        """Undo every token fed since `snapshot`, or only the last token if
+        no snapshot is given.
+        """
+        if snapshot is None:
+            if not self._marks:
+                return
+            snapshot = self._marks[-1]
+        assert 0 <= snapshot <= self.snapshot(), "Invalid snapshot"
+
+        self._state.rollback(snapshot)
+        while self._marks and self._marks[-1] >= snapshot:
+            self._marks.pop()
+            self._tokens.pop()
+
+    def result(self):
+        """
+        Finish a copy of the parse and validate it, returning a
+        `ParseResult` or raising a `CommandArgParseError` exactly as `parse`
+        would for the tokens fed so far. The parser itself is unaffected
+        and can keep being fed.
+        """
+        current = self._result
+        result = ParseResult(self._spec, list(self._tokens))
+        result._flags = dict(current._flags)
+        result._args = {k: list(v) for k, v in current._args.items()}
+        result._positionals = {
+            k: list(v) for k, v in current._positionals.items()}
+        result._leftovers = list(current._leftovers)
+        if current._lazy is not None:
+            result._lazy = (dict(current._lazy[0]), dict(current._lazy[1]))
+
+        state = _ParseState(self._spec, result)
+        state.pending_arg = self._state.pending_arg
+        state.finish()
+
+        self._spec._validate(result)
+        return result
+
+
+class _UndoParseState(_ParseState):
+    """
+    A `_ParseState` that logs how to reverse every change it makes to its
+    result. Each fed token first logs its cursor state, followed by an
+    entry for each arg, flag or positional list it touches.
+    """
+
+    def __init__(self, spec, result):
+        super(_UndoParseState, self).__init__(spec, result)
+        self.undo = []
+
+    def feed(self, token):
+        self.undo.append((
+            'cursor', self.found_break, self.in_leftovers, self.pending_arg,
+            self.pos_index, self.pos_remaining, len(self.result._leftovers),
+        ))
+        _ParseState.feed(self, token)
+
+    def rollback(self, mark):
+        result = self.result
+        undo = self.undo
+        while len(undo) > mark:
+            entry = undo.pop()
+            kind = entry[0]
+            if kind == 'cursor':
+                (_, self.found_break, self.in_leftovers, self.pending_arg,
+                    self.pos_index, self.pos_remaining, n_leftovers) = entry
+                del result._leftovers[n_leftovers:]
+            elif kind == 'flags':
+                for flag_char, count in entry[1].items():
+                    if count is _MISSING:
+                        del result._flags[flag_char]
+                    else:
+                        result._flags[flag_char] = count
+            elif kind == 'arg':
+                _, arg_name, length, was_lazy = entry
+                _truncate(result._args, arg_name, length)
+                if not was_lazy:
+                    result._lazy[0].pop(arg_name, None)
+            else:
+                _, pos_name, length = entry
+                _truncate(result._positionals, pos_name, length)
+
+    def _add_arg_value(self, arg_name, arg_val):
+        lazy = self.result._lazy
+        self.undo.append((
+            'arg', arg_name, _length(self.result._args, arg_name),
+            lazy is None or arg_name in lazy[0],
+        ))
+        _ParseState._add_arg_value(self, arg_name, arg_val)
+
+    def _parse_flag(self, flag_str):
+        flags = self.result._flags
+        self.undo.append((
+            'flags',
+            {flag_char: flags.get(flag_char, _MISSING) for flag_char in flag_str},
+        ))
+        _ParseState._parse_flag(self, flag_str)
+
+    def _parse_positional(self, raw_value):
+        slots = self._positional_slots
+        if self.pos_index < len(slots):
+            pos_name = slots[self.pos_index][0]
+            self.undo.append((
+                'positional', pos_name,
+                _length(self.result._positionals, pos_name),
+            ))
+        _ParseState._parse_positional(self, raw_value)
+
+
+def _length(values, name):
+    return len(values[name]) if name in values else None
+
+
+def _truncate(values, name, length):
+    if length is None:
+        del values[name]
+    else:
+        del values[name][length:]
@@ -0,0 +1,168 @@
+import time
+from collections import OrderedDict
+
+from .spec import ParserSpec, _ParseState
+
+
+__all__ = ['ParseStats', 'InstrumentedSpec']
+
+
+class ParseStats(object):
+    """
+    Accumulates the time spent in each parse phase, across parses.
+
+    Any object with a `record(phase, seconds)` method can be used in its
+    place, to forward timings straight to a metrics pipeline.
+
+    Phases:
+        `tokenize` a whole scan of the argument list, which includes the
+            phases below and any arg parsers.
+        `parse_arg`, `parse_flag`, `parse_positional` handling of one
+            `--name`, flag cluster or positional token.
+        `arg_value` storing one arg value, including its parser. For
+            `--name=value` this is inside `parse_arg`; for `--name value`
+            it is the handling of the value token.
+        `parser:<name>` one call to the parser of the named arg or
+            positional.
+        `validate_args`, `validate_flags`, `validate_positionals`,
+        `validate_leftovers` each validation step; positional parsers run
+            inside `validate_positionals`.
+    """
+
+    def __init__(self):
+        self._seconds = OrderedDict()
+        self._counts = OrderedDict()
+
+    def record(self, phase, seconds):
+        if phase in self._seconds:
+            self._seconds[phase] += seconds
+            self._counts[phase] += 1
+        else:
+            self._seconds[phase] = seconds
+            self._counts[phase] = 1
+
+    def as_dict(self):
+        """{phase: {'count': calls, 'seconds': total time}}"""
+        return OrderedDict(
+            (phase, {'count': self._counts[phase], 'seconds': seconds})
+            for phase, seconds in self._seconds.items()
+        )
+
+    def reset(self):
+        self._seconds.clear()
+        self._counts.clear()
+
+
+class InstrumentedSpec(ParserSpec):
+    """
+    A copy of a `ParserSpec` that times every parse phase and reports it to
+    `stats` (a new `ParseStats` by default). Build one with
+    `ParserSpec.instrumented`; the spec it was copied from is untouched and
+    pays nothing for instrumentation.
+    """
+
+    def __init__(self, spec, stats=None):
+        self.stats = ParseStats() if stats is None else stats
+        record = self.stats.record
+
+        options = spec._options()
+        options['arg_defs'] = OrderedDict(
+            (name, _timed_def(arg_def, name, record))
+            for name, arg_def in spec._arg_defs.items()
+        )
+        options['positional_defs'] = OrderedDict(
+            (name, _timed_def(pos_def, name, record))
+            for name, pos_def in spec._positional_defs.items()
+        )
+        super(InstrumentedSpec, self).__init__(**options)
+
+    def _scan(self, args, defer=False):
+        start = time.perf_counter()
+        try:
+            return super(InstrumentedSpec, self)._scan(args, defer)
+        finally:
+            self.stats.record('tokenize', time.perf_counter() - start)
+
+    def _scan_stream(self, tokens):
+        start = time.perf_counter()
+        try:
+            return super(InstrumentedSpec, self)._scan_stream(tokens)
+        finally:
+            self.stats.record('tokenize', time.perf_counter() - start)
+
+    def _validate_args(self, result):
+        return self._timed('validate_args', ParserSpec._validate_args, result)
+
+    def _validate_flags(self, result):
+        return self._timed('validate_flags', ParserSpec._validate_flags, result)
+
+    def _validate_positionals(self, result, pos_outcomes=None):
+        return self._timed(
+            'validate_positionals', ParserSpec._validate_positionals,
+            result, pos_outcomes,
+        )
+
+    def _validate_leftovers(self, result):
+        return self._timed(
+            'validate_leftovers', ParserSpec._validate_leftovers, result)
+
+    def _timed(self, phase, method, *args):
+        start = time.perf_counter()
+        try:
+            return method(self, *args)
+        finally:
+            self.stats.record(phase, time.perf_counter() - start)
+
+
+class _InstrumentedParseState(_ParseState):
+    def __init__(self, spec, result):
+        super(_InstrumentedParseState, self).__init__(spec, result)
+        self._record = spec.stats.record
+
+    def _parse_arg(self, arg_str):
+        start = time.perf_counter()
+        try:
+            _ParseState._parse_arg(self, arg_str)
+        finally:
+            self._record('parse_arg', time.perf_counter() - start)
+
+    def _add_arg_value(self, arg_name, arg_val):
+        start = time.perf_counter()
+        try:
+            _ParseState._add_arg_value(self, arg_name, arg_val)
+        finally:
+            self._record('arg_value', time.perf_counter() - start)
+
+    def _parse_flag(self, flag_str):
+        start = time.perf_counter()
+        try:
+            _ParseState._parse_flag(self, flag_str)
+        finally:
+            self._record('parse_flag', time.perf_counter() - start)
+
+    def _parse_positional(self, raw_value):
+        start = time.perf_counter()
+        try:
+            _ParseState._parse_positional(self, raw_value)
+        finally:
+            self._record('parse_positional', time.perf_counter() - start)
+
+
+InstrumentedSpec._state_class = _InstrumentedParseState
+
+
+def _timed_def(definition, name, record):
+    parser = definition.parser
+    if parser is None:
+        return definition
+
+    phase = 'parser:{}'.format(name)
+
+    def timed_parser(value):
+        start = time.perf_counter()
+        try:
+            return parser(value)
+        finally:
+            record(phase, time.perf_counter() - start)
+
+    return definition._replace(parser=timed_parser)
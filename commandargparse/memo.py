@@ -0,0 +1,90 @@
+import functools
+import sys
+
+from .cache import CacheInfo
+
+
+__all__ = ['MemoizedParser']
+
+
+class MemoizedParser(object):
+    """
+    Wraps an arg value parser with a bounded LRU memo keyed by the raw
+    string, for batches where the same values recur. Enable it per arg
+    with `ArgParser.add_arg(..., memoize=maxsize)`.
+
+    Raw strings are interned, and each distinct string maps to one parsed
+    object, so a batch of results shares one object per value. With no
+    `parser`, the interned string itself is returned. As the parsed object
+    is shared, the parser should return immutable values. Values the parser
+    rejects are not memoized.
+
+    arguments:
+        `parser` the value parser to wrap, or None.
+        `maxsize` the most values to keep; the least recently used is
+            evicted first.
+    """
+
+    def __init__(self, parser=None, maxsize=1024):
+        assert maxsize > 0, "maxsize should be >0"
+
+        self.parser = parser
+        self._maxsize = maxsize
+        # Misses where the parser raised, so nothing was stored.
+        self._rejected = 0
+        # The C LRU cache is thread safe and does not store exceptions.
+        self._memo = functools.lru_cache(maxsize)(self._parse)
+
+    def __call__(self, value):
+        if type(value) is str:
+            return self._memo(value)
+        return value if self.parser is None else self.parser(value)
+
+    def _parse(self, value):
+        value = sys.intern(value)
+        if self.parser is None:
+            return value
+        try:
+            return self.parser(value)
+        except BaseException:
+            self._rejected += 1
+            raise
+
+    @property
+    def hit_rate(self):
+        """Fraction of calls answered from the memo, 0.0 before any."""
+        info = self._memo.cache_info()
+        calls = info.hits + info.misses
+        return info.hits / calls if calls else 0.0
+
+    def cache_info(self):
+        info = self._memo.cache_info()
+        # Every accepted miss adds an entry, so any beyond currsize were
+        # evicted.
+        return CacheInfo(
+            info.hits, info.misses,
+            info.misses - self._rejected - info.currsize,
+            self._maxsize, info.currsize,
+        )
+
+    def clear(self):
+        self._memo.cache_clear()
+        self._rejected = 0
+
+    def __repr__(self):
+        # Stable across processes, as `spec_fingerprint` relies on it.
+        parser = self.parser
+        return 'MemoizedParser({}, maxsize={})'.format(
+            None if parser is None else '{}.{}'.format(
+                getattr(parser, '__module__', None),
+                getattr(parser, '__qualname__', repr(parser)),
+            ),
+            self._maxsize,
+        )
+
+    def __getstate__(self):
+        # The memo and its counters stay with this process.
+        return {'parser': self.parser, 'maxsize': self._maxsize}
+
+    def __setstate__(self, state):
+        self.__init__(state['parser'], state['maxsize'])
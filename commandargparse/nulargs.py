@@ -0,0 +1,109 @@
+import os
+import re
+from collections import namedtuple
+
+from .cache import ParseCache
+from .errors import CommandArgParseError
+from .result import ParseResult
+
+
+__all__ = ['iter_nul_tokens', 'scan_proc_cmdlines', 'ProcessArgs']
+
+
+_NUL = re.compile(b'\0')
+
+
+ProcessArgs = namedtuple('ProcessArgs', ['pid', 'program', 'outcome'])
+ProcessArgs.__doc__ = """
+One process found by `scan_proc_cmdlines`: its `pid`, `program` (argv[0])
+and `outcome`, the `ParseResult` of its remaining arguments or the
+`CommandArgParseError` they raised. With a `ParseCache`, a successful
+outcome is its `CompactParseResult`.
+"""
+
+
+def iter_nul_tokens(buffer, encoding='utf-8', errors='surrogateescape'):
+    """
+    Yield the arguments in a NUL-delimited buffer, such as the contents of
+    `/proc/<pid>/cmdline` or the output of `find -print0`, as strings.
+
+    `buffer` may be `bytes`, a `memoryview`, an `mmap` or any other
+    bytes-like object. A trailing NUL terminates the last argument rather
+    than starting an empty one. Each argument is decoded only when it is
+    reached, so a parse that stops early decodes no more than it used.
+
+    `bytes` are split in one C call, which is the fastest for the small
+    buffers `/proc` gives. Other buffers are never copied as a whole: each
+    argument is decoded straight from a memoryview slice of the buffer.
+    Undecodable bytes are kept as surrogates by default, as for `sys.argv`.
+    """
+    if isinstance(buffer, bytes):
+        pieces = buffer.split(b'\0')
+        if not pieces[-1]:
+            pieces.pop()
+        for piece in pieces:
+            yield piece.decode(encoding, errors)
+        return
+
+    view = memoryview(buffer)
+    if view.format != 'B' or view.ndim != 1:
+        view = view.cast('B')
+    try:
+        start = 0
+        for match in _NUL.finditer(view):
+            end = match.start()
+            yield str(view[start:end], encoding, errors)
+            start = end + 1
+        if start < len(view):
+            yield str(view[start:], encoding, errors)
+    finally:
+        # Let an mmap be closed once iteration is done.
+        view.release()
+
+
+def scan_proc_cmdlines(spec, pids=None, program=None, proc_root='/proc'):
+    """
+    Parse the command line of every running process with `spec` (an
+    `ArgParser`, `ParserSpec` or `ParseCache`), yielding a `ProcessArgs`
+    for each.
+
+    `pids` limits the scan to those processes. `program` keeps only
+    processes whose argv[0] has that base name; no other process has more
+    than its argv[0] decoded. Processes that exit mid-scan, can't be read,
+    or have no command line (kernel threads) are skipped.
+    """
+    if not isinstance(spec, ParseCache):
+        spec = spec.compile()
+
+    if pids is None:
+        try:
+            pids = sorted(int(name) for name in os.listdir(proc_root)
+                          if name.isdigit())
+        except (IOError, OSError):
+            return
+
+    for pid in pids:
+        path = os.path.join(proc_root, str(pid), 'cmdline')
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except (IOError, OSError):
+            continue
+        if not data:
+            continue
+
+        tokens = iter_nul_tokens(data)
+        argv0 = next(tokens)
+        if program is not None and os.path.basename(argv0) != program:
+            continue
+
+        try:
+            outcome = spec.parse(tokens)
+        except CommandArgParseError as e:
+            outcome = e
+        else:
+            if isinstance(outcome, ParseResult):
+                # Don't keep the whole command line alive through the
+                # result.
+                outcome._data = None
+        yield ProcessArgs(pid, argv0, outcome)
@@ -0,0 +1,141 @@
+import mmap
+
+from .errors import CommandArgParseResponseFileError
+
+
+__all__ = ['expand_response_files']
+
+
+# Bytes read at a time from a response file that can't be mapped.
+_CHUNK_SIZE = 1 << 16
+
+
+def expand_response_files(
+    tokens, max_depth=4, delimiter=None, encoding='utf-8', literal=None,
+):
+    """
+    Yield `tokens`, replacing each `@path` token with the arguments read
+    from that file, recursively up to `max_depth` files deep.
+
+    Files hold one argument per line, or are NUL-delimited, as written by
+    `find -print0`; `delimiter` forces '\\n' or '\\0', otherwise a file
+    containing a NUL byte is taken as NUL-delimited. Blank lines are
+    skipped. Files are memory-mapped and split one argument at a time, so
+    only the arguments consumed so far are ever held as strings. Files that
+    can't be mapped, such as pipes and files under `/proc` that report no
+    size, are read and split in chunks instead; for those the delimiter is
+    chosen by whether the first chunk contains a NUL byte.
+
+    A file that can't be read, or nesting deeper than `max_depth`, raises
+    `CommandArgParseResponseFileError` when that token is reached.
+
+    `literal`, if given, is called as each `@path` token is reached, in a
+    file or not; when it returns true the token is yielded as it is. A
+    `ParserSpec` passes a check of its scan state, so that `@path` after
+    `--` or as the value of `--name` is not expanded.
+    """
+    for token in tokens:
+        if _is_response_file(token) and not (literal and literal()):
+            for expanded in _read_response_file(
+                token[1:], max_depth, delimiter, encoding, literal,
+            ):
+                yield expanded
+        else:
+            yield token
+
+
+def _is_response_file(token):
+    return isinstance(token, str) and len(token) > 1 and token[0] == '@'
+
+
+def _read_response_file(path, depth, delimiter, encoding, literal):
+    if depth <= 0:
+        raise CommandArgParseResponseFileError(path, 'nested too deeply')
+
+    try:
+        f = open(path, 'rb')
+    except (IOError, OSError) as e:
+        raise CommandArgParseResponseFileError(path, e)
+
+    with f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, IOError, OSError):
+            mm = None
+
+        if mm is None:
+            tokens = _split_stream(f, path, delimiter, encoding)
+        else:
+            tokens = _split(mm, delimiter, encoding)
+
+        try:
+            for token in tokens:
+                if _is_response_file(token) and not (literal and literal()):
+                    for nested in _read_response_file(
+                        token[1:], depth - 1, delimiter, encoding, literal,
+                    ):
+                        yield nested
+                else:
+                    yield token
+        finally:
+            if mm is not None:
+                mm.close()
+
+
+def _split(mm, delimiter, encoding):
+    if delimiter is None:
+        sep = b'\0' if mm.find(b'\0') != -1 else b'\n'
+    else:
+        sep = delimiter.encode('ascii')
+    lines = sep == b'\n'
+
+    size = len(mm)
+    pos = 0
+    while pos < size:
+        end = mm.find(sep, pos)
+        if end == -1:
+            end = size
+        raw = mm[pos:end]
+        pos = end + 1
+
+        if lines:
+            raw = raw.rstrip(b'\r')
+            if not raw.strip():
+                continue
+        yield raw.decode(encoding)
+
+
+def _split_stream(f, path, delimiter, encoding):
+    chunk = _read_chunk(f, path)
+    if delimiter is None:
+        sep = b'\0' if b'\0' in chunk else b'\n'
+    else:
+        sep = delimiter.encode('ascii')
+    lines = sep == b'\n'
+
+    # The start of an argument whose end hasn't been read yet.
+    partial = b''
+    while True:
+        if chunk:
+            pieces = (partial + chunk).split(sep)
+            partial = pieces.pop()
+        else:
+            pieces = [partial] if partial else []
+
+        for raw in pieces:
+            if lines:
+                raw = raw.rstrip(b'\r')
+                if not raw.strip():
+                    continue
+            yield raw.decode(encoding)
+
+        if not chunk:
+            break
+        chunk = _read_chunk(f, path)
+
+
+def _read_chunk(f, path):
+    try:
+        return f.read(_CHUNK_SIZE)
+    except (IOError, OSError) as e:
+        raise CommandArgParseResponseFileError(path, e)
@@ -0,0 +1,516 @@
+from array import array
+from copy import deepcopy
+from itertools import chain
+from types import MappingProxyType
+
+from .errors import (
+    CommandArgParseMultiError,
+    CommandArgParseArgValidationFailed,
+    CommandArgParsePosValidationFailed,
+    CommandArgParseMissingPositional,
+    CommandArgParseUndefinedArg,
+    CommandArgParseUndefinedFlag,
+    CommandArgParseUndefinedPositional,
+)
+
+
+__all__ = ['ParseResult', 'CompactParseResult', 'StreamedPositional']
+
+
+class _ResultAccessors(object):
+    """
+    The `get_*` accessors shared by `ArgParser` and `ParseResult`.
+
+    Subclasses provide the parsed data (`_flags`, `_args`, `_positionals`,
+    `_leftovers`) and the definitions (`_arg_defs`, `_flag_defs`,
+    `_positional_defs`) along with `_strict`, and set `_views` to None
+    whenever the parsed data is replaced. `_lazy` is None, or holds the
+    names of args and positionals whose parsers have not run yet, see
+    `ArgParser`'s `lazy` argument.
+
+    The `get_*_view` accessors return read-only mappings and tuples over
+    the stored data instead of copies. The first view requested converts
+    the stored lists to tuples in place, after which no view call copies
+    anything.
+    """
+
+    __slots__ = ()
+
+    def get_arg_multi(self, arg_name):
+        return list(self.get_arg_multi_view(arg_name))
+
+    def get_arg_multi_view(self, arg_name):
+        if arg_name in self._args:
+            self._resolve_arg(arg_name)
+            self._get_views()
+            return self._args[arg_name]
+
+        elif arg_name in self._arg_defs:
+            return (self._arg_defs[arg_name].default,)
+
+        elif self._strict:
+            raise CommandArgParseUndefinedArg(arg_name)
+
+        else:
+            return ()
+
+    def get_arg(self, arg_name):
+        args = self.get_arg_multi_view(arg_name)
+        try:
+            return args[-1]
+        except IndexError:
+            return None
+
+    def get_all_args_multi(self):
+        self._resolve_all_args()
+        return deepcopy({k: list(v) for k, v in self._args.items()})
+
+    def get_all_args_multi_view(self):
+        self._resolve_all_args()
+        return self._get_views()[0]
+
+    def get_all_args(self):
+        self._resolve_all_args()
+        return {k: v[-1] for k, v in self._args.items()}
+
+    def get_flag_count(self, flag_name):
+        if flag_name in self._flags:
+            return self._flags[flag_name]
+
+        elif flag_name not in self._flag_defs and self._strict:
+            raise CommandArgParseUndefinedFlag(flag_name)
+
+        else:
+            return 0
+
+    def get_flag(self, flag_name):
+        count = self.get_flag_count(flag_name)
+        return count > 0
+
+    def get_all_flag_counts(self):
+        return dict(self._flags)
+
+    def get_all_flag_counts_view(self):
+        return self._get_views()[1]
+
+    def get_all_flags(self):
+        return set(k for k, v in self._flags.items() if v > 0)
+
+    def get_all_positionals(self):
+        self._resolve_all_positionals()
+        return deepcopy({
+            k: self._copy_positional(k, v)
+            for k, v in self._positionals.items()
+        })
+
+    def get_all_positionals_view(self):
+        self._resolve_all_positionals()
+        return self._get_views()[2]
+
+    def get_positional(self, name):
+        self._resolve_positional(name)
+        if name in self._positionals:
+            return self._copy_positional(name, self._positionals[name])
+
+        elif self._strict and name not in self._positional_defs:
+            raise CommandArgParseUndefinedPositional(name)
+
+        else:
+            return []
+
+    def get_positional_view(self, name):
+        self._resolve_positional(name)
+        if name in self._positionals:
+            return self._get_views()[2][name]
+
+        elif self._strict and name not in self._positional_defs:
+            raise CommandArgParseUndefinedPositional(name)
+
+        else:
+            return ()
+
+    def get_leftovers(self):
+        return list(self._leftovers)
+
+    def get_leftovers_view(self):
+        self._get_views()
+        return self._leftovers
+
+    def validate(self):
+        """Run any parsers still pending in lazy mode, raising their
+        validation errors the same way `parse` does.
+        """
+        if self._lazy is None:
+            return
+
+        errs = []
+        for arg_name in list(self._lazy[0]):
+            try:
+                self._resolve_arg(arg_name)
+            except CommandArgParseArgValidationFailed as e:
+                errs.append(e)
+        for pos_name in list(self._lazy[1]):
+            try:
+                self._resolve_positional(pos_name)
+            except CommandArgParsePosValidationFailed as e:
+                errs.append(e)
+
+        if len(errs) == 1:
+            raise errs[0]
+        elif errs:
+            raise CommandArgParseMultiError(errs)
+
+    def _resolve_arg(self, arg_name):
+        # Run the arg's parser over its raw values, once; a failure is kept
+        # and raised again on every later access.
+        if self._lazy is None or arg_name not in self._lazy[0]:
+            return
+
+        pending = self._lazy[0]
+        err = pending[arg_name]
+        if err is None:
+            parser = self._arg_defs[arg_name].parser
+            arg_vals = self._args[arg_name]
+            try:
+                parsed = [parser(arg_val) for arg_val in arg_vals]
+            except (ValueError, TypeError) as e:
+                err = pending[arg_name] = \
+                        CommandArgParseArgValidationFailed(arg_name, e)
+            else:
+                self._args[arg_name] = type(arg_vals)(parsed)
+                del pending[arg_name]
+                return
+        raise err
+
+    def _resolve_all_args(self):
+        if self._lazy is not None:
+            for arg_name in list(self._lazy[0]):
+                self._resolve_arg(arg_name)
+
+    def _resolve_positional(self, name):
+        if self._lazy is None or name not in self._lazy[1]:
+            return
+
+        pending = self._lazy[1]
+        err = pending[name]
+        if err is None:
+            parser = self._positional_defs[name].parser
+            try:
+                value = parser(self._positionals.get(name, []))
+            except (ValueError, TypeError) as e:
+                err = pending[name] = \
+                        CommandArgParsePosValidationFailed(name, e)
+            else:
+                self._positionals[name] = value
+                del pending[name]
+                return
+        raise err
+
+    def _resolve_all_positionals(self):
+        if self._lazy is not None:
+            for pos_name in list(self._lazy[1]):
+                self._resolve_positional(pos_name)
+
+    def _is_raw_positional(self, name, values):
+        # Values straight from the argument list, as opposed to the output
+        # of a positional's parser or a `StreamedPositional`.
+        return (
+            isinstance(values, (list, tuple))
+            and self._positional_defs[name].parser is None
+        )
+
+    def _copy_positional(self, name, values):
+        if isinstance(values, list) or self._is_raw_positional(name, values):
+            return list(values)
+        # Parser output or a `StreamedPositional`, handed back as is.
+        return values
+
+    def _get_views(self):
+        views = self._views
+        if views is None:
+            args = self._args
+            for arg_name, arg_vals in args.items():
+                args[arg_name] = tuple(arg_vals)
+
+            positionals = self._positionals
+            for pos_name, values in positionals.items():
+                if self._is_raw_positional(pos_name, values):
+                    positionals[pos_name] = tuple(values)
+
+            self._leftovers = tuple(self._leftovers)
+
+            views = self._views = (
+                MappingProxyType(args),
+                MappingProxyType(self._flags),
+                MappingProxyType(positionals),
+            )
+        return views
+
+
+class _SpecResult(_ResultAccessors):
+    """A result that looks its definitions up on the spec that made it."""
+
+    __slots__ = ('_spec',)
+
+    @property
+    def spec(self):
+        return self._spec
+
+    @property
+    def _strict(self):
+        return self._spec._strict
+
+    @property
+    def _arg_defs(self):
+        return self._spec._arg_defs
+
+    @property
+    def _flag_defs(self):
+        return self._spec._flag_defs
+
+    @property
+    def _positional_defs(self):
+        return self._spec._positional_defs
+
+
+class ParseResult(_SpecResult):
+    """
+    The outcome of a single `ParserSpec.parse` call.
+
+    Holds only the parsed data and a reference to the spec that produced it,
+    so any number of results can share one spec.
+    """
+
+    __slots__ = (
+        '_data', '_flags', '_args', '_positionals', '_leftovers', '_views',
+        '_lazy',
+    )
+
+    def __init__(self, spec, data):
+        self._spec = spec
+
+        self._data = data
+        self._flags = dict()
+        self._args = dict()
+        self._positionals = dict()
+        self._leftovers = list()
+
+        self._views = None
+        # (arg names, positional names) awaiting their parsers, each mapped
+        # to None or the error their parser raised.
+        self._lazy = ({}, {}) if spec._lazy else None
+
+
+class CompactParseResult(_SpecResult):
+    """
+    A memory-lean, read-only form of a `ParseResult`, for keeping large
+    numbers of results around. Built with `ParserSpec.parse_compact` or
+    `CompactParseResult.from_result`.
+
+    Flag counts are kept in an array indexed by each flag's position in the
+    spec, and arg and positional values in tuples in definition order.
+    Undefined args and flags, only possible when not strict, are kept aside
+    in plain dicts. The original argument list is not retained, and any
+    lazy parsers are run when the compact result is built.
+    """
+
+    __slots__ = (
+        '_flag_counts', '_arg_values', '_positional_values', '_leftovers',
+        '_extra',
+    )
+
+    _lazy = None
+
+    def __init__(
+        self, spec, flag_counts, arg_values, positional_values, leftovers,
+        extra=None,
+    ):
+        self._spec = spec
+        self._flag_counts = flag_counts
+        self._arg_values = arg_values
+        self._positional_values = positional_values
+        self._leftovers = leftovers
+        # None, or (undefined flag counts, undefined arg values).
+        self._extra = extra
+
+    @classmethod
+    def from_result(cls, result):
+        result.validate()
+        spec = result._spec
+
+        flag_counts = array('I', [0]) * len(spec._flag_order)
+        extra_flags = {}
+        for flag_char, count in result._flags.items():
+            index = spec._flag_index.get(flag_char)
+            if index is None:
+                extra_flags[flag_char] = count
+            else:
+                flag_counts[index] = count
+
+        arg_values = [None] * len(spec._arg_order)
+        extra_args = {}
+        for arg_name, arg_vals in result._args.items():
+            index = spec._arg_index.get(arg_name)
+            if index is None:
+                extra_args[arg_name] = tuple(arg_vals)
+            else:
+                arg_values[index] = tuple(arg_vals)
+
+        positional_values = tuple(
+            _freeze_positional(result, pos_name)
+            for pos_name, _, _ in spec._positional_slots
+        )
+
+        extra = None
+        if extra_flags or extra_args:
+            extra = (extra_flags, extra_args)
+
+        return cls(
+            spec, flag_counts, tuple(arg_values), positional_values,
+            tuple(result._leftovers), extra,
+        )
+
+    # The mapping forms of the data, built on demand for the generic
+    # accessors.
+    @property
+    def _flags(self):
+        flags = {
+            flag_char: count
+            for flag_char, count in zip(self._spec._flag_order, self._flag_counts)
+            if count
+        }
+        if self._extra is not None:
+            flags.update(self._extra[0])
+        return flags
+
+    @property
+    def _args(self):
+        args = {
+            arg_name: arg_vals
+            for arg_name, arg_vals in zip(self._spec._arg_order, self._arg_values)
+            if arg_vals is not None
+        }
+        if self._extra is not None:
+            args.update(self._extra[1])
+        return args
+
+    @property
+    def _positionals(self):
+        return {
+            pos_name: values
+            for (pos_name, _, _), values
+            in zip(self._spec._positional_slots, self._positional_values)
+            if values is not None
+        }
+
+    def get_arg_multi_view(self, arg_name):
+        index = self._spec._arg_index.get(arg_name)
+        if index is not None:
+            arg_vals = self._arg_values[index]
+            if arg_vals is not None:
+                return arg_vals
+            return (self._arg_defs[arg_name].default,)
+
+        elif self._extra is not None and arg_name in self._extra[1]:
+            return self._extra[1][arg_name]
+
+        elif self._strict:
+            raise CommandArgParseUndefinedArg(arg_name)
+
+        else:
+            return ()
+
+    def get_flag_count(self, flag_name):
+        index = self._spec._flag_index.get(flag_name)
+        if index is not None:
+            return self._flag_counts[index]
+
+        elif self._extra is not None and flag_name in self._extra[0]:
+            return self._extra[0][flag_name]
+
+        elif self._strict:
+            raise CommandArgParseUndefinedFlag(flag_name)
+
+        else:
+            return 0
+
+    def get_all_flag_counts(self):
+        return self._flags
+
+    def get_all_flags(self):
+        flags = set(
+            flag_char
+            for flag_char, count in zip(self._spec._flag_order, self._flag_counts)
+            if count
+        )
+        if self._extra is not None:
+            flags.update(k for k, v in self._extra[0].items() if v > 0)
+        return flags
+
+    def get_positional(self, name):
+        return self._copy_positional(name, self.get_positional_view(name))
+
+    def get_positional_view(self, name):
+        index = self._spec._positional_index.get(name)
+        if index is not None:
+            values = self._positional_values[index]
+            return () if values is None else values
+
+        elif self._strict:
+            raise CommandArgParseUndefinedPositional(name)
+
+        else:
+            return ()
+
+    def _get_views(self):
+        # Everything is already immutable; only the mappings need building.
+        return (
+            MappingProxyType(self._args),
+            MappingProxyType(self._flags),
+            MappingProxyType(self._positionals),
+        )
+
+
+def _freeze_positional(result, pos_name):
+    values = result._positionals.get(pos_name)
+    if values is not None and result._is_raw_positional(pos_name, values):
+        return tuple(values)
+    return values
+
+
+class StreamedPositional(object):
+    """
+    The values of a greedy (`count='*'`) positional when parsing with
+    `ParserSpec.parse_stream`.
+
+    Values are pulled from the underlying token iterator one at a time as
+    this is iterated, so it can only be consumed once. If the positional
+    ends up with fewer than `minimum` values,
+    `CommandArgParseMissingPositional` is raised when it is exhausted.
+    """
+
+    def __init__(self, head, tokens, minimum=0):
+        self._values = chain(head, tokens)
+        self._minimum = minimum
+        self._count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            value = next(self._values)
+        except StopIteration:
+            if self._count < self._minimum:
+                self._minimum = 0 # only report it once
+                raise CommandArgParseMissingPositional()
+            raise
+
+        self._count += 1
+        return value
+
+    next = __next__
+
+    def __deepcopy__(self, memo):
+        # Shared rather than copied, since copying would consume it.
+        return self
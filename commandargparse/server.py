@@ -0,0 +1,177 @@
+"""
+An asyncio server that reads command lines, parses them with reusable
+specs and runs their handlers. Kept out of the package namespace like
+`commandargparse.aio`; use `from commandargparse.server import ...`.
+
+Protocol: each request is one line, `<command> [arguments...]`, split as
+by `shlex.split`. Arguments are never expanded as `@path` response files,
+as clients must not be able to make the server read local files. Each gets one response line, in request order:
+`OK <text>` with the handler's return value, or `ERR <message>`. Newlines
+in either are escaped as `\\n`.
+"""
+import asyncio
+import inspect
+import sys
+
+from .cache import ParseCache
+from .cmdstring import CommandTokenizer
+from .commandargparse import ArgParser
+from .errors import CommandArgParseError, CommandArgParseUnknownCommand
+from .spec import ParserSpec
+
+
+__all__ = ['CommandServer']
+
+
+class CommandServer(object):
+    """
+    arguments:
+        `commands` mapping of command name to (spec, handler). `spec` is
+            an `ArgParser`, which is compiled, or anything with a
+            `parse(args)` method, such as a `ParserSpec` or a `ParseCache`
+            (whose spec may not use `response_files`). A `ParserSpec`
+            parses the rest of the line in one pass with `parse_string`, so
+            its errors carry offsets. `handler(result)` may be a plain
+            function or a coroutine function; its return value is sent
+            back as text.
+        `concurrency` the most handlers running at once, across all
+            connections.
+        `max_pending` the most requests a single connection may have in
+            flight. Once reached, no more lines are read from it until the
+            oldest response has been written, pushing back on the client.
+    """
+
+    def __init__(self, commands=None, concurrency=64, max_pending=256):
+        assert concurrency > 0, "concurrency should be >0"
+        assert max_pending > 0, "max_pending should be >0"
+
+        self._commands = dict()
+        self._concurrency = concurrency
+        self._max_pending = max_pending
+        self._semaphore = None
+
+        for name, (spec, handler) in (commands or {}).items():
+            self.add_command(name, spec, handler)
+
+    def add_command(self, name, spec, handler):
+        assert name not in self._commands, "Duplicate command def"
+        if isinstance(spec, ArgParser):
+            spec = spec.compile()
+        assert not (isinstance(spec, ParseCache) and
+                    spec.spec._response_files), \
+                "Server commands can't expand response files"
+        self._commands[name] = (spec, handler)
+
+    async def handle_line(self, line):
+        """Parse and run one command line, returning its response line."""
+        try:
+            tokenizer = CommandTokenizer(line)
+            tokens = iter(tokenizer)
+            command = next(tokens, None)
+            if command is None:
+                return _response('ERR', 'Empty command')
+
+            try:
+                spec, handler = self._commands[command]
+            except KeyError:
+                raise CommandArgParseUnknownCommand(command)
+
+            if isinstance(spec, ParserSpec):
+                result = spec.parse_string(line, tokenizer.end)
+            else:
+                result = spec.parse(list(tokens))
+        except CommandArgParseError as e:
+            return _response('ERR', str(e))
+        except Exception as e:
+            # An arg parser raising anything else must not take the
+            # connection down with it.
+            return _response('ERR', 'Parse failed: {}'.format(e))
+
+        async with self._get_semaphore():
+            try:
+                output = handler(result)
+                if inspect.isawaitable(output):
+                    output = await output
+            except Exception as e:
+                return _response('ERR', 'Handler failed: {}'.format(e))
+
+        return _response('OK', '' if output is None else str(output))
+
+    async def handle_stream(self, reader, writer):
+        """Serve requests read from `reader`, writing responses to `writer`,
+        until `reader` reaches EOF.
+        """
+        pending = asyncio.Queue(maxsize=self._max_pending)
+        read = asyncio.ensure_future(self._read_requests(reader, pending))
+        respond = asyncio.ensure_future(self._write_responses(pending, writer))
+
+        try:
+            # If either side fails, e.g. the client stops reading and the
+            # writer raises, the other must not be left blocked on a queue
+            # that nothing serves.
+            done, _ = await asyncio.wait(
+                [read, respond], return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            read.cancel()
+            respond.cancel()
+            while not pending.empty():
+                task = pending.get_nowait()
+                if task is not None:
+                    task.cancel()
+
+        for task in done:
+            task.result()
+
+    async def serve_unix(self, path):
+        """Serve connections on a Unix socket at `path` until cancelled."""
+        server = await asyncio.start_unix_server(self._serve_connection, path)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_stdin(self):
+        """Serve requests from stdin, writing responses to stdout."""
+        loop = asyncio.get_running_loop()
+
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+        transport, protocol = await loop.connect_write_pipe(
+            asyncio.streams.FlowControlMixin, sys.stdout)
+        writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+
+        await self.handle_stream(reader, writer)
+
+    async def _serve_connection(self, reader, writer):
+        try:
+            await self.handle_stream(reader, writer)
+        finally:
+            writer.close()
+
+    async def _read_requests(self, reader, pending):
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            line = line.decode('utf-8', 'replace').rstrip('\r\n')
+            # Blocks once max_pending requests are unanswered.
+            await pending.put(asyncio.ensure_future(self.handle_line(line)))
+        await pending.put(None)
+
+    async def _write_responses(self, pending, writer):
+        while True:
+            task = await pending.get()
+            if task is None:
+                break
+            writer.write(await task)
+            await writer.drain()
+
+    def _get_semaphore(self):
+        # Created lazily so it binds to the running event loop.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+        return self._semaphore
+
+
+def _response(status, text):
+    return '{} {}\n'.format(status, text.replace('\n', '\\n')).encode('utf-8')
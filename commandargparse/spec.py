@@ -0,0 +1,695 @@
+from collections import OrderedDict, namedtuple
+
+from .errors import (
+    CommandArgParseError,
+    CommandArgParseMultiError,
+    CommandArgParseMissingArg,
+    CommandArgParseMissingArgValue,
+    CommandArgParseMissingPositional,
+    CommandArgParseArgValidationFailed,
+    CommandArgParsePosValidationFailed,
+    CommandArgParseInvalidArg,
+    CommandArgParseInvalidFlag,
+    CommandArgParseExtraPositionals,
+    CommandArgParseSyntaxError,
+    ErrorRecord,
+)
+from .cmdstring import CommandTokenizer
+from .nulargs import iter_nul_tokens
+from .respfile import expand_response_files
+from .result import CompactParseResult, ParseResult, StreamedPositional
+
+
+__all__ = ['ParserSpec', 'ArgDef', 'FlagDef', 'PositionalDef']
+
+
+ArgDef = namedtuple('ArgDef', ['help', 'required', 'parser', 'default'])
+FlagDef = namedtuple('FlagDef', ['help'])
+PositionalDef = namedtuple(
+    'PositionalDef', ['help', 'parser', 'count', 'minimum'])
+
+
+class ParserSpec(object):
+    """
+    A frozen set of parser definitions, normally built with
+    `ArgParser.compile()`.
+
+    A spec is never modified by parsing, so one instance can parse any
+    number of argument lists, from any number of threads. Each call to
+    `parse` returns a new `ParseResult`.
+
+    With `fail_fast`, parsing stops at the first error and raises it alone,
+    instead of scanning everything and raising every error together.
+    """
+
+    # Set to `_ParseState` below; subclasses may swap in their own.
+    _state_class = None
+
+    def __init__(
+        self, name='ArgParser', strict=True, allow_leftovers=False,
+        arg_defs=None, flag_defs=None, positional_defs=None, lazy=False,
+        stop_at_positionals=False, response_files=False,
+        response_file_depth=4, fail_fast=False,
+    ):
+        self._name = name
+        self._strict = strict
+        self._allow_leftovers = allow_leftovers
+        self._lazy = lazy
+        self._stop_at_positionals = stop_at_positionals
+        self._response_files = response_files
+        self._response_file_depth = response_file_depth
+        self._fail_fast = fail_fast
+
+        self._arg_defs = dict(arg_defs or {})
+        self._flag_defs = dict(flag_defs or {})
+        self._positional_defs = OrderedDict(positional_defs or ())
+
+        # (name, count, minimum) for each positional, in order.
+        self._positional_slots = tuple(
+            (pos_name, pos_def.count, pos_def.minimum)
+            for pos_name, pos_def in self._positional_defs.items()
+        )
+
+        # Definition order of flags, args and positionals, as used by
+        # `CompactParseResult`.
+        self._flag_order = tuple(self._flag_defs)
+        self._flag_index = {k: i for i, k in enumerate(self._flag_order)}
+        self._arg_order = tuple(self._arg_defs)
+        self._arg_index = {k: i for i, k in enumerate(self._arg_order)}
+        self._positional_index = {
+            k: i for i, k in enumerate(self._positional_defs)}
+
+        # Name of the trailing greedy (count='*') positional, if any.
+        self._greedy_positional = None
+        if self._positional_slots and self._positional_slots[-1][1] == '*':
+            self._greedy_positional = self._positional_slots[-1][0]
+
+        # Help text, rendered on first request by `format_usage`.
+        self._usage = None
+
+    @property
+    def name(self):
+        return self._name
+
+    def _options(self):
+        """The constructor arguments this spec was built with."""
+        return dict(
+            name=self._name,
+            strict=self._strict,
+            allow_leftovers=self._allow_leftovers,
+            arg_defs=self._arg_defs,
+            flag_defs=self._flag_defs,
+            positional_defs=self._positional_defs,
+            lazy=self._lazy,
+            stop_at_positionals=self._stop_at_positionals,
+            response_files=self._response_files,
+            response_file_depth=self._response_file_depth,
+            fail_fast=self._fail_fast,
+        )
+
+    def compile(self):
+        """Return this spec, so an `ArgParser` or a spec can be passed
+        wherever a spec is needed.
+        """
+        return self
+
+    def memo_info(self):
+        """{arg name: `CacheInfo`} for every arg whose parser is a
+        `MemoizedParser`.
+        """
+        return {
+            arg_name: arg_def.parser.cache_info()
+            for arg_name, arg_def in self._arg_defs.items()
+            if hasattr(arg_def.parser, 'cache_info')
+        }
+
+    def format_usage(self):
+        """The help text for this spec, built from the definitions' help
+        strings. Rendered once, on first call, and cached.
+        """
+        if self._usage is None:
+            from .usage import render_usage
+            self._usage = render_usage(self)
+        return self._usage
+
+    def specialized(self):
+        """Return a `SpecializedSpec` copy of this spec, whose scan is a
+        function generated for these definitions.
+        """
+        from .codegen import SpecializedSpec
+        return SpecializedSpec(self)
+
+    def instrumented(self, stats=None):
+        """Return an `InstrumentedSpec` copy of this spec that reports the
+        time spent in each parse phase to `stats`.
+        """
+        from .instrument import InstrumentedSpec
+        return InstrumentedSpec(self, stats)
+
+    def parse(self, args, executor=None):
+        """Parse `args`, returning a `ParseResult` or raising a
+        `CommandArgParseError`.
+
+        If a `concurrent.futures` `executor` is given, every arg and
+        positional parser is submitted to it once scanning is done, and
+        their outcomes are waited for together. Errors are reported in the
+        same order as without one.
+        """
+        if executor is None:
+            result = self._scan(args)
+            self._validate(result)
+        else:
+            result = self._scan(args, defer=True)
+            self._run_deferred(result, executor)
+        return result
+
+    def try_parse(self, args):
+        """
+        As `parse`, but reporting failure without raising: returns
+        (result, None) on success, or (None, error) where error is an
+        `ErrorRecord` of the first error found, in scan order as with
+        `fail_fast`.
+
+        The scan records the first error's code and subject in place of
+        building an exception, and stops there, so a malformed argument
+        list costs no exception objects and no scan past the bad token.
+        Only errors raised outside the scan, such as an unreadable response
+        file, are still caught as exceptions.
+        """
+        result = ParseResult(self, args)
+        state = self._state_class(self, result)
+        state.record_errors = True
+        feed = state.feed
+
+        try:
+            tokens = iter(self._expand(args, state))
+            for token in tokens:
+                feed(token)
+                if state.error is not None:
+                    return None, state.error
+                if state.in_leftovers:
+                    result._leftovers.extend(tokens)
+                    break
+            state.finish()
+        except CommandArgParseError as e:
+            return None, ErrorRecord.from_error(e)
+
+        error = state.error or self._first_error(result)
+        if error is not None:
+            return None, error
+        return result, None
+
+    def parse_string(self, command, start=0):
+        """Parse a raw command string such as `deploy -fv --env=prod svc1`.
+
+        The string is split, with quoting and escapes handled as by
+        `shlex.split`, in the same pass that scans the arguments. Malformed
+        quoting and invalid tokens raise `CommandArgParseSyntaxError`. It
+        and the errors found in scanning (undefined flags and args, bad or
+        missing arg values) carry the character `offset` of the token at
+        fault, which their messages include.
+
+        `@path` tokens are never expanded here, even with `response_files`,
+        as the string is not trusted to name local files.
+
+        `start` skips that many characters of `command`, such as a command
+        name already read; offsets still count from the start of `command`.
+        """
+        tokenizer = CommandTokenizer(command, start)
+        result = ParseResult(self, command)
+        state = self._state_class(self, result)
+        feed = state.feed
+        try:
+            for token in tokenizer:
+                state.offset = tokenizer.offset
+                feed(token)
+            state.finish()
+        except CommandArgParseError as e:
+            if type(e) is not CommandArgParseError:
+                raise
+            # An invalid token; point at where it starts.
+            raise CommandArgParseSyntaxError(str(e), tokenizer.offset)
+
+        self._validate(result)
+        return result
+
+    def parse_buffer(self, buffer, encoding='utf-8', errors='surrogateescape'):
+        """Parse the NUL-delimited arguments in `buffer`, such as the
+        contents of `/proc/<pid>/cmdline`; see `iter_nul_tokens`. Arguments
+        are decoded as the scan reaches them, and the result keeps no
+        reference to the buffer, so an mmap can be closed afterwards.
+        """
+        result = self._scan(iter_nul_tokens(buffer, encoding, errors))
+        result._data = None
+        self._validate(result)
+        return result
+
+    def parse_compact(self, args):
+        """As `parse`, but returning a `CompactParseResult`."""
+        return CompactParseResult.from_result(self.parse(args))
+
+    def cached(self, maxsize=256):
+        """Return a `ParseCache` over this spec."""
+        from .cache import ParseCache
+        return ParseCache(self, maxsize=maxsize)
+
+    def parse_stream(self, tokens):
+        """Parse any iterable of tokens, such as a generator over a file.
+
+        Tokens are consumed lazily. Once the greedy (`count='*'`) positional,
+        if there is one, takes its first value, scanning stops and the
+        positional is returned as a `StreamedPositional` that draws the
+        remaining tokens on demand. Every one of those tokens is a value of
+        the positional, as though a `--` had been seen before it. The
+        positional's parser, if set, is given the `StreamedPositional`.
+        """
+        result = self._scan_stream(tokens)
+        self._validate(result)
+        return result
+
+    def parse_many(self, argvs, workers=None, executor='thread', chunksize=256):
+        """Parse many argument lists concurrently, see `parse_many`."""
+        from .batch import parse_many
+        return parse_many(
+            self, argvs, workers=workers, executor=executor,
+            chunksize=chunksize,
+        )
+
+    def parse_columnar(self, argvs):
+        """Parse many argument lists into a `ColumnarBatch`."""
+        from .columnar import ColumnarBatch
+        batch = ColumnarBatch(self)
+        batch.extend(argvs)
+        return batch
+
+    def _scan(self, args, defer=False):
+        result = ParseResult(self, args)
+        if defer:
+            # Leave every arg parser to the caller, see `_deferred_calls`.
+            result._lazy = ({}, {})
+        state = self._state_class(self, result)
+        feed = state.feed
+
+        tokens = iter(self._expand(args, state))
+        for token in tokens:
+            feed(token)
+            if state.in_leftovers:
+                # Everything after the first unplaceable positional is a
+                # leftover, so hand the rest of the cursor over in one go.
+                result._leftovers.extend(tokens)
+                break
+
+        state.finish()
+        return result
+
+    def _scan_stream(self, tokens):
+        result = ParseResult(self, None)
+        state = self._state_class(self, result)
+        feed = state.feed
+
+        greedy = self._greedy_positional
+        positionals = result._positionals
+        head = []
+
+        tokens = iter(self._expand(tokens, state))
+        for token in tokens:
+            feed(token)
+            if state.in_leftovers:
+                result._leftovers.extend(tokens)
+                break
+            if state.pos_remaining == '*' and greedy in positionals:
+                head = positionals[greedy]
+                break
+
+        state.finish()
+
+        if greedy is not None:
+            minimum = self._positional_defs[greedy].minimum
+            positionals[greedy] = StreamedPositional(head, tokens, minimum)
+
+        return result
+
+    def _expand(self, tokens, state):
+        """`tokens` with response files expanded, for feeding to `state`
+        one at a time. Whether each `@path` is expanded depends on the
+        state when it is reached, see `_ParseState.takes_literal`.
+        """
+        if not self._response_files:
+            return tokens
+        return expand_response_files(
+            tokens, self._response_file_depth, literal=state.takes_literal)
+
+    def _deferred_calls(self, result):
+        """
+        The parser calls a deferred scan skipped, as
+        (name, index, parser, value) tuples. `index` is the position of an
+        arg value among that arg's values, or None for a positional, whose
+        parser takes all of its values.
+        """
+        calls = []
+        for arg_name in result._lazy[0]:
+            parser = self._arg_defs[arg_name].parser
+            for index, arg_val in enumerate(result._args[arg_name]):
+                if not isinstance(arg_val, CommandArgParseError):
+                    calls.append((arg_name, index, parser, arg_val))
+
+        for pos_name, pos_def in self._positional_defs.items():
+            if pos_def.parser is not None:
+                values = result._positionals.get(pos_name, [])
+                calls.append((pos_name, None, pos_def.parser, values))
+
+        return calls
+
+    def _finish_deferred(self, result, calls, outcomes):
+        """
+        Store the outcomes of `_deferred_calls`, each an (ok, value or
+        error) pair from `_call_parser`, where a normal parse would have,
+        then validate the result as `parse` does.
+        """
+        pos_outcomes = {}
+        for (name, index, _, _), (ok, value) in zip(calls, outcomes):
+            if index is None:
+                pos_outcomes[name] = (ok, value)
+            elif ok:
+                result._args[name][index] = value
+            else:
+                result._args[name][index] = \
+                        CommandArgParseArgValidationFailed(name, value)
+
+        result._lazy = None
+        self._validate(result, pos_outcomes)
+
+    def _run_deferred(self, result, executor):
+        calls = self._deferred_calls(result)
+        futures = [
+            executor.submit(_call_parser, parser, value)
+            for _, _, parser, value in calls
+        ]
+        outcomes = [future.result() for future in futures]
+        self._finish_deferred(result, calls, outcomes)
+
+    def _validate(self, result, pos_outcomes=None):
+        errs = self._validate_args(result)
+        if not (errs and self._fail_fast):
+            errs.extend(self._validate_flags(result))
+        if not (errs and self._fail_fast):
+            errs.extend(self._validate_positionals(result, pos_outcomes))
+        if not (errs and self._fail_fast):
+            errs.extend(self._validate_leftovers(result))
+
+        if len(errs) == 1 or (errs and self._fail_fast):
+            raise errs[0]
+        elif errs:
+            raise CommandArgParseMultiError(errs)
+
+    def _first_error(self, result):
+        """
+        As `_validate`, for a result scanned with `record_errors`, but
+        returning an `ErrorRecord` of the first error, or None, rather than
+        building and raising the errors.
+        """
+        for arg_name, arg_def in self._arg_defs.items():
+            if arg_def.required and arg_name not in result._args:
+                return ErrorRecord(CommandArgParseMissingArg.code, arg_name, 1)
+
+        for pos_name, pos_def in self._positional_defs.items():
+            values = result._positionals.get(pos_name, [])
+            if pos_def.minimum > len(values):
+                return ErrorRecord(
+                    CommandArgParseMissingPositional.code, None, 1)
+
+            parser = pos_def.parser
+            if parser is None:
+                continue
+            if result._lazy is not None:
+                result._lazy[1][pos_name] = None
+                continue
+
+            ok, value = _call_parser(parser, values)
+            if not ok:
+                return ErrorRecord(
+                    CommandArgParsePosValidationFailed.code, pos_name, 1)
+            result._positionals[pos_name] = value
+
+        if not self._allow_leftovers and result._leftovers:
+            return ErrorRecord(CommandArgParseExtraPositionals.code, None, 1)
+        return None
+
+    def _validate_args(self, result):
+        errs = list(
+            arg_val
+            for arg_vals in result._args.values()
+            for arg_val in arg_vals
+            if isinstance(arg_val, CommandArgParseError)
+        )
+
+        errs.extend(
+            CommandArgParseMissingArg(arg_name)
+            for arg_name, arg_def in self._arg_defs.items()
+            if arg_def.required and arg_name not in result._args
+        )
+
+        return errs
+
+    def _validate_flags(self, result):
+        return [
+            flag_count
+            for flag_count in result._flags.values()
+            if isinstance(flag_count, CommandArgParseError)
+        ]
+
+    def _validate_positionals(self, result, pos_outcomes=None):
+        errs = []
+        have_missing = False
+        for pos_name, pos_def in self._positional_defs.items():
+            values = result._positionals.get(pos_name, [])
+
+            # A streamed positional checks its own minimum once exhausted.
+            if isinstance(values, StreamedPositional):
+                pass
+            elif pos_def.minimum > len(values) and not have_missing:
+                errs.append(CommandArgParseMissingPositional())
+                have_missing = True
+
+            parser = pos_def.parser
+            if parser is None:
+                continue
+
+            if pos_outcomes is not None:
+                ok, value = pos_outcomes[pos_name]
+            elif result._lazy is not None:
+                result._lazy[1][pos_name] = None
+                continue
+            else:
+                ok, value = _call_parser(parser, values)
+
+            if ok:
+                result._positionals[pos_name] = value
+            else:
+                errs.append(CommandArgParsePosValidationFailed(pos_name, value))
+
+        return errs
+
+    def _validate_leftovers(self, result):
+        if not self._allow_leftovers and result._leftovers:
+            return [CommandArgParseExtraPositionals()]
+        return []
+
+
+def _call_parser(parser, value):
+    """Call a value parser, returning (True, value) or (False, error)."""
+    try:
+        return True, parser(value)
+    except (ValueError, TypeError) as e:
+        return False, e
+
+
+class _ParseState(object):
+    """
+    The cursor state of a single scan.
+
+    Tokens are fed in one at a time, in order, so a scan is a single pass
+    over its input that never pops, slices or copies the argument list.
+    """
+
+    def __init__(self, spec, result):
+        self.result = result
+        self.found_break = False
+        self.in_leftovers = False
+        # Name of a `--name` arg still waiting for its value token.
+        self.pending_arg = None
+        # Character offset to tag the errors found now with, when scanning
+        # a command string, see `parse_string`; None otherwise.
+        self.offset = None
+        self._pending_offset = None
+        # With `record_errors`, the first error is kept in `error` as an
+        # `ErrorRecord` rather than built, see `ParserSpec.try_parse`.
+        self.record_errors = False
+        self.error = None
+
+        self._lazy = result._lazy is not None
+        self._fail_fast = spec._fail_fast
+        self._stop_at_positionals = spec._stop_at_positionals
+        self._strict = spec._strict
+        self._arg_defs = spec._arg_defs
+        self._flag_defs = spec._flag_defs
+        self._positional_slots = spec._positional_slots
+
+        # Index of the positional currently being filled, and how many more
+        # values it will take ('*' for unlimited).
+        self.pos_index = 0
+        if self._positional_slots:
+            self.pos_remaining = self._positional_slots[0][1]
+        else:
+            self.pos_remaining = None
+
+    def feed(self, token):
+        if self.in_leftovers:
+            self.result._leftovers.append(token)
+
+        elif self.pending_arg is not None:
+            arg_name = self.pending_arg
+            self.pending_arg = None
+            # Errors in the value point at its `--name`.
+            self.offset = self._pending_offset
+            self._add_arg_value(arg_name, token)
+
+        elif self.found_break or not token.startswith('-'):
+            self._parse_positional(token)
+
+        elif token == '--':
+            self.found_break = True
+
+        elif token[1:2] == '-':
+            if token[2:3] == '-':
+                self._invalid_token(token)
+            else:
+                self._parse_arg(token[2:]) # strip leading --
+
+        elif len(token) > 1:
+            self._parse_flag(token[1:]) # strip leading -
+
+        else:
+            self._invalid_token(token)
+
+    def takes_literal(self):
+        """Whether the next token is taken as it is, never as `@path`: it
+        follows `--` or is the value of a `--name` arg.
+        """
+        return self.found_break or self.pending_arg is not None
+
+    def finish(self):
+        if self.pending_arg is not None:
+            arg_name = self.pending_arg
+            self.pending_arg = None
+            self.offset = self._pending_offset
+            if self.record_errors:
+                if self._strict and arg_name not in self._arg_defs:
+                    self._record_error(CommandArgParseInvalidArg, arg_name)
+                else:
+                    self._record_error(CommandArgParseMissingArgValue, arg_name)
+                return
+            missing = CommandArgParseMissingArgValue(arg_name)
+            missing.offset = self.offset
+            self._add_arg_value(arg_name, missing)
+
+    def _invalid_token(self, token):
+        message = "Invalid token {}".format(token)
+        if self.record_errors:
+            self.error = ErrorRecord(CommandArgParseError.code, message, 1)
+        else:
+            raise CommandArgParseError(message)
+
+    def _record_error(self, error_class, subject):
+        self.error = ErrorRecord(error_class.code, subject, 1)
+
+    def _parse_arg(self, arg_str):
+        arg_name, sep, arg_val = arg_str.partition('=')
+        if sep:
+            self._add_arg_value(arg_name, arg_val)
+        else:
+            self.pending_arg = arg_name
+            self._pending_offset = self.offset
+
+    def _add_arg_value(self, arg_name, arg_val):
+        try:
+            arg_def = self._arg_defs[arg_name]
+        except KeyError:
+            if self._strict:
+                if self.record_errors:
+                    self._record_error(CommandArgParseInvalidArg, arg_name)
+                    return
+                arg_val = CommandArgParseInvalidArg(arg_name)
+                arg_val.offset = self.offset
+                if self._fail_fast:
+                    raise arg_val
+            parser = None
+        else:
+            parser = arg_def.parser
+
+        if parser is None or isinstance(arg_val, CommandArgParseError):
+            fmt_arg_val = arg_val
+        elif self._lazy:
+            fmt_arg_val = arg_val
+            self.result._lazy[0][arg_name] = None
+        else:
+            try:
+                fmt_arg_val = parser(arg_val)
+            except (ValueError, TypeError) as e:
+                if self.record_errors:
+                    self._record_error(CommandArgParseArgValidationFailed, arg_name)
+                    return
+                fmt_arg_val = CommandArgParseArgValidationFailed(arg_name, e)
+                fmt_arg_val.offset = self.offset
+                if self._fail_fast:
+                    raise fmt_arg_val
+
+        args = self.result._args
+        if arg_name not in args:
+            args[arg_name] = [fmt_arg_val]
+        else:
+            args[arg_name].append(fmt_arg_val)
+
+    def _parse_flag(self, flag_str):
+        flags = self.result._flags
+        for flag_char in flag_str:
+            if self._strict and flag_char not in self._flag_defs:
+                if self.record_errors:
+                    self._record_error(CommandArgParseInvalidFlag, flag_char)
+                    return
+                invalid = CommandArgParseInvalidFlag(flag_char)
+                invalid.offset = self.offset
+                if self._fail_fast:
+                    raise invalid
+                flags[flag_char] = invalid
+            elif flag_char not in flags:
+                flags[flag_char] = 1
+            else:
+                flags[flag_char] += 1
+
+    def _parse_positional(self, raw_value):
+        slots = self._positional_slots
+        if self.pos_index >= len(slots):
+            self.in_leftovers = True
+            self.result._leftovers.append(raw_value)
+            return
+
+        pos_def_name = slots[self.pos_index][0]
+
+        positionals = self.result._positionals
+        if pos_def_name not in positionals:
+            positionals[pos_def_name] = [raw_value]
+        else:
+            positionals[pos_def_name].append(raw_value)
+
+        if self.pos_remaining != '*':
+            self.pos_remaining -= 1
+            if self.pos_remaining == 0:
+                self.pos_index += 1
+                if self.pos_index < len(slots):
+                    self.pos_remaining = slots[self.pos_index][1]
+                elif self._stop_at_positionals:
+                    self.in_leftovers = True
+
+
+ParserSpec._state_class = _ParseState
@@ -0,0 +1,140 @@
+import hashlib
+import marshal
+import os
+import pickle
+import tempfile
+
+
+__all__ = ['dump_spec', 'load_spec', 'load_or_build', 'spec_fingerprint']
+
+
+_MAGIC = 'commandargparse-spec'
+_FORMAT_VERSION = 1
+
+
+def spec_fingerprint(spec):
+    """
+    A hex digest of everything that defines `spec`: its options and every
+    arg, flag and positional definition. Parsers are identified by their
+    module and qualified name.
+    """
+    digest = hashlib.sha1()
+
+    def add(*parts):
+        for part in parts:
+            digest.update(repr(part).encode('utf-8'))
+            digest.update(b'\0')
+
+    options = spec._options()
+    for option in sorted(options):
+        if not option.endswith('_defs'):
+            add(option, options[option])
+
+    for kind, defs in (
+        ('arg', spec._arg_defs),
+        ('flag', spec._flag_defs),
+        ('positional', spec._positional_defs),
+    ):
+        for name, definition in defs.items():
+            fields = definition._asdict()
+            if 'parser' in fields:
+                fields['parser'] = _callable_name(fields['parser'])
+            add(kind, name, sorted(fields.items()))
+
+    return digest.hexdigest()
+
+
+def dump_spec(spec, path, key=None):
+    """
+    Write `spec` to `path` so `load_spec` can restore it without rerunning
+    the code that built it. `key` is any string identifying that code, such
+    as a version; a load with a different key is treated as a miss.
+    Parsers are stored by reference, so they must be importable functions.
+    """
+    payload = (_MAGIC, _FORMAT_VERSION, key, spec_fingerprint(spec), spec)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(payload, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_spec(path, key=None):
+    """Return the spec stored at `path` by `dump_spec`, or None if there is
+    no usable one: the file is missing, unreadable, from another format
+    version, was stored under a different `key`, or restores to a spec
+    whose fingerprint differs from the one it was stored with (as when the
+    spec classes have changed since).
+
+    The file is unpickled, which can run arbitrary code. Only load from a
+    path that no one else can write to: never a shared directory such as
+    `/tmp`.
+    """
+    try:
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+    except (IOError, OSError, EOFError, pickle.UnpicklingError,
+            AttributeError, ImportError):
+        return None
+
+    if (
+        not isinstance(payload, tuple) or len(payload) != 5
+        or payload[0] != _MAGIC or payload[1] != _FORMAT_VERSION
+    ):
+        return None
+
+    _, _, stored_key, fingerprint, spec = payload
+    if stored_key != key:
+        return None
+    try:
+        if spec_fingerprint(spec) != fingerprint:
+            return None
+    except AttributeError:
+        return None
+    return spec
+
+
+def load_or_build(path, builder, key=None):
+    """
+    Return the spec cached at `path`, or call `builder()` (returning an
+    `ArgParser` or `ParserSpec`), cache its spec at `path` and return it.
+
+    `key` defaults to a hash of `builder`'s compiled code, so editing the
+    builder function invalidates the cache. Changes made in functions it
+    calls are not seen; pass an explicit `key` if it relies on them.
+
+    The cache is best effort: if `path` can't be written, or the spec can't
+    be pickled (a parser is a lambda or a local function), the built spec
+    is returned uncached. As for `load_spec`, `path` must not be writable
+    by others.
+    """
+    if key is None:
+        key = _code_key(builder)
+
+    spec = load_spec(path, key)
+    if spec is None:
+        spec = builder().compile()
+        try:
+            dump_spec(spec, path, key)
+        except (IOError, OSError, pickle.PicklingError, AttributeError,
+                TypeError):
+            pass
+    return spec
+
+
+def _code_key(func):
+    return hashlib.sha1(marshal.dumps(func.__code__)).hexdigest()
+
+
+def _callable_name(func):
+    if func is None:
+        return None
+    return '{}.{}'.format(
+        getattr(func, '__module__', None),
+        getattr(func, '__qualname__', repr(func)),
+    )
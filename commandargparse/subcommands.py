@@ -0,0 +1,115 @@
+import threading
+from collections import OrderedDict, namedtuple
+from importlib import import_module
+
+from .commandargparse import ArgParser
+from .errors import CommandArgParseUnknownCommand
+from .spec import ParserSpec, PositionalDef
+
+
+__all__ = ['CommandTree', 'CommandResult']
+
+
+CommandResult = namedtuple(
+    'CommandResult', ['command', 'global_result', 'result', 'module'])
+CommandResult.__doc__ = """
+The outcome of `CommandTree.parse`: the selected `command` name, the
+result of parsing the global args and flags, the subcommand's own result
+(itself a `CommandResult` for nested trees) and the imported `module`.
+"""
+
+
+class CommandTree(object):
+    """
+    Dispatches git-style `tool [global options] command [command options]`
+    argument lists to subcommands that are only imported when selected.
+
+    Each subcommand is declared by the path of a module that defines
+    `build_parser()`, returning an `ArgParser`, `ParserSpec` or a nested
+    `CommandTree`, and optionally `main(result, global_result)` for
+    `dispatch`. Registering a subcommand stores only its name and module
+    path, so startup cost does not grow with the number of subcommands.
+
+    arguments:
+        `parser` an `ArgParser` holding the global args and flags. The
+            subcommand name is taken as an extra positional after any
+            positionals it defines, and everything after it is passed on
+            to the subcommand, as the global result's leftovers.
+        `command_name` name of that positional.
+    """
+
+    def __init__(self, parser, command_name='command'):
+        self._parser = parser
+        self._command_name = command_name
+
+        self._commands = OrderedDict()
+        self._global_spec = None
+        self._loaded = dict()
+        self._lock = threading.Lock()
+
+    def add_subcommand(self, name, module_path, help=''):
+        assert name not in self._commands, "Duplicate subcommand def"
+        self._commands[name] = (module_path, help)
+
+    @property
+    def commands(self):
+        """Mapping of subcommand name to (module path, help)."""
+        return self._commands
+
+    def parse(self, args):
+        global_result = self._compile_global().parse(args)
+        command = global_result.get_positional(self._command_name)[0]
+
+        module, spec = self._load(command)
+        result = spec.parse(global_result.get_leftovers())
+
+        return CommandResult(command, global_result, result, module)
+
+    def dispatch(self, args):
+        """Parse `args` and call the selected module's `main`."""
+        outcome = self.parse(args)
+        return outcome.module.main(outcome.result, outcome.global_result)
+
+    def _compile_global(self):
+        # `compile` gives a new spec once the parser gains a definition, so
+        # the global spec is rebuilt whenever that changes.
+        spec = self._parser.compile()
+        if self._global_spec is None or self._global_spec[0] is not spec:
+            assert spec._greedy_positional is None, \
+                    "Global parser can't have a greedy positional"
+
+            positional_defs = list(spec._positional_defs.items())
+            positional_defs.append((
+                self._command_name,
+                PositionalDef(help='', parser=None, count=1, minimum=1),
+            ))
+            options = spec._options()
+            options.update(
+                positional_defs=positional_defs,
+                allow_leftovers=True,
+                stop_at_positionals=True,
+            )
+            self._global_spec = (spec, ParserSpec(**options))
+        return self._global_spec[1]
+
+    def _load(self, command):
+        try:
+            return self._loaded[command]
+        except KeyError:
+            pass
+
+        try:
+            module_path, _ = self._commands[command]
+        except KeyError:
+            raise CommandArgParseUnknownCommand(command)
+
+        with self._lock:
+            if command not in self._loaded:
+                module = import_module(module_path)
+                spec = module.build_parser()
+                # A `ParserSpec` or nested `CommandTree` is used as it is.
+                if isinstance(spec, ArgParser):
+                    spec = spec.compile()
+                self._loaded[command] = (module, spec)
+
+        return self._loaded[command]
@@ -0,0 +1,123 @@
+"""
+Help text rendering. Only imported the first time a spec's usage is
+requested, so it costs nothing on the parse path.
+"""
+__all__ = ['render_usage']
+
+
+# Names wider than this get their help text on the following line.
+_NAME_WIDTH = 24
+
+
+def render_usage(spec, width=79):
+    """Return the full help text for `spec` as one string."""
+    lines = [_usage_line(spec, width)]
+
+    sections = (
+        ('positionals', [
+            (pos_name, pos_def.help)
+            for pos_name, pos_def in spec._positional_defs.items()
+        ]),
+        ('args', [
+            ('--{}=VALUE'.format(arg_name), _arg_help(arg_def))
+            for arg_name, arg_def in spec._arg_defs.items()
+        ]),
+        ('flags', [
+            ('-{}'.format(flag_char), flag_def.help)
+            for flag_char, flag_def in spec._flag_defs.items()
+        ]),
+    )
+
+    for title, entries in sections:
+        if entries:
+            lines.append('')
+            lines.append('{}:'.format(title))
+            lines.extend(_entry_lines(entries, width))
+
+    lines.append('')
+    return '\n'.join(lines)
+
+
+def _usage_line(spec, width):
+    parts = []
+    if spec._flag_defs:
+        parts.append('[-{}]'.format(''.join(spec._flag_defs)))
+
+    optional_args = False
+    for arg_name, arg_def in spec._arg_defs.items():
+        if arg_def.required:
+            parts.append('--{}=VALUE'.format(arg_name))
+        else:
+            optional_args = True
+    if optional_args:
+        parts.append('[args]')
+
+    for pos_name, pos_def in spec._positional_defs.items():
+        if pos_def.count == '*':
+            parts.extend([pos_name] * pos_def.minimum)
+            parts.append('[{} ...]'.format(pos_name))
+        else:
+            parts.extend([pos_name] * pos_def.minimum)
+            parts.extend(
+                ['[{}]'.format(pos_name)] * (pos_def.count - pos_def.minimum))
+
+    prefix = 'usage: {} '.format(spec._name)
+    if not parts:
+        return prefix.rstrip()
+    wrapped = _wrap(' '.join(parts), max(width - len(prefix), 20))
+    return prefix + ('\n' + ' ' * len(prefix)).join(wrapped)
+
+
+def _arg_help(arg_def):
+    notes = []
+    if arg_def.required:
+        notes.append('required')
+    if arg_def.default is not None:
+        notes.append('default: {!r}'.format(arg_def.default))
+    if not notes:
+        return arg_def.help
+    return '{} ({})'.format(arg_def.help, ', '.join(notes)).lstrip()
+
+
+def _entry_lines(entries, width):
+    column = min(max(len(name) for name, _ in entries), _NAME_WIDTH) + 4
+    indent = ' ' * column
+
+    lines = []
+    for name, help in entries:
+        label = '  ' + name
+        if not help:
+            lines.append(label)
+            continue
+
+        wrapped = _wrap(help, max(width - column, 20))
+        if len(label) + 2 <= column:
+            lines.append(label.ljust(column) + wrapped[0])
+        else:
+            lines.append(label)
+            lines.append(indent + wrapped[0])
+        lines.extend(indent + line for line in wrapped[1:])
+    return lines
+
+
+def _wrap(text, width):
+    """Greedily split `text` into lines of at most `width` characters,
+    breaking only at whitespace. Much cheaper than `textwrap` for the
+    hundreds of short help strings a large spec has.
+    """
+    if len(text) <= width and '\n' not in text:
+        return [text]
+
+    lines = []
+    line = ''
+    for word in text.split():
+        if not line:
+            line = word
+        elif len(line) + 1 + len(word) <= width:
+            line += ' ' + word
+        else:
+            lines.append(line)
+            line = word
+    if line or not lines:
+        lines.append(line)
+    return lines
@@ -1,42 +1,28 @@
 #!/usr/bin/env bash
 
-while getopts "23" opt;
+# Requires Python 3.7 or later. Set PYTHON to choose the interpreter; -3
+# is still accepted for existing callers.
+while getopts "3" opt;
 do
-    case $opt in
-        2)
-            DO_2=Y
-            ;;
-        3)
-            DO_3=Y
-            ;;
-    esac
+    :
 done
 
-if [ -z $DO_2 ] && [ -z $DO_3 ];
-then
-    DO_2=Y
-    DO_3=Y
-fi
-
 shift $(( $OPTIND - 1 ))
 
-if [[ $DO_2 == Y ]];
+PYTHON=${PYTHON:-python3}
+
+if ! "$PYTHON" -c 'import sys; sys.exit(sys.version_info < (3, 7))';
 then
-    nosetests-2.7 \
-        --with-coverage\
-        --cover-package=commandargparse \
-        --cover-erase \
-        --cover-branches \
-        "$@"
+    echo "commandargparse requires Python 3.7 or later" >&2
+    exit 1
 fi
 
-
-if [[ $DO_3 == Y ]];
+if "$PYTHON" -c 'import coverage' 2>/dev/null;
 then
-    nosetests-3.4 \
-        --with-coverage\
-        --cover-package=commandargparse \
-        --cover-erase \
-        --cover-branches \
-        "$@"
+    "$PYTHON" -m coverage erase
+    "$PYTHON" -m coverage run --branch --source=commandargparse \
+        -m unittest discover -s tests "$@" &&
+        "$PYTHON" -m coverage report
+else
+    "$PYTHON" -m unittest discover -s tests "$@"
 fi
@@ -0,0 +1,112 @@
+import threading
+import unittest
+
+from commandargparse import (
+    ArgParser,
+    ParserSpec,
+    ParseResult,
+    CommandArgParseError,
+    CommandArgParseInvalidFlag,
+    CommandArgParseUndefinedArg,
+)
+
+
+class TestParserSpec(unittest.TestCase):
+    def _make_spec(self):
+        parser = ArgParser(strict=True, allow_leftovers=True)
+        parser.add_arg('a', parser=int, default=0)
+        parser.add_flag('f')
+        parser.add_positional('files', count=2)
+        return parser.compile()
+
+    def test_compile_returns_spec(self):
+        spec = self._make_spec()
+
+        self.assertIsInstance(spec, ParserSpec)
+        self.assertIs(spec.compile(), spec)
+
+    def test_compile_is_cached_until_redefined(self):
+        parser = ArgParser()
+        parser.add_flag('f')
+
+        spec = parser.compile()
+        self.assertIs(parser.compile(), spec)
+
+        parser.add_flag('g')
+        self.assertIsNot(parser.compile(), spec)
+
+    def test_spec_parses_many_times(self):
+        spec = self._make_spec()
+
+        first = spec.parse(['--a=1', '-f', 'x', 'y', 'z'])
+        second = spec.parse(['-ff', 'p'])
+
+        self.assertIsInstance(first, ParseResult)
+        self.assertEqual(first.get_arg('a'), 1)
+        self.assertEqual(first.get_flag_count('f'), 1)
+        self.assertEqual(first.get_positional('files'), ['x', 'y'])
+        self.assertEqual(first.get_leftovers(), ['z'])
+
+        self.assertEqual(second.get_arg('a'), 0)
+        self.assertEqual(second.get_flag_count('f'), 2)
+        self.assertEqual(second.get_positional('files'), ['p'])
+        self.assertEqual(second.get_leftovers(), [])
+
+    def test_result_is_strict(self):
+        spec = self._make_spec()
+        result = spec.parse([])
+
+        with self.assertRaises(CommandArgParseUndefinedArg):
+            result.get_arg('nope')
+
+    def test_spec_errors(self):
+        spec = self._make_spec()
+
+        with self.assertRaises(CommandArgParseInvalidFlag):
+            spec.parse(['-x'])
+
+        # A failed parse must not leak state into the next one.
+        self.assertEqual(spec.parse(['-f']).get_flag_count('f'), 1)
+
+    def test_spec_shared_across_threads(self):
+        spec = self._make_spec()
+        results = {}
+
+        def work(n):
+            results[n] = spec.parse(['--a', str(n), 'v{}'.format(n)])
+
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for n, result in results.items():
+            self.assertEqual(result.get_arg('a'), n)
+            self.assertEqual(result.get_positional('files'), ['v{}'.format(n)])
+
+    def test_large_greedy_positional(self):
+        parser = ArgParser()
+        parser.add_flag('v')
+        parser.add_positional('files', count='*')
+        spec = parser.compile()
+
+        args = ['-v'] + ['file{}'.format(n) for n in range(200000)]
+        result = spec.parse(args)
+
+        self.assertEqual(len(result.get_positional('files')), 200000)
+        self.assertEqual(result.get_flag_count('v'), 1)
+        self.assertEqual(len(args), 200001)
+
+    def test_arg_value_may_contain_equals(self):
+        parser = ArgParser()
+        parser.add_arg('env')
+        result = parser.compile().parse(['--env=KEY=value'])
+
+        self.assertEqual(result.get_arg('env'), 'KEY=value')
+
+    def test_bare_dash_is_invalid_token(self):
+        spec = ArgParser(strict=False).compile()
+
+        with self.assertRaises(CommandArgParseError):
+            spec.parse(['-'])
@@ -0,0 +1,67 @@
+import asyncio
+import time
+import unittest
+
+from commandargparse import (
+    ArgParser,
+    CommandArgParseMultiError,
+    CommandArgParseArgValidationFailed,
+    CommandArgParseInvalidFlag,
+    CommandArgParsePosValidationFailed,
+)
+from commandargparse.aio import parse_async
+
+
+async def slow_int(value):
+    await asyncio.sleep(0.05)
+    return int(value)
+
+
+async def slow_ints(values):
+    await asyncio.sleep(0.05)
+    return [int(v) for v in values]
+
+
+class TestParseAsync(unittest.TestCase):
+    def _make_parser(self):
+        parser = ArgParser()
+        parser.add_arg('a', parser=slow_int)
+        parser.add_arg('b', parser=slow_int)
+        parser.add_arg('c', parser=str.upper)
+        parser.add_flag('f')
+        parser.add_positional('nums', count='*', parser=slow_ints)
+        return parser
+
+    def test_parsers_awaited_concurrently(self):
+        spec = self._make_parser().compile()
+
+        start = time.perf_counter()
+        result = asyncio.run(parse_async(
+            spec, ['--a=1', '--a=2', '--b', '3', '--c=x', '4', '5']))
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.15)
+        self.assertEqual(result.get_arg_multi('a'), [1, 2])
+        self.assertEqual(result.get_arg('b'), 3)
+        self.assertEqual(result.get_arg('c'), 'X')
+        self.assertEqual(result.get_positional('nums'), [4, 5])
+
+    def test_errors_match_sync_order(self):
+        args = ['--a=x', '-z', '--b=2', '--a=y', 'n']
+
+        with self.assertRaises(CommandArgParseMultiError) as ctx:
+            asyncio.run(parse_async(self._make_parser(), args))
+
+        self.assertEqual(
+            [type(e) for e in ctx.exception.errors],
+            [
+                CommandArgParseArgValidationFailed,
+                CommandArgParseArgValidationFailed,
+                CommandArgParseInvalidFlag,
+                CommandArgParsePosValidationFailed,
+            ],
+        )
+
+    def test_single_error_raised_as_is(self):
+        with self.assertRaises(CommandArgParseArgValidationFailed):
+            asyncio.run(parse_async(self._make_parser(), ['--b=no']))
@@ -0,0 +1,25 @@
+import unittest
+
+from benchmarks import suite
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_every_case_runs(self):
+        for name, setup in suite.CASES.items():
+            setup()()
+
+    def test_compare_flags_regressions(self):
+        baseline = {'results': {
+            'a': {'seconds': 1.0, 'peak_bytes': 100},
+            'b': {'seconds': 1.0, 'peak_bytes': 100},
+        }}
+        current = {'results': {
+            'a': {'seconds': 1.1, 'peak_bytes': 100},
+            'b': {'seconds': 1.0, 'peak_bytes': 200},
+            'c': {'seconds': 1.0, 'peak_bytes': 100},
+        }}
+
+        rows, regressions = suite.compare(current, baseline, max_ratio=1.25)
+
+        self.assertEqual(regressions, ['b'])
+        self.assertEqual([row[0] for row in rows], ['a', 'b', 'c'])
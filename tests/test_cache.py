@@ -0,0 +1,94 @@
+import unittest
+
+from commandargparse import (
+    ArgParser,
+    CacheInfo,
+    CompactParseResult,
+    ParseCache,
+    CommandArgParseInvalidFlag,
+)
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+        def counting_int(value):
+            self.calls.append(value)
+            return int(value)
+
+        parser = ArgParser()
+        parser.add_arg('n', parser=counting_int)
+        parser.add_flag('v')
+        self.spec = parser.compile()
+
+    def test_hits_return_same_result(self):
+        cache = self.spec.cached(maxsize=4)
+
+        first = cache.parse(['--n=1', '-v'])
+        second = cache.parse(['--n=1', '-v'])
+
+        self.assertIsInstance(first, CompactParseResult)
+        self.assertIs(first, second)
+        self.assertEqual(second.get_arg('n'), 1)
+        self.assertEqual(self.calls, ['1'])
+        self.assertEqual(cache.cache_info(), CacheInfo(1, 1, 0, 4, 1))
+
+    def test_errors_are_cached(self):
+        cache = ParseCache(self.spec)
+
+        for _ in range(3):
+            with self.assertRaises(CommandArgParseInvalidFlag):
+                cache.parse(['-x'])
+
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+    def test_cached_errors_not_shared(self):
+        cache = ParseCache(self.spec)
+
+        try:
+            {}['key']
+        except KeyError:
+            with self.assertRaises(CommandArgParseInvalidFlag) as first:
+                cache.parse(['-x'])
+        with self.assertRaises(CommandArgParseInvalidFlag) as second:
+            cache.parse(['-x'])
+
+        self.assertIsNot(first.exception, second.exception)
+        self.assertIsNone(second.exception.__context__)
+        self.assertEqual(second.exception.flag, 'x')
+
+    def test_iterator_args(self):
+        parser = ArgParser()
+        parser.add_positional('words', count='*')
+        cache = ParseCache(parser)
+
+        first = cache.parse(iter(['a', 'b']))
+        second = cache.parse(iter(['a', 'b']))
+
+        self.assertEqual(first.get_positional('words'), ['a', 'b'])
+        self.assertIs(second, first)
+
+    def test_lru_eviction(self):
+        cache = ParseCache(self.spec, maxsize=2)
+
+        cache.parse(['--n=1'])
+        cache.parse(['--n=2'])
+        cache.parse(['--n=1'])  # 1 is now most recently used
+        cache.parse(['--n=3'])  # evicts 2
+        cache.parse(['--n=1'])
+
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(self.calls, ['1', '2', '3'])
+
+        cache.parse(['--n=2'])
+        self.assertEqual(self.calls, ['1', '2', '3', '2'])
+
+    def test_bypass(self):
+        cache = ParseCache(self.spec)
+
+        cache.parse(['--n=1'], cache=False)
+        cache.parse(['--n=1'], cache=False)
+
+        self.assertEqual(self.calls, ['1', '1'])
+        self.assertEqual(cache.cache_info().currsize, 0)
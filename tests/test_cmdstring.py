@@ -0,0 +1,150 @@
+import os
+import random
+import shlex
+import shutil
+import tempfile
+import unittest
+
+from commandargparse import (
+    ArgParser,
+    split_command,
+    CommandArgParseInvalidArg,
+    CommandArgParseInvalidFlag,
+    CommandArgParseMissingArgValue,
+    CommandArgParseSyntaxError,
+)
+
+
+class TestSplitCommand(unittest.TestCase):
+    def test_matches_shlex(self):
+        commands = [
+            '',
+            '   ',
+            'deploy -fv --env=prod svc1 svc2',
+            "  a  'b c'  \"d e\" ",
+            "--msg='it''s' x\\ y",
+            r'"a \" b" "c \\ d" "e \n f"',
+            r"'no \" escapes \\ here'",
+            'mixed"quo"ted\'parts\'here',
+            "empty '' \"\" end",
+            'tab\tsep\nnewline',
+            r'\-escaped \\backslash',
+        ]
+        for command in commands:
+            self.assertEqual(split_command(command), shlex.split(command), command)
+
+    def test_matches_shlex_random(self):
+        rng = random.Random(1234)
+        alphabet = 'ab -=\'"\\ '
+        for _ in range(2000):
+            command = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+            try:
+                expected = shlex.split(command)
+            except ValueError:
+                with self.assertRaises(CommandArgParseSyntaxError):
+                    split_command(command)
+            else:
+                self.assertEqual(split_command(command), expected, command)
+
+    def test_only_shlex_whitespace_splits(self):
+        rng = random.Random(4321)
+        alphabet = 'ab \t\r\n\xa0\x0b\x0c\u2003\'"\\'
+        for _ in range(2000):
+            command = ''.join(
+                rng.choice(alphabet) for _ in range(rng.randint(0, 10)))
+            try:
+                expected = shlex.split(command)
+            except ValueError:
+                with self.assertRaises(CommandArgParseSyntaxError):
+                    split_command(command)
+            else:
+                self.assertEqual(
+                    split_command(command), expected, repr(command))
+
+        self.assertEqual(split_command('a\xa0b c'), ['a\xa0b', 'c'])
+
+    def test_syntax_error_offsets(self):
+        with self.assertRaises(CommandArgParseSyntaxError) as ctx:
+            split_command('run --msg="unterminated')
+        self.assertEqual(ctx.exception.offset, 10)
+        self.assertIn('offset 10', str(ctx.exception))
+
+        with self.assertRaises(CommandArgParseSyntaxError) as ctx:
+            split_command('run trailing\\')
+        self.assertEqual(ctx.exception.offset, 12)
+
+
+class TestParseString(unittest.TestCase):
+    def _make_spec(self):
+        parser = ArgParser()
+        parser.add_flag('f')
+        parser.add_flag('v')
+        parser.add_arg('env')
+        parser.add_positional('command')
+        parser.add_positional('services', count='*')
+        return parser.compile()
+
+    def test_parse_string(self):
+        result = self._make_spec().parse_string(
+            'deploy -fv --env="prod eu" svc1 \'svc 2\'')
+
+        self.assertEqual(result.get_all_flags(), {'f', 'v'})
+        self.assertEqual(result.get_arg('env'), 'prod eu')
+        self.assertEqual(result.get_positional('command'), ['deploy'])
+        self.assertEqual(result.get_positional('services'), ['svc1', 'svc 2'])
+
+    def test_invalid_token_offset(self):
+        with self.assertRaises(CommandArgParseSyntaxError) as ctx:
+            self._make_spec().parse_string('deploy  ---bad')
+        self.assertEqual(ctx.exception.offset, 8)
+
+    def test_validation_errors_unchanged(self):
+        with self.assertRaises(CommandArgParseInvalidFlag):
+            self._make_spec().parse_string('deploy -x')
+
+    def test_scan_error_offsets(self):
+        cases = [
+            ('-fz svc', CommandArgParseInvalidFlag, 0),
+            ('deploy  --nope=1', CommandArgParseInvalidArg, 8),
+            ('deploy --nope 1', CommandArgParseInvalidArg, 7),
+            ('deploy x --env', CommandArgParseMissingArgValue, 9),
+        ]
+        for command, error, offset in cases:
+            with self.assertRaises(error) as ctx:
+                self._make_spec().parse_string(command)
+            self.assertEqual(ctx.exception.offset, offset, command)
+            self.assertIn(
+                'at offset {}'.format(offset), str(ctx.exception), command)
+
+    def test_start(self):
+        spec = self._make_spec()
+
+        result = spec.parse_string('run deploy svc1', 4)
+        self.assertEqual(result.get_positional('command'), ['deploy'])
+
+        with self.assertRaises(CommandArgParseInvalidFlag) as ctx:
+            spec.parse_string('-z deploy -x', 3)
+        self.assertEqual(ctx.exception.offset, 10)
+
+    def test_parse_has_no_offsets(self):
+        with self.assertRaises(CommandArgParseInvalidFlag) as ctx:
+            self._make_spec().parse(['-z'])
+        self.assertIsNone(ctx.exception.offset)
+        self.assertNotIn('offset', str(ctx.exception))
+
+    def test_response_files_not_expanded(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        path = os.path.join(tmpdir, 'args')
+        with open(path, 'w') as f:
+            f.write('secret\n')
+
+        parser = ArgParser(response_files=True)
+        parser.add_positional('words', count='*')
+        spec = parser.compile()
+
+        result = spec.parse_string('deploy @{} @alice'.format(path))
+
+        self.assertEqual(
+            result.get_positional('words'),
+            ['deploy', '@' + path, '@alice'])
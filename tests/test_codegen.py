@@ -0,0 +1,122 @@
+"""
+Runs the existing suites again with every `ArgParser` compiling to a
+`SpecializedSpec`, so the generated scan is held to the same behaviour as
+the generic one.
+"""
+import linecache
+import pickle
+import random
+import unittest
+from unittest import mock
+
+from commandargparse import ArgParser, CommandArgParseError, SpecializedSpec
+
+import test_ArgParser
+import test_ParserSpec
+import test_cmdstring
+import test_executor
+import test_fail_fast
+import test_lazy
+import test_respfile
+
+
+_compile = ArgParser.compile
+
+
+def _specialized_compile(self):
+    spec = _compile(self)
+    if not isinstance(spec, SpecializedSpec):
+        spec = self._spec = spec.specialized()
+    return spec
+
+
+class SpecializedMixin(object):
+    def setUp(self):
+        patcher = mock.patch.object(ArgParser, 'compile', _specialized_compile)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super(SpecializedMixin, self).setUp()
+
+
+def _specialized(case):
+    return type(
+        'Specialized' + case.__name__, (SpecializedMixin, case), {})
+
+
+SpecializedArgParser = _specialized(test_ArgParser.TestArgParser)
+SpecializedParserSpec = _specialized(test_ParserSpec.TestParserSpec)
+SpecializedParseString = _specialized(test_cmdstring.TestParseString)
+SpecializedExecutor = _specialized(test_executor.TestExecutorValidation)
+SpecializedFailFast = _specialized(test_fail_fast.TestFailFast)
+SpecializedTryParse = _specialized(test_fail_fast.TestTryParse)
+SpecializedLazy = _specialized(test_lazy.TestLazyParsers)
+SpecializedResponseFiles = _specialized(test_respfile.TestResponseFiles)
+
+
+class TestSpecializedSpec(unittest.TestCase):
+    def test_patch_applies(self):
+        with mock.patch.object(ArgParser, 'compile', _specialized_compile):
+            self.assertIsInstance(ArgParser().compile(), SpecializedSpec)
+
+    def test_matches_generic_scan(self):
+        def outcome(spec, args):
+            try:
+                result = spec.parse(args)
+            except CommandArgParseError as e:
+                return type(e), str(e)
+            return (result._flags, result._args, result._positionals,
+                    result._leftovers)
+
+        pool = ['-v', '-vq', '-z', '--n=1', '--n', 'x', '--name', '--', 'a',
+                'b', '', '-', '---', '--n=no', '--other=1']
+        rng = random.Random(22)
+        for strict in (True, False):
+            for stop in (True, False):
+                for fail_fast in (True, False):
+                    parser = ArgParser(
+                        strict=strict, allow_leftovers=True,
+                        stop_at_positionals=stop, fail_fast=fail_fast)
+                    parser.add_arg('n', parser=int)
+                    parser.add_arg('name')
+                    parser.add_flag('v')
+                    parser.add_flag('q')
+                    parser.add_positional('cmd')
+                    parser.add_positional('pair', count=2)
+                    spec = parser.compile()
+                    specialized = spec.specialized()
+
+                    for _ in range(200):
+                        args = [rng.choice(pool)
+                                for _ in range(rng.randint(0, 10))]
+                        self.assertEqual(
+                            outcome(specialized, args), outcome(spec, args),
+                            (strict, stop, fail_fast, args))
+
+    def test_branches_left_out(self):
+        parser = ArgParser(strict=False)
+        parser.add_flag('v')
+        source = parser.compile().specialized().scanner_source
+
+        self.assertNotIn('InvalidFlag', source)
+        self.assertNotIn('parser(arg_val)', source)
+        self.assertNotIn('slot_names[', source)
+
+    def test_pickles(self):
+        parser = ArgParser()
+        parser.add_arg('n', parser=int)
+        parser.add_positional('p', count='*')
+        spec = pickle.loads(pickle.dumps(parser.compile().specialized()))
+
+        result = spec.parse(['--n=4', 'a', 'b'])
+        self.assertEqual(result.get_arg('n'), 4)
+        self.assertEqual(result.get_positional('p'), ['a', 'b'])
+
+    def test_linecache_entry_reused(self):
+        parser = ArgParser()
+        parser.add_flag('v')
+        spec = parser.compile().specialized()
+        size = len(linecache.cache)
+
+        parser.compile().specialized()
+        pickle.loads(pickle.dumps(spec))
+        self.assertEqual(len(linecache.cache), size)
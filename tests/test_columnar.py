@@ -0,0 +1,64 @@
+import unittest
+from array import array
+from collections import Counter
+
+from commandargparse import ArgParser, ColumnarBatch
+
+
+def make_spec():
+    parser = ArgParser()
+    parser.add_flag('v')
+    parser.add_flag('f')
+    parser.add_arg('env')
+    parser.add_arg('port', parser=int)
+    parser.add_positional('command')
+    parser.add_positional('paths', count='*')
+    return parser.compile()
+
+
+ARGVS = [
+    ['-vv', '--env=prod', 'deploy', 'a', 'b'],
+    ['--env', 'dev', '--port=80', 'deploy'],
+    ['-z', 'deploy'],
+    ['-v', '--env=prod', '--env=dev', 'rollback', 'a', 'b'],
+    ['--port=http'],
+]
+
+
+class TestColumnarBatch(unittest.TestCase):
+    def test_columns(self):
+        batch = make_spec().parse_columnar(iter(ARGVS))
+
+        self.assertEqual(batch.size, 5)
+        self.assertEqual(batch.row_valid, bytearray([1, 1, 0, 1, 0]))
+        self.assertEqual(batch.flag_counts['v'], array('I', [2, 0, 0, 1, 0]))
+        self.assertEqual(batch.arg_values['env'],
+                         ['prod', 'dev', None, 'dev', None])
+        self.assertEqual(batch.arg_valid['port'],
+                         bytearray([0, 1, 0, 0, 0]))
+        self.assertEqual(batch.arg_values['port'][1], 80)
+        self.assertEqual(batch.positional_values['paths'],
+                         [['a', 'b'], None, None, ['a', 'b'], None])
+        self.assertEqual([row for row, _ in batch.errors], [2, 4])
+
+    def test_aggregations(self):
+        batch = make_spec().parse_columnar(ARGVS)
+
+        self.assertEqual(batch.flag_usage(), {'v': 2, 'f': 0})
+        self.assertEqual(batch.flag_histogram('v'), Counter({0: 1, 1: 1, 2: 1}))
+        self.assertEqual(batch.value_counts('env'), Counter(prod=1, dev=2))
+        self.assertEqual(batch.positional_usage(),
+                         {'command': 3, 'paths': 2})
+        self.assertEqual(batch.positional_value_counts('paths'),
+                         Counter({('a', 'b'): 2}))
+        self.assertEqual(batch.error_counts(),
+                         Counter(invalid_flag=1, arg_validation_failed=1))
+
+    def test_extend_appends_rows(self):
+        batch = ColumnarBatch(ArgParser())
+        batch.extend([[], []])
+        batch.extend([['x']])
+
+        self.assertEqual(batch.size, 3)
+        self.assertEqual(batch.row_valid, bytearray([1, 1, 0]))
+        self.assertEqual(batch.error_counts(), Counter(extra_positionals=1))
@@ -0,0 +1,66 @@
+import unittest
+
+from commandargparse import (
+    ArgParser,
+    CompactParseResult,
+    CommandArgParseUndefinedArg,
+    CommandArgParseUndefinedFlag,
+    CommandArgParseUndefinedPositional,
+)
+
+
+class TestCompactParseResult(unittest.TestCase):
+    def _make_spec(self, strict=True):
+        parser = ArgParser(strict=strict, allow_leftovers=True)
+        parser.add_arg('a', default='dflt')
+        parser.add_arg('b', parser=int)
+        parser.add_flag('f')
+        parser.add_flag('g')
+        parser.add_positional('words', count=2)
+        parser.add_positional('rest', count='*')
+        return parser.compile()
+
+    def test_matches_parse_result(self):
+        spec = self._make_spec()
+        args = ['-ff', '--b=1', '--b', '2', 'x', 'y', 'z']
+
+        full = spec.parse(args)
+        compact = spec.parse_compact(args)
+
+        self.assertIsInstance(compact, CompactParseResult)
+        self.assertFalse(hasattr(compact, '__dict__'))
+
+        self.assertEqual(compact.get_all_args_multi(), full.get_all_args_multi())
+        self.assertEqual(compact.get_all_args(), full.get_all_args())
+        self.assertEqual(compact.get_arg('a'), 'dflt')
+        self.assertEqual(compact.get_arg_multi('b'), [1, 2])
+
+        self.assertEqual(compact.get_all_flag_counts(), {'f': 2})
+        self.assertEqual(compact.get_all_flags(), {'f'})
+        self.assertEqual(compact.get_flag_count('g'), 0)
+        self.assertFalse(compact.get_flag('g'))
+
+        self.assertEqual(compact.get_all_positionals(), full.get_all_positionals())
+        self.assertEqual(compact.get_positional('words'), ['x', 'y'])
+        self.assertEqual(compact.get_positional_view('rest'), ('z',))
+        self.assertEqual(compact.get_leftovers(), [])
+
+    def test_strict_undefined(self):
+        compact = self._make_spec().parse_compact([])
+
+        with self.assertRaises(CommandArgParseUndefinedArg):
+            compact.get_arg('nope')
+        with self.assertRaises(CommandArgParseUndefinedFlag):
+            compact.get_flag('z')
+        with self.assertRaises(CommandArgParseUndefinedPositional):
+            compact.get_positional('nope')
+
+    def test_nostrict_extras(self):
+        compact = self._make_spec(strict=False).parse_compact(
+            ['-fzz', '--other=1'])
+
+        self.assertEqual(compact.get_all_flag_counts(), {'f': 1, 'z': 2})
+        self.assertEqual(compact.get_all_flags(), {'f', 'z'})
+        self.assertEqual(compact.get_flag_count('z'), 2)
+        self.assertEqual(compact.get_arg('other'), '1')
+        self.assertEqual(compact.get_arg_multi('missing'), [])
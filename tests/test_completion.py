@@ -0,0 +1,99 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from commandargparse import (
+    ArgParser,
+    Completer,
+    query_completions,
+    serve_completions,
+)
+
+
+def make_completer():
+    parser = ArgParser()
+    for name in ('env', 'endpoint', 'exclude', 'tag', 'timeout'):
+        parser.add_arg(name)
+    parser.add_flag('v')
+    parser.add_flag('f')
+    parser.add_positional('action')
+    parser.add_positional('services', count='*')
+    return Completer(parser, choices={
+        'env': ['prod', 'preview', 'staging'],
+        'action': ['deploy', 'destroy', 'diff'],
+        'services': lambda prefix: ['api', 'auth', prefix + '-custom'],
+    })
+
+
+class TestCompleter(unittest.TestCase):
+    def test_arg_names_from_trie(self):
+        completer = make_completer()
+
+        self.assertEqual(completer.complete(['--e']),
+                         ['--endpoint', '--env', '--exclude'])
+        self.assertEqual(completer.complete(['--en']), ['--endpoint', '--env'])
+        self.assertEqual(completer.complete(['--x']), [])
+        self.assertEqual(completer.arg_names('t'), ['tag', 'timeout'])
+
+    def test_arg_values(self):
+        completer = make_completer()
+
+        self.assertEqual(completer.complete(['--env', 'p']),
+                         ['preview', 'prod'])
+        self.assertEqual(completer.complete(['--env=s']), ['--env=staging'])
+        self.assertEqual(completer.complete(['--tag', '']), [])
+
+    def test_flags(self):
+        completer = make_completer()
+
+        self.assertEqual(completer.complete(['-v']), ['-vf'])
+        self.assertEqual(completer.complete(['-'])[:2], ['-f', '-v'])
+        self.assertIn('--timeout', completer.complete(['-']))
+
+    def test_positional_slot(self):
+        completer = make_completer()
+
+        self.assertEqual(completer.complete(['d']),
+                         ['deploy', 'destroy', 'diff'])
+        self.assertEqual(completer.complete(['-v', '--env=prod', 'de']),
+                         ['deploy', 'destroy'])
+        self.assertEqual(completer.complete(['deploy', '--tag', 'x', 'a']),
+                         ['a-custom', 'api', 'auth'])
+        self.assertEqual(completer.complete(['deploy', '--', '--e']),
+                         ['--e-custom'])
+
+    def test_invalid_words(self):
+        self.assertEqual(make_completer().complete(['---x', '']), [])
+
+    def test_arg_parsers_not_run(self):
+        calls = []
+
+        def lookup(value):
+            calls.append(value)
+            return {}[value]
+
+        parser = ArgParser()
+        parser.add_arg('host', parser=lookup)
+        parser.add_positional('action')
+        completer = Completer(parser, choices={'action': ['deploy', 'diff']})
+
+        self.assertEqual(
+            completer.complete(['--host', 'db1', '--host=db2', 'de']),
+            ['deploy'])
+        self.assertEqual(calls, [])
+
+    def test_daemon(self):
+        completer = make_completer()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'complete.sock')
+            thread = threading.Thread(
+                target=serve_completions, args=(completer, path), daemon=True)
+            thread.start()
+            while not os.path.exists(path):
+                time.sleep(0.001)
+
+            self.assertEqual(query_completions(path, ['--env', 'p']),
+                             ['preview', 'prod'])
+            self.assertEqual(query_completions(path, ['--zz']), [])
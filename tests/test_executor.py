@@ -0,0 +1,74 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from commandargparse import (
+    ArgParser,
+    CommandArgParseMultiError,
+    CommandArgParseArgValidationFailed,
+    CommandArgParseInvalidFlag,
+    CommandArgParsePosValidationFailed,
+)
+
+
+class TestExecutorValidation(unittest.TestCase):
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.threads = set()
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def _recording_int(self, value):
+        self.threads.add(threading.current_thread().name)
+        return int(value)
+
+    def _make_parser(self):
+        parser = ArgParser()
+        parser.add_arg('a', parser=self._recording_int)
+        parser.add_arg('b', parser=self._recording_int)
+        parser.add_positional(
+            'nums', count='*', parser=lambda values: [int(v) for v in values])
+        return parser
+
+    def test_parsers_run_on_executor(self):
+        spec = self._make_parser().compile()
+        result = spec.parse(['--a=1', '--b=2', '--a=3', '4'], executor=self.executor)
+
+        self.assertEqual(result.get_arg_multi('a'), [1, 3])
+        self.assertEqual(result.get_arg('b'), 2)
+        self.assertEqual(result.get_positional('nums'), [4])
+        self.assertNotIn(threading.current_thread().name, self.threads)
+
+    def test_error_order_is_deterministic(self):
+        spec = self._make_parser().compile()
+        args = ['--b=x', '-q', '--a=y', '--b=z', 'w']
+
+        with self.assertRaises(CommandArgParseMultiError) as sync_ctx:
+            spec.parse(args)
+
+        for _ in range(10):
+            with self.assertRaises(CommandArgParseMultiError) as ctx:
+                spec.parse(args, executor=self.executor)
+
+            self.assertEqual(
+                [(type(e), str(e)) for e in ctx.exception.errors],
+                [(type(e), str(e)) for e in sync_ctx.exception.errors],
+            )
+
+        self.assertEqual(
+            [type(e) for e in ctx.exception.errors],
+            [
+                CommandArgParseArgValidationFailed,
+                CommandArgParseArgValidationFailed,
+                CommandArgParseArgValidationFailed,
+                CommandArgParseInvalidFlag,
+                CommandArgParsePosValidationFailed,
+            ],
+        )
+
+    def test_argparser_executor(self):
+        parser = self._make_parser()
+        parser.parse(['--a', '5'], executor=self.executor)
+
+        self.assertEqual(parser.get_arg('a'), 5)
@@ -0,0 +1,129 @@
+import unittest
+
+from commandargparse import (
+    ArgParser,
+    ErrorRecord,
+    CommandArgParseError,
+    CommandArgParseArgValidationFailed,
+    CommandArgParseInvalidArg,
+    CommandArgParseInvalidFlag,
+    CommandArgParseMissingPositional,
+)
+
+
+def make_parser(fail_fast=True):
+    parser = ArgParser(fail_fast=fail_fast)
+    parser.add_arg('n', parser=int)
+    parser.add_flag('v')
+    parser.add_positional('path', minimum=1)
+    return parser
+
+
+class CountingIter(object):
+    def __init__(self, tokens):
+        self.tokens = iter(tokens)
+        self.consumed = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        token = next(self.tokens)
+        self.consumed += 1
+        return token
+
+
+class TestFailFast(unittest.TestCase):
+    def test_stops_at_first_bad_token(self):
+        spec = make_parser().compile()
+        tokens = CountingIter(['-v', '--n=x', '-z'] + ['-q'] * 1000)
+
+        with self.assertRaises(CommandArgParseArgValidationFailed):
+            spec.parse(tokens)
+        self.assertEqual(tokens.consumed, 2)
+
+    def test_first_error_raised_alone(self):
+        for args, error in (
+            (['-vz', '--n=1'], CommandArgParseInvalidFlag),
+            (['--m=1', '-z'], CommandArgParseInvalidArg),
+            (['-v'], CommandArgParseMissingPositional),
+        ):
+            with self.assertRaises(error):
+                make_parser().parse(args)
+
+    def test_valid_input_unaffected(self):
+        parser = make_parser()
+        parser.parse(['-v', '--n', '3', 'here'])
+
+        self.assertEqual(parser.get_arg('n'), 3)
+        self.assertEqual(parser.get_positional('path'), ['here'])
+
+
+class TestTryParse(unittest.TestCase):
+    def test_success(self):
+        result, error = make_parser().compile().try_parse(['--n=2', 'p'])
+
+        self.assertIsNone(error)
+        self.assertEqual(result.get_arg('n'), 2)
+
+    def test_error_record(self):
+        spec = make_parser().compile()
+
+        self.assertEqual(
+            spec.try_parse(['-z', '--n=x']),
+            (None, ErrorRecord('invalid_flag', 'z', 1)),
+        )
+        self.assertEqual(
+            spec.try_parse(['---x'])[1].code, 'error')
+
+    def test_stops_at_first_error_without_fail_fast(self):
+        spec = make_parser(fail_fast=False).compile()
+        tokens = CountingIter(['--n=x', '-z'] + ['-q'] * 1000)
+
+        _, error = spec.try_parse(tokens)
+
+        self.assertEqual(error, ErrorRecord('arg_validation_failed', 'n', 1))
+        self.assertEqual(tokens.consumed, 1)
+
+    def test_error_codes_match_parse(self):
+        parser = ArgParser()
+        parser.add_arg('n', parser=int)
+        parser.add_arg('req', required=True)
+        parser.add_flag('v')
+        parser.add_positional(
+            'path', minimum=1, parser=lambda values: [int(v) for v in values])
+        spec = parser.compile()
+
+        for args in (
+            ['--req=1', '1', '-vz'],
+            ['--req=1', '1', '--m=1'],
+            ['--req=1', '1', '--n=x'],
+            ['--req=1', '1', '--n'],
+            ['--req=1', '1', '--m'],
+            ['--req=1', '1', '-'],
+            ['1'],
+            ['--req=1'],
+            ['--req=1', 'x'],
+            ['--req=1', '1', '2'],
+        ):
+            with self.assertRaises(CommandArgParseError) as ctx:
+                spec.parse(args)
+            expected = ErrorRecord.from_error(ctx.exception)
+            self.assertEqual(
+                spec.try_parse(args), (None, expected._replace(count=1)), args)
+
+        self.assertEqual(
+            spec.try_parse(['--req=a', '-v', '7'])[0].get_positional('path'),
+            [7])
+
+    def test_lazy_spec(self):
+        parser = ArgParser(lazy=True)
+        parser.add_arg('n', parser=int)
+        parser.add_positional(
+            'path', parser=lambda values: [int(v) for v in values])
+
+        result, error = parser.compile().try_parse(['--n=x', 'y'])
+
+        self.assertIsNone(error)
+        with self.assertRaises(CommandArgParseArgValidationFailed):
+            result.get_arg('n')
@@ -0,0 +1,114 @@
+import random
+import unittest
+
+from commandargparse import (
+    ArgParser,
+    IncrementalParser,
+    CommandArgParseError,
+    CommandArgParseMissingArgValue,
+)
+
+
+def make_parser(**kwargs):
+    parser = ArgParser(allow_leftovers=True, **kwargs)
+    parser.add_arg('n', parser=int)
+    parser.add_arg('name')
+    parser.add_flag('v')
+    parser.add_flag('q')
+    parser.add_positional('cmd')
+    parser.add_positional('pair', count=2)
+    parser.add_positional('rest', count='*')
+    return parser
+
+
+def outcome(parse):
+    try:
+        result = parse()
+        result.validate()
+    except CommandArgParseError as e:
+        return type(e), str(e)
+    return (
+        result.get_all_flags(), result.get_all_args(),
+        result.get_all_positionals(), result.get_leftovers(),
+    )
+
+
+class TestIncrementalParser(unittest.TestCase):
+    def test_matches_parse(self):
+        pool = ['-v', '-vq', '-z', '--n=1', '--n', 'x', '--name', '--', 'a',
+                'b', '-q', '--n=no', '--other=1']
+        rng = random.Random(4)
+        for kwargs in ({}, {'strict': False}, {'stop_at_positionals': True},
+                       {'lazy': True}):
+            spec = make_parser(**kwargs).compile()
+            for _ in range(300):
+                tokens = [rng.choice(pool) for _ in range(rng.randint(0, 12))]
+
+                incremental = IncrementalParser(spec)
+                for token in tokens:
+                    incremental.feed(token)
+
+                self.assertEqual(
+                    outcome(incremental.result),
+                    outcome(lambda: spec.parse(tokens)),
+                    (kwargs, tokens),
+                )
+
+    def test_rollback_restores_state(self):
+        spec = make_parser(lazy=True).compile()
+        incremental = IncrementalParser(spec)
+        for token in ['-v', 'run', '--n=1']:
+            incremental.feed(token)
+        mark = incremental.snapshot()
+        before = outcome(incremental.result)
+
+        for token in ['-vvz', '--n', '2', '--', '-a', 'b', 'c', 'd']:
+            incremental.feed(token)
+        incremental.rollback(mark)
+
+        self.assertEqual(incremental.tokens, ('-v', 'run', '--n=1'))
+        self.assertEqual(outcome(incremental.result), before)
+
+        incremental.feed('x')
+        incremental.rollback()
+        self.assertEqual(outcome(incremental.result), before)
+
+    def test_result_leaves_parser_untouched(self):
+        incremental = IncrementalParser(make_parser())
+        incremental.feed('run')
+        incremental.feed('--n')
+
+        with self.assertRaises(CommandArgParseMissingArgValue):
+            incremental.result()
+
+        incremental.feed('3')
+        self.assertEqual(incremental.result().get_arg('n'), 3)
+
+    def test_invalid_token_not_consumed(self):
+        incremental = IncrementalParser(make_parser())
+        incremental.feed('--n')
+
+        with self.assertRaises(CommandArgParseError):
+            IncrementalParser(make_parser()).feed('---x')
+        self.assertEqual(incremental.expecting, ('arg', 'n'))
+
+    def test_expecting(self):
+        incremental = IncrementalParser(make_parser())
+        steps = [
+            (None, ('positional', 'cmd')),
+            ('run', ('positional', 'pair')),
+            ('--name', ('arg', 'name')),
+            ('x', ('positional', 'pair')),
+            ('a', ('positional', 'pair')),
+            ('b', ('positional', 'rest')),
+        ]
+        for token, expected in steps:
+            if token is not None:
+                incremental.feed(token)
+            self.assertEqual(incremental.expecting, expected)
+
+        parser = ArgParser(allow_leftovers=True)
+        parser.add_positional('only')
+        incremental = IncrementalParser(parser)
+        incremental.feed('a')
+        self.assertEqual(incremental.expecting, ('leftover', None))
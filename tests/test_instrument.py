@@ -0,0 +1,75 @@
+import unittest
+
+from commandargparse import (
+    ArgParser,
+    InstrumentedSpec,
+    ParseStats,
+    CommandArgParseInvalidFlag,
+)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def _make_spec(self):
+        parser = ArgParser()
+        parser.add_arg('n', parser=int)
+        parser.add_flag('v')
+        parser.add_positional('items', count='*', parser=list)
+        return parser.compile()
+
+    def test_phases_recorded(self):
+        stats = ParseStats()
+        spec = self._make_spec().instrumented(stats)
+        self.assertIsInstance(spec, InstrumentedSpec)
+
+        result = spec.parse(['--n=1', '-vv', 'a', 'b'])
+        spec.parse(['--n', '2'])
+
+        self.assertEqual(result.get_arg('n'), 1)
+        self.assertEqual(result.get_positional('items'), ['a', 'b'])
+
+        counts = {phase: v['count'] for phase, v in stats.as_dict().items()}
+        self.assertEqual(counts, {
+            'tokenize': 2,
+            'parse_arg': 2,
+            'arg_value': 2,
+            'parser:n': 2,
+            'parse_flag': 1,
+            'parse_positional': 2,
+            'validate_args': 2,
+            'validate_flags': 2,
+            'validate_positionals': 2,
+            'parser:items': 2,
+            'validate_leftovers': 2,
+        })
+        for timing in stats.as_dict().values():
+            self.assertGreaterEqual(timing['seconds'], 0)
+
+    def test_custom_recorder(self):
+        recorded = []
+
+        class Recorder(object):
+            def record(self, phase, seconds):
+                recorded.append(phase)
+
+        spec = self._make_spec().instrumented(Recorder())
+        with self.assertRaises(CommandArgParseInvalidFlag):
+            spec.parse(['-x'])
+
+        self.assertIn('tokenize', recorded)
+        self.assertIn('validate_flags', recorded)
+
+    def test_original_spec_untouched(self):
+        spec = self._make_spec()
+        spec.instrumented()
+
+        self.assertIs(spec._arg_defs['n'].parser, int)
+        self.assertNotIsInstance(spec, InstrumentedSpec)
+
+    def test_try_parse(self):
+        spec = self._make_spec().instrumented()
+
+        _, error = spec.try_parse(['-z'])
+
+        self.assertEqual(error.code, 'invalid_flag')
+        self.assertTrue(all(
+            isinstance(phase, str) for phase in spec.stats.as_dict()))
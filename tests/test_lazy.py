@@ -0,0 +1,77 @@
+import unittest
+
+from commandargparse import (
+    ArgParser,
+    CommandArgParseMultiError,
+    CommandArgParseArgValidationFailed,
+    CommandArgParsePosValidationFailed,
+)
+
+
+class TestLazyParsers(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+    def _counting(self, parser):
+        def wrapped(value):
+            self.calls.append(value)
+            return parser(value)
+        return wrapped
+
+    def _make_parser(self):
+        parser = ArgParser(lazy=True)
+        parser.add_arg('n', parser=self._counting(int))
+        parser.add_arg('m', parser=self._counting(int))
+        parser.add_positional(
+            'nums', count='*',
+            parser=self._counting(lambda values: [int(v) for v in values]),
+        )
+        return parser
+
+    def test_parsers_run_on_first_access_only(self):
+        result = self._make_parser().compile().parse(['--n=1', '--n=2', '3'])
+        self.assertEqual(self.calls, [])
+
+        self.assertEqual(result.get_arg('n'), 2)
+        self.assertEqual(result.get_arg_multi('n'), [1, 2])
+        self.assertEqual(self.calls, ['1', '2'])
+
+        self.assertEqual(result.get_positional('nums'), [3])
+        self.assertEqual(result.get_positional('nums'), [3])
+        self.assertEqual(self.calls, ['1', '2', ['3']])
+
+    def test_error_raised_on_access(self):
+        result = self._make_parser().compile().parse(['--n=x', '--m=1'])
+
+        self.assertEqual(result.get_arg('m'), 1)
+        for _ in range(2):
+            with self.assertRaises(CommandArgParseArgValidationFailed):
+                result.get_arg('n')
+
+        # The failing parser is not rerun.
+        self.assertEqual(self.calls, ['1', 'x'])
+
+    def test_validate_collects_errors(self):
+        result = self._make_parser().compile().parse(['--n=x', 'y'])
+
+        with self.assertRaises(CommandArgParseMultiError) as ctx:
+            result.validate()
+
+        self.assertEqual(
+            [type(e) for e in ctx.exception.errors],
+            [CommandArgParseArgValidationFailed, CommandArgParsePosValidationFailed],
+        )
+
+    def test_argparser_lazy(self):
+        parser = self._make_parser()
+        parser.parse(['--m', '5'])
+        self.assertEqual(self.calls, [])
+
+        self.assertEqual(parser.get_all_args(), {'m': 5})
+        parser.validate()
+
+    def test_compact_resolves(self):
+        compact = self._make_parser().compile().parse_compact(['--n=4', '7'])
+
+        self.assertEqual(compact.get_arg('n'), 4)
+        self.assertEqual(compact.get_positional('nums'), [7])
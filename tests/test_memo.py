@@ -0,0 +1,87 @@
+import pickle
+import unittest
+
+from commandargparse import (
+    ArgParser,
+    CacheInfo,
+    MemoizedParser,
+    CommandArgParseArgValidationFailed,
+    spec_fingerprint,
+)
+
+
+class Port(object):
+    calls = 0
+
+    def __call__(self, value):
+        Port.calls += 1
+        return int(value)
+
+
+def make_spec(maxsize=2):
+    parser = ArgParser()
+    parser.add_arg('port', parser=Port(), memoize=maxsize)
+    parser.add_arg('region', memoize=maxsize)
+    parser.add_arg('plain', parser=int)
+    return parser.compile()
+
+
+class TestMemoizedParser(unittest.TestCase):
+    def setUp(self):
+        Port.calls = 0
+
+    def test_repeated_values_parsed_once(self):
+        spec = make_spec()
+        for _ in range(5):
+            spec.parse(['--port=8080', '--port', '8080'])
+
+        self.assertEqual(Port.calls, 1)
+        self.assertEqual(spec.memo_info(), {
+            'port': CacheInfo(9, 1, 0, 2, 1),
+            'region': CacheInfo(0, 0, 0, 2, 0),
+        })
+        self.assertAlmostEqual(
+            spec._arg_defs['port'].parser.hit_rate, 0.9)
+
+    def test_results_share_values(self):
+        spec = make_spec()
+        first = spec.parse(['--region=' + 'us-east'])
+        second = spec.parse(['--region=us-' + 'east'])
+
+        self.assertIs(first.get_arg('region'), second.get_arg('region'))
+
+    def test_lru_eviction(self):
+        spec = make_spec(maxsize=2)
+        for port in ('1', '2', '1', '3', '1', '2'):
+            spec.parse(['--port', port])
+
+        info = spec.memo_info()['port']
+        self.assertEqual((info.hits, info.misses, info.evictions),
+                         (2, 4, 2))
+        self.assertEqual(info.currsize, 2)
+
+    def test_rejected_values_not_memoized(self):
+        spec = make_spec()
+        for _ in range(2):
+            with self.assertRaises(CommandArgParseArgValidationFailed):
+                spec.parse(['--port=http'])
+
+        self.assertEqual(Port.calls, 2)
+        self.assertEqual(spec.memo_info()['port'], CacheInfo(0, 2, 0, 2, 0))
+
+    def test_pickles_without_memo(self):
+        memo = MemoizedParser(int, maxsize=8)
+        memo('1')
+
+        copy = pickle.loads(pickle.dumps(memo))
+
+        self.assertEqual(copy('1'), 1)
+        self.assertEqual(copy.cache_info(), CacheInfo(0, 1, 0, 8, 1))
+
+    def test_fingerprint_stable(self):
+        def fingerprint():
+            parser = ArgParser()
+            parser.add_arg('port', parser=int, memoize=16)
+            return spec_fingerprint(parser.compile())
+
+        self.assertEqual(fingerprint(), fingerprint())
@@ -0,0 +1,120 @@
+import mmap
+import os
+import tempfile
+import unittest
+
+from commandargparse import (
+    ArgParser,
+    CompactParseResult,
+    ParseCache,
+    ProcessArgs,
+    CommandArgParseInvalidFlag,
+    iter_nul_tokens,
+    scan_proc_cmdlines,
+)
+
+
+DATA = b'-v\0--name=caf\xc3\xa9\0\0raw\xff\0last'
+
+
+class TestIterNulTokens(unittest.TestCase):
+    def test_buffer_types_agree(self):
+        expected = ['-v', '--name=caf\xe9', '', 'raw\udcff', 'last']
+
+        self.assertEqual(list(iter_nul_tokens(DATA)), expected)
+        self.assertEqual(list(iter_nul_tokens(bytearray(DATA))), expected)
+        self.assertEqual(
+            list(iter_nul_tokens(memoryview(b'xx' + DATA)[2:])), expected)
+
+        with tempfile.TemporaryFile() as f:
+            f.write(DATA)
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                self.assertEqual(list(iter_nul_tokens(mm)), expected)
+
+    def test_trailing_nul(self):
+        for data in (b'a\0b\0', bytearray(b'a\0b\0')):
+            self.assertEqual(list(iter_nul_tokens(data)), ['a', 'b'])
+        self.assertEqual(list(iter_nul_tokens(b'')), [])
+        self.assertEqual(list(iter_nul_tokens(memoryview(b'\0'))), [''])
+
+    def test_decodes_only_what_is_scanned(self):
+        spec = ArgParser(fail_fast=True).compile()
+        data = bytearray(b'-z\0\xff\xfe\0')
+
+        with self.assertRaises(CommandArgParseInvalidFlag):
+            spec.parse_buffer(data, errors='strict')
+
+
+class TestParseBuffer(unittest.TestCase):
+    def test_parse_buffer(self):
+        parser = ArgParser()
+        parser.add_flag('v')
+        parser.add_arg('name')
+        parser.add_positional('rest', count='*')
+
+        with tempfile.TemporaryFile() as f:
+            f.write(DATA + b'\0')
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                result = parser.compile().parse_buffer(mm)
+
+        self.assertEqual(result.get_flag_count('v'), 1)
+        self.assertEqual(result.get_arg('name'), 'caf\xe9')
+        self.assertEqual(result.get_positional('rest'),
+                         ['', 'raw\udcff', 'last'])
+
+
+class TestScanProcCmdlines(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(self._cleanup)
+        for pid, cmdline in (
+            (10, b'/usr/bin/tool\0-v\0job\0'),
+            (11, b'tool\0-x\0'),
+            (12, b''),
+            (13, b'/bin/other\0\xff\0'),
+        ):
+            os.mkdir(os.path.join(self.root, str(pid)))
+            with open(os.path.join(self.root, str(pid), 'cmdline'), 'wb') as f:
+                f.write(cmdline)
+        os.mkdir(os.path.join(self.root, 'self'))
+
+    def _cleanup(self):
+        for dirpath, dirnames, filenames in os.walk(self.root, topdown=False):
+            for name in filenames:
+                os.unlink(os.path.join(dirpath, name))
+            os.rmdir(dirpath)
+
+    def _spec(self):
+        parser = ArgParser()
+        parser.add_flag('v')
+        parser.add_positional('job')
+        return parser
+
+    def test_scan(self):
+        found = list(scan_proc_cmdlines(
+            self._spec(), program='tool', proc_root=self.root))
+
+        self.assertEqual([(p.pid, p.program) for p in found],
+                         [(10, '/usr/bin/tool'), (11, 'tool')])
+        self.assertEqual(found[0].outcome.get_positional('job'), ['job'])
+        self.assertIsInstance(found[1].outcome, CommandArgParseInvalidFlag)
+
+    def test_pids_and_missing(self):
+        found = list(scan_proc_cmdlines(
+            self._spec(), pids=[13, 99], proc_root=self.root))
+
+        self.assertEqual(len(found), 1)
+        self.assertIsInstance(found[0], ProcessArgs)
+        self.assertEqual(found[0].pid, 13)
+
+    def test_parse_cache(self):
+        cache = ParseCache(self._spec())
+
+        found = list(scan_proc_cmdlines(
+            cache, program='tool', proc_root=self.root))
+
+        self.assertIsInstance(found[0].outcome, CompactParseResult)
+        self.assertEqual(found[0].outcome.get_positional('job'), ['job'])
+        self.assertIsInstance(found[1].outcome, CommandArgParseInvalidFlag)
@@ -0,0 +1,66 @@
+import pickle
+import unittest
+
+from commandargparse import (
+    ArgParser,
+    ParseResult,
+    parse_many,
+    CommandArgParseInvalidFlag,
+    CommandArgParseMultiError,
+)
+
+
+def _make_spec():
+    parser = ArgParser()
+    parser.add_arg('n', parser=int)
+    parser.add_flag('v')
+    parser.add_positional('cmd')
+    return parser.compile()
+
+
+def _argvs(count):
+    for n in range(count):
+        if n % 10 == 3:
+            yield ['-x', 'cmd{}'.format(n)]
+        else:
+            yield ['--n', str(n), '-v', 'cmd{}'.format(n)]
+
+
+class TestParseMany(unittest.TestCase):
+    def _check_outcomes(self, outcomes, count):
+        self.assertEqual(len(outcomes), count)
+        for n, outcome in enumerate(outcomes):
+            if n % 10 == 3:
+                self.assertIsInstance(outcome, CommandArgParseInvalidFlag)
+            else:
+                self.assertIsInstance(outcome, ParseResult)
+                self.assertEqual(outcome.get_arg('n'), n)
+                self.assertTrue(outcome.get_flag('v'))
+                self.assertEqual(outcome.get_positional('cmd'), ['cmd{}'.format(n)])
+
+    def test_thread_backend(self):
+        spec = _make_spec()
+        outcomes = list(spec.parse_many(_argvs(1000), workers=4, chunksize=7))
+
+        self._check_outcomes(outcomes, 1000)
+
+    def test_process_backend(self):
+        spec = _make_spec()
+        outcomes = list(parse_many(
+            spec, _argvs(500), workers=2, executor='process', chunksize=50))
+
+        self._check_outcomes(outcomes, 500)
+
+    def test_accepts_argparser(self):
+        parser = ArgParser()
+        parser.add_flag('v')
+        outcomes = list(parse_many(parser, [['-v'], []], workers=1))
+
+        self.assertTrue(outcomes[0].get_flag('v'))
+        self.assertFalse(outcomes[1].get_flag('v'))
+
+    def test_multi_error_pickles(self):
+        err = CommandArgParseMultiError([CommandArgParseInvalidFlag('x')])
+        copy = pickle.loads(pickle.dumps(err))
+
+        self.assertEqual(copy.errors[0].flag, 'x')
@@ -0,0 +1,70 @@
+import unittest
+
+from commandargparse import (
+    ArgParser,
+    StreamedPositional,
+    CommandArgParseInvalidFlag,
+    CommandArgParseMissingPositional,
+)
+
+
+class TestParseStream(unittest.TestCase):
+    def _make_spec(self, minimum=0):
+        parser = ArgParser()
+        parser.add_arg('out')
+        parser.add_flag('v')
+        parser.add_positional('cmd')
+        parser.add_positional('paths', count='*', minimum=minimum)
+        return parser.compile()
+
+    def test_greedy_positional_is_lazy(self):
+        spec = self._make_spec()
+        pulled = []
+
+        def tokens():
+            for token in ['-v', '--out', 'o.txt', 'rm', 'a', '-b', 'c']:
+                pulled.append(token)
+                yield token
+
+        result = spec.parse_stream(tokens())
+
+        self.assertEqual(result.get_flag_count('v'), 1)
+        self.assertEqual(result.get_arg('out'), 'o.txt')
+        self.assertEqual(result.get_positional('cmd'), ['rm'])
+
+        paths = result.get_positional('paths')
+        self.assertIsInstance(paths, StreamedPositional)
+        self.assertEqual(pulled, ['-v', '--out', 'o.txt', 'rm', 'a'])
+
+        # Option-like tokens after the greedy positional starts are values.
+        self.assertEqual(list(paths), ['a', '-b', 'c'])
+
+    def test_bounded_memory_over_generator(self):
+        spec = self._make_spec()
+        tokens = ('p{}'.format(n) for n in range(1000000))
+
+        result = spec.parse_stream(tokens)
+
+        self.assertEqual(sum(1 for _ in result.get_positional('paths')), 999999)
+
+    def test_greedy_positional_never_started(self):
+        spec = self._make_spec()
+
+        result = spec.parse_stream(iter(['-v', 'ls']))
+
+        self.assertEqual(list(result.get_positional('paths')), [])
+
+    def test_minimum_checked_on_exhaustion(self):
+        spec = self._make_spec(minimum=2)
+        result = spec.parse_stream(iter(['ls', 'a']))
+
+        paths = result.get_positional('paths')
+        self.assertEqual(next(paths), 'a')
+        with self.assertRaises(CommandArgParseMissingPositional):
+            next(paths)
+
+    def test_errors_before_greedy_positional_raise(self):
+        spec = self._make_spec()
+
+        with self.assertRaises(CommandArgParseInvalidFlag):
+            spec.parse_stream(iter(['-x', 'ls', 'a']))
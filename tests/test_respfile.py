@@ -0,0 +1,153 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from commandargparse import respfile
+
+from commandargparse import (
+    ArgParser,
+    expand_response_files,
+    CommandArgParseResponseFileError,
+)
+
+
+class TestResponseFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, name, data):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def _make_parser(self, depth=4):
+        parser = ArgParser(response_files=True, response_file_depth=depth)
+        parser.add_flag('v')
+        parser.add_arg('out')
+        parser.add_positional('paths', count='*')
+        return parser
+
+    def test_newline_file(self):
+        path = self._write('args.txt', b'-v\r\n--out\n\no.txt\na b\n')
+
+        result = self._make_parser().compile().parse(['@' + path, 'c'])
+
+        self.assertTrue(result.get_flag('v'))
+        self.assertEqual(result.get_arg('out'), 'o.txt')
+        self.assertEqual(result.get_positional('paths'), ['a b', 'c'])
+
+    def test_nul_file(self):
+        path = self._write('args.bin', b'one\0two\nlines\0three\0')
+
+        result = self._make_parser().compile().parse(['@' + path])
+
+        self.assertEqual(
+            result.get_positional('paths'), ['one', 'two\nlines', 'three'])
+
+    def test_nested_and_depth(self):
+        inner = self._write('inner.txt', b'x\ny\n')
+        outer = self._write('outer.txt', '-v\n@{}\n'.format(inner).encode())
+
+        result = self._make_parser().compile().parse(['@' + outer])
+        self.assertEqual(result.get_positional('paths'), ['x', 'y'])
+
+        with self.assertRaises(CommandArgParseResponseFileError):
+            self._make_parser(depth=1).compile().parse(['@' + outer])
+
+    def test_missing_file(self):
+        missing = os.path.join(self.tmpdir, 'nope')
+
+        with self.assertRaises(CommandArgParseResponseFileError) as ctx:
+            self._make_parser().compile().parse(['@' + missing])
+        str(ctx.exception)
+
+    def test_empty_file_and_literal_at(self):
+        path = self._write('empty', b'')
+
+        result = self._make_parser().compile().parse(['@' + path, '@'])
+        self.assertEqual(result.get_positional('paths'), ['@'])
+
+    def test_streamed_lazily(self):
+        path = self._write('many', b'\0'.join(
+            'p{}'.format(n).encode() for n in range(100000)))
+
+        result = self._make_parser().compile().parse_stream(['-v', '@' + path])
+        paths = result.get_positional('paths')
+
+        self.assertEqual(next(paths), 'p0')
+        self.assertEqual(sum(1 for _ in paths), 99999)
+
+    def test_literal_after_break_and_as_arg_value(self):
+        path = self._write('args.txt', b'-v\n')
+        token = '@' + path
+
+        spec = self._make_parser().compile()
+
+        result = spec.parse(['--', token])
+        self.assertFalse(result.get_flag('v'))
+        self.assertEqual(result.get_positional('paths'), [token])
+
+        result = spec.parse(['--out', token, token])
+        self.assertEqual(result.get_arg('out'), token)
+        self.assertTrue(result.get_flag('v'))
+
+    def test_literal_inside_file(self):
+        inner = self._write('inner.txt', b'-v\n')
+        outer = self._write(
+            'outer.txt', '--out\n@{0}\n--\n@{0}\n'.format(inner).encode())
+
+        result = self._make_parser().compile().parse(['@' + outer])
+
+        self.assertFalse(result.get_flag('v'))
+        self.assertEqual(result.get_arg('out'), '@' + inner)
+        self.assertEqual(result.get_positional('paths'), ['@' + inner])
+
+    def test_unmappable_files_read_in_chunks(self):
+        self.addCleanup(setattr, respfile, '_CHUNK_SIZE', respfile._CHUNK_SIZE)
+        respfile._CHUNK_SIZE = 3
+
+        read_fd, write_fd = os.pipe()
+        data = b'-v\r\n--out\n\nlong-name.txt\nab\nlast'
+        writer = threading.Thread(target=lambda: (
+            os.write(write_fd, data), os.close(write_fd)))
+        writer.start()
+        try:
+            result = self._make_parser().compile().parse(
+                ['@/dev/fd/{}'.format(read_fd)])
+        finally:
+            writer.join()
+            os.close(read_fd)
+
+        self.assertTrue(result.get_flag('v'))
+        self.assertEqual(result.get_arg('out'), 'long-name.txt')
+        self.assertEqual(result.get_positional('paths'), ['ab', 'last'])
+
+    @unittest.skipUnless(os.path.exists('/proc/self/comm'), "needs /proc")
+    def test_file_reporting_no_size(self):
+        with open('/proc/self/comm') as f:
+            name = f.read().strip()
+
+        result = self._make_parser().compile().parse(['@/proc/self/comm'])
+
+        self.assertEqual(result.get_positional('paths'), [name])
+
+    def test_disabled_by_default(self):
+        parser = ArgParser()
+        parser.add_positional('paths', count='*')
+
+        result = parser.compile().parse(['@nothing'])
+        self.assertEqual(result.get_positional('paths'), ['@nothing'])
+
+    def test_expand_generator(self):
+        path = self._write('args.txt', b'a\nb\n')
+
+        self.assertEqual(
+            list(expand_response_files(['x', '@' + path, 'y'])),
+            ['x', 'a', 'b', 'y'],
+        )
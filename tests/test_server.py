@@ -0,0 +1,232 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from commandargparse import ArgParser, ParseCache
+from commandargparse.server import CommandServer
+from benchmarks import loadtest_server
+
+
+def make_parser():
+    parser = ArgParser()
+    parser.add_flag('v')
+    parser.add_arg('n', parser=int)
+    parser.add_positional('words', count='*')
+    return parser
+
+
+async def echo(result):
+    await asyncio.sleep(0.01 if result.get_flag('v') else 0)
+    return ' '.join(result.get_positional('words'))
+
+
+class TestCommandServer(unittest.TestCase):
+    def _serve(self, server, data):
+        async def go():
+            reader = asyncio.StreamReader()
+            reader.feed_data(data)
+            reader.feed_eof()
+            writer = _BufferWriter()
+            await server.handle_stream(reader, writer)
+            return writer.data.decode('utf-8').splitlines()
+        return asyncio.run(go())
+
+    def test_responses_in_request_order(self):
+        server = CommandServer({'echo': (make_parser(), echo)})
+
+        lines = self._serve(server, b'echo -v slow one\necho "fast two"\n')
+
+        self.assertEqual(lines, ['OK slow one', 'OK fast two'])
+
+    def test_parse_errors_returned_to_client(self):
+        server = CommandServer({'echo': (make_parser(), echo)})
+
+        lines = self._serve(
+            server, b'echo --n=x\nnope\necho "open\n\necho -z\n')
+
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(all(line.startswith('ERR ') for line in lines))
+        self.assertIn('nope', lines[1])
+        self.assertIn('No closing quotation at offset 5', lines[2])
+        self.assertIn('z at offset 5', lines[4])
+
+    def test_response_files_not_expanded(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.args') as f:
+            f.write('secret\n')
+            f.flush()
+
+            parser = ArgParser(response_files=True)
+            parser.add_positional('words', count='*')
+
+            async def words(result):
+                return ','.join(result.get_positional('words'))
+
+            server = CommandServer({'greet': (parser, words)})
+            lines = self._serve(
+                server, 'greet @{}\n'.format(f.name).encode('utf-8'))
+
+            self.assertEqual(lines, ['OK @' + f.name])
+
+            with self.assertRaises(AssertionError):
+                server.add_command('cached', ParseCache(parser), words)
+
+    def test_parse_cache_command(self):
+        server = CommandServer({'echo': (ParseCache(make_parser()), echo)})
+
+        self.assertEqual(self._serve(server, b'echo a "b c"\n'), ['OK a b c'])
+
+    def test_handler_failure_reported(self):
+        def boom(result):
+            raise RuntimeError('bad\nthing')
+
+        server = CommandServer({'boom': (make_parser(), boom)})
+
+        self.assertEqual(
+            self._serve(server, b'boom\n'), ['ERR Handler failed: bad\\nthing'])
+
+    def test_concurrency_limit(self):
+        running = []
+        peak = []
+
+        async def track(result):
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(0.005)
+            running.pop()
+
+        server = CommandServer(
+            {'t': (make_parser(), track)}, concurrency=3, max_pending=50)
+
+        lines = self._serve(server, b't\n' * 20)
+
+        self.assertEqual(lines, ['OK '] * 20)
+        self.assertEqual(max(peak), 3)
+
+    def test_unexpected_parser_error_reported(self):
+        def lookup(value):
+            return {}[value]
+
+        parser = ArgParser()
+        parser.add_arg('host', parser=lookup)
+        server = CommandServer(
+            {'go': (parser, echo)}, max_pending=2)
+
+        async def go():
+            reader = asyncio.StreamReader()
+            reader.feed_data(b'go --host=x\n' * 6)
+            reader.feed_eof()
+            writer = _BufferWriter()
+            await asyncio.wait_for(server.handle_stream(reader, writer), 5)
+            return writer.data.decode('utf-8').splitlines()
+
+        lines = asyncio.run(go())
+
+        self.assertEqual(len(lines), 6)
+        self.assertTrue(all(
+            line.startswith('ERR Parse failed: ') for line in lines))
+
+    def test_backpressure(self):
+        read_counts = []
+
+        async def go():
+            release = asyncio.Event()
+
+            async def wait(result):
+                await release.wait()
+
+            server = CommandServer(
+                {'w': (make_parser(), wait)}, max_pending=2)
+            reader = _CountingReader(b'w\n' * 10)
+            writer = _BufferWriter()
+            serving = asyncio.ensure_future(
+                server.handle_stream(reader, writer))
+            for _ in range(20):
+                await asyncio.sleep(0)
+            read_counts.append(reader.lines)
+            release.set()
+            await asyncio.wait_for(serving, 5)
+            read_counts.append(reader.lines)
+            return writer.data.decode('utf-8').splitlines()
+
+        lines = asyncio.run(go())
+
+        # One request being answered, two queued, one waiting to queue.
+        self.assertEqual(read_counts, [4, 10])
+        self.assertEqual(lines, ['OK '] * 10)
+
+    def test_writer_failure_stops_reading(self):
+        server = CommandServer({'echo': (make_parser(), echo)}, max_pending=2)
+
+        async def go():
+            reader = _CountingReader(b'echo a\n' * 10, eof=False)
+            writer = _BrokenWriter()
+            with self.assertRaises(ConnectionResetError):
+                await asyncio.wait_for(server.handle_stream(reader, writer), 5)
+            return reader.lines
+
+        self.assertLess(asyncio.run(go()), 10)
+
+    def test_unix_socket(self):
+        server = CommandServer({'echo': (make_parser(), echo)})
+
+        async def go(path):
+            serving = asyncio.ensure_future(server.serve_unix(path))
+            while not os.path.exists(path):
+                await asyncio.sleep(0.001)
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(b'echo a b\necho --n\n')
+            replies = [await reader.readline(), await reader.readline()]
+            writer.close()
+            serving.cancel()
+            try:
+                await serving
+            except asyncio.CancelledError:
+                pass
+            return replies
+
+        with tempfile.TemporaryDirectory() as directory:
+            replies = asyncio.run(go(os.path.join(directory, 's.sock')))
+
+        self.assertEqual(replies[0], b'OK a b\n')
+        self.assertTrue(replies[1].startswith(b'ERR '))
+
+    def test_loadtest_harness(self):
+        rate, p50, p99 = loadtest_server.run(clients=2, lines=50, window=8)
+        self.assertGreater(rate, 0)
+        self.assertLessEqual(p50, p99)
+
+
+class _BufferWriter(object):
+    def __init__(self):
+        self.data = b''
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+
+class _BrokenWriter(_BufferWriter):
+    async def drain(self):
+        raise ConnectionResetError('client went away')
+
+
+class _CountingReader(object):
+    """Serves `data` line by line, counting the lines read. Without `eof`,
+    blocks forever once the data is used up, like an idle client.
+    """
+
+    def __init__(self, data, eof=True):
+        self._lines = data.splitlines(True)
+        self._eof = eof
+        self.lines = 0
+
+    async def readline(self):
+        if self.lines == len(self._lines):
+            if not self._eof:
+                await asyncio.Event().wait()
+            return b''
+        self.lines += 1
+        return self._lines[self.lines - 1]
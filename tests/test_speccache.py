@@ -0,0 +1,109 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from commandargparse import (
+    ArgParser,
+    ParserSpec,
+    dump_spec,
+    load_or_build,
+    load_spec,
+    spec_fingerprint,
+)
+
+
+def build():
+    parser = ArgParser(allow_leftovers=True)
+    parser.add_arg('n', parser=int, default=3)
+    parser.add_flag('v')
+    parser.add_positional('paths', count='*')
+    return parser
+
+
+class TestSpecCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'tool.spec')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_round_trip(self):
+        spec = build().compile()
+        dump_spec(spec, self.path, key='v1')
+
+        loaded = load_spec(self.path, key='v1')
+
+        self.assertIsInstance(loaded, ParserSpec)
+        self.assertEqual(spec_fingerprint(loaded), spec_fingerprint(spec))
+        result = loaded.parse(['--n=5', '-v', 'a'])
+        self.assertEqual(result.get_arg('n'), 5)
+        self.assertEqual(result.get_positional('paths'), ['a'])
+
+    def test_key_mismatch_and_missing(self):
+        dump_spec(build().compile(), self.path, key='v1')
+
+        self.assertIsNone(load_spec(self.path, key='v2'))
+        self.assertIsNone(load_spec(os.path.join(self.tmpdir, 'nope')))
+
+    def test_corrupt_file_is_a_miss(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a spec')
+
+        self.assertIsNone(load_spec(self.path))
+
+    def test_load_or_build(self):
+        calls = []
+
+        def builder():
+            calls.append(1)
+            return build()
+
+        first = load_or_build(self.path, builder)
+        second = load_or_build(self.path, builder)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(spec_fingerprint(first), spec_fingerprint(second))
+
+    def test_load_or_build_unwritable_path(self):
+        path = os.path.join(self.tmpdir, 'missing', 'tool.spec')
+
+        spec = load_or_build(path, build)
+
+        self.assertEqual(spec.parse(['--n=5']).get_arg('n'), 5)
+        self.assertFalse(os.path.exists(path))
+
+    def test_load_or_build_unpicklable_parser(self):
+        def builder():
+            parser = ArgParser()
+            parser.add_arg('n', parser=lambda value: int(value) * 2)
+            return parser
+
+        spec = load_or_build(self.path, builder)
+
+        self.assertEqual(spec.parse(['--n=5']).get_arg('n'), 10)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(os.listdir(self.tmpdir), [])
+
+    def test_fingerprint_mismatch_is_a_miss(self):
+        spec = build().compile()
+        dump_spec(spec, self.path, key='v1')
+        with open(self.path, 'rb') as f:
+            payload = pickle.load(f)
+        with open(self.path, 'wb') as f:
+            pickle.dump(payload[:3] + ('stale',) + payload[4:], f)
+
+        self.assertIsNone(load_spec(self.path, key='v1'))
+
+    def test_fingerprint_tracks_definitions(self):
+        parser = build()
+        before = spec_fingerprint(parser.compile())
+        parser.add_flag('q')
+
+        self.assertNotEqual(spec_fingerprint(parser.compile()), before)
+        self.assertEqual(
+            spec_fingerprint(build().compile()),
+            spec_fingerprint(build().compile()),
+        )
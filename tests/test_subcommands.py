@@ -0,0 +1,134 @@
+import os
+import shutil
+import sys
+import tempfile
+import textwrap
+import unittest
+
+from commandargparse import (
+    ArgParser,
+    CommandTree,
+    CommandArgParseInvalidFlag,
+    CommandArgParseMissingPositional,
+    CommandArgParseUnknownCommand,
+)
+
+
+COMMIT_MODULE = '''
+from commandargparse import ArgParser
+
+def build_parser():
+    parser = ArgParser()
+    parser.add_arg('m', required=True)
+    parser.add_flag('a')
+    parser.add_positional('paths', count='*')
+    return parser
+
+def main(result, global_result):
+    return (result.get_arg('m'), global_result.get_flag('v'))
+'''
+
+
+REMOTE_MODULE = '''
+from commandargparse import ArgParser, CommandTree
+
+def build_parser():
+    tree = CommandTree(ArgParser())
+    tree.add_subcommand('commit', 'cap_test_cmds.commit')
+    return tree
+'''
+
+
+class TestCommandTree(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        pkg = os.path.join(self.tmpdir, 'cap_test_cmds')
+        os.mkdir(pkg)
+        with open(os.path.join(pkg, '__init__.py'), 'w'):
+            pass
+        with open(os.path.join(pkg, 'commit.py'), 'w') as f:
+            f.write(textwrap.dedent(COMMIT_MODULE))
+        sys.path.insert(0, self.tmpdir)
+
+    def tearDown(self):
+        sys.path.remove(self.tmpdir)
+        for name in list(sys.modules):
+            if name.startswith('cap_test_cmds'):
+                del sys.modules[name]
+        shutil.rmtree(self.tmpdir)
+
+    def _make_tree(self):
+        parser = ArgParser()
+        parser.add_flag('v')
+        tree = CommandTree(parser)
+        tree.add_subcommand('commit', 'cap_test_cmds.commit')
+        for n in range(500):
+            tree.add_subcommand('cmd{}'.format(n), 'cap_test_cmds.missing{}'.format(n))
+        return tree
+
+    def test_only_selected_module_is_imported(self):
+        tree = self._make_tree()
+        self.assertNotIn('cap_test_cmds.commit', sys.modules)
+
+        outcome = tree.parse(['-v', 'commit', '-a', '--m', 'msg', 'f1', 'f2'])
+
+        self.assertIn('cap_test_cmds.commit', sys.modules)
+        self.assertEqual(outcome.command, 'commit')
+        self.assertTrue(outcome.global_result.get_flag('v'))
+        self.assertTrue(outcome.result.get_flag('a'))
+        self.assertEqual(outcome.result.get_arg('m'), 'msg')
+        self.assertEqual(outcome.result.get_positional('paths'), ['f1', 'f2'])
+
+    def test_subcommand_options_not_parsed_globally(self):
+        tree = self._make_tree()
+
+        # -a is not a global flag, but belongs to the subcommand.
+        outcome = tree.parse(['commit', '-a', '--m=x'])
+        self.assertEqual(outcome.global_result.get_leftovers(), ['-a', '--m=x'])
+
+        with self.assertRaises(CommandArgParseInvalidFlag):
+            tree.parse(['-a', 'commit', '--m=x'])
+
+    def test_dispatch(self):
+        tree = self._make_tree()
+
+        self.assertEqual(tree.dispatch(['-v', 'commit', '--m=hi']), ('hi', True))
+
+    def test_unknown_and_missing_command(self):
+        tree = self._make_tree()
+
+        with self.assertRaises(CommandArgParseUnknownCommand):
+            tree.parse(['push'])
+        with self.assertRaises(CommandArgParseMissingPositional):
+            tree.parse(['-v'])
+
+    def test_global_definitions_added_later(self):
+        tree = self._make_tree()
+        tree.parse(['-v', 'commit', '--m=x'])
+
+        tree._parser.add_flag('q')
+        outcome = tree.parse(['-q', 'commit', '--m=x'])
+
+        self.assertTrue(outcome.global_result.get_flag('q'))
+
+    def test_greedy_global_positional_rejected(self):
+        parser = ArgParser()
+        parser.add_positional('paths', count='*')
+        tree = CommandTree(parser)
+        tree.add_subcommand('commit', 'cap_test_cmds.commit')
+
+        with self.assertRaises(AssertionError):
+            tree.parse(['commit'])
+
+    def test_nested_tree(self):
+        with open(os.path.join(self.tmpdir, 'cap_test_cmds', 'remote.py'),
+                  'w') as f:
+            f.write(textwrap.dedent(REMOTE_MODULE))
+        tree = self._make_tree()
+        tree.add_subcommand('remote', 'cap_test_cmds.remote')
+
+        outcome = tree.parse(['-v', 'remote', 'commit', '--m=x'])
+
+        self.assertEqual(outcome.command, 'remote')
+        self.assertEqual(outcome.result.command, 'commit')
+        self.assertEqual(outcome.result.result.get_arg('m'), 'x')
@@ -0,0 +1,78 @@
+import io
+import unittest
+
+from commandargparse import ArgParser
+
+
+def make_parser():
+    parser = ArgParser(name='deploy')
+    parser.add_flag('v', help='be verbose')
+    parser.add_flag('f')
+    parser.add_arg('env', help='target environment', required=True)
+    parser.add_arg('tag', help='release tag', default='latest')
+    parser.add_positional('cmd', help='what to run', minimum=1)
+    parser.add_positional('pair', count=2, minimum=1)
+    parser.add_positional('services', help='services', count='*')
+    return parser
+
+
+class TestUsage(unittest.TestCase):
+    def test_format_usage(self):
+        self.assertEqual(make_parser().format_usage(), '\n'.join([
+            'usage: deploy [-vf] --env=VALUE [args] cmd pair [pair] [services ...]',
+            '',
+            'positionals:',
+            '  cmd       what to run',
+            '  pair',
+            '  services  services',
+            '',
+            'args:',
+            '  --env=VALUE  target environment (required)',
+            "  --tag=VALUE  release tag (default: 'latest')",
+            '',
+            'flags:',
+            '  -v  be verbose',
+            '  -f',
+            '',
+        ]))
+
+    def test_long_help_wrapped(self):
+        parser = ArgParser()
+        parser.add_arg('a' * 40, help='word ' * 40)
+
+        lines = parser.format_usage().splitlines()
+
+        label = lines.index('  --{}=VALUE'.format('a' * 40))
+        self.assertTrue(all(len(line) <= 79 for line in lines))
+        self.assertGreater(len(lines) - label, 2)
+        self.assertTrue(all(
+            line.startswith(' ' * 28 + 'word') for line in lines[label + 1:]))
+
+    def test_cached_until_redefined(self):
+        parser = make_parser()
+        spec = parser.compile()
+
+        usage = parser.format_usage()
+        self.assertIs(spec.format_usage(), usage)
+
+        parser.add_flag('q', help='quiet')
+        self.assertIn('-q  quiet', parser.format_usage())
+        self.assertIs(spec.format_usage(), usage)
+
+    def test_print_usage_writes_once(self):
+        writes = []
+
+        class Stream(io.StringIO):
+            def write(self, text):
+                writes.append(text)
+
+        parser = make_parser()
+        parser.print_usage(Stream())
+
+        self.assertEqual(writes, [parser.format_usage()])
+
+    def test_not_rendered_by_parse(self):
+        spec = make_parser().compile()
+        spec.parse(['--env=prod', 'run', 'a'])
+
+        self.assertIsNone(spec._usage)
@@ -0,0 +1,67 @@
+import unittest
+
+from commandargparse import (
+    ArgParser,
+    CommandArgParseUndefinedArg,
+    CommandArgParseUndefinedPositional,
+)
+
+
+class TestViews(unittest.TestCase):
+    def _parse(self, args):
+        parser = ArgParser(allow_leftovers=True)
+        parser.add_arg('a', default='dflt')
+        parser.add_arg('b')
+        parser.add_flag('f')
+        parser.add_positional('words', count=2)
+        parser.add_positional('num', parser=lambda values: int(values[0]) if values else None)
+        return parser.compile().parse(args)
+
+    def test_views_are_read_only(self):
+        result = self._parse(['--b=1', '--b=2', '-ff', 'x', 'y', '3', 'z'])
+
+        args = result.get_all_args_multi_view()
+        self.assertEqual(args['b'], ('1', '2'))
+        with self.assertRaises(TypeError):
+            args['b'] = ('3',)
+
+        flags = result.get_all_flag_counts_view()
+        self.assertEqual(flags['f'], 2)
+        with self.assertRaises(TypeError):
+            flags['f'] = 3
+
+        positionals = result.get_all_positionals_view()
+        self.assertEqual(positionals['words'], ('x', 'y'))
+        self.assertEqual(positionals['num'], 3)
+
+        self.assertEqual(result.get_leftovers_view(), ('z',))
+
+    def test_views_do_not_copy(self):
+        result = self._parse(['--b=1', 'x', 'y'])
+
+        self.assertIs(result.get_arg_multi_view('b'), result.get_arg_multi_view('b'))
+        self.assertIs(
+            result.get_positional_view('words'),
+            result.get_positional_view('words'),
+        )
+        self.assertIs(
+            result.get_all_args_multi_view(), result.get_all_args_multi_view())
+
+    def test_copying_getters_unchanged_after_views(self):
+        result = self._parse(['--b=1', 'x', 'y'])
+        result.get_all_args_multi_view()
+
+        self.assertEqual(result.get_arg_multi('b'), ['1'])
+        self.assertEqual(result.get_all_args_multi(), {'b': ['1']})
+        self.assertEqual(result.get_positional('words'), ['x', 'y'])
+        self.assertEqual(result.get_leftovers(), [])
+
+    def test_view_defaults_and_undefined(self):
+        result = self._parse([])
+
+        self.assertEqual(result.get_arg_multi_view('a'), ('dflt',))
+        self.assertEqual(result.get_positional_view('words'), ())
+        with self.assertRaises(CommandArgParseUndefinedArg):
+            result.get_arg_multi_view('nope')
+        with self.assertRaises(CommandArgParseUndefinedPositional):
+            result.get_positional_view('nope')